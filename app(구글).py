@@ -1,46 +1,107 @@
 import streamlit as st
 st.set_page_config(page_title="AI 면접 에이전트", layout="wide")
 
+import io
 import pandas as pd
-import whisper
 import av
-import tempfile
-import pdfplumber
 import re
 import numpy as np # NumPy 임포트
 from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
-import scipy.io.wavfile # SciPy wavfile 임포트
+
+import config
+from asr_backend import RemoteBackend, create_backend, segments_to_text
+from asr_batching import DynamicBatcher
+from audio_assembly import frames_to_mono_int16
+from audio_pipeline import prepare_whisper_input, dump_debug_wav
+from batch_questions import BatchQuestionGenerator, iter_resume_files, source_checkpoint_path, write_results
+from company_profile import CompanyProfileStore
+from llm_cache import LLMResponseCache, make_key
+from pdf_text import PdfTextExtractor
+from prompt_budget import DEFAULT_PRIORITY, TokenCounter, allocate
+from question_generation import GENERATION_SETTINGS, build_question_prompt, documents_section, response_text
+from question_stream import FakeStreamingModel, QuestionStreamParser, chunk_text, parse_questions
+from transcription_cache import CachedTranscriber, TranscriptionCache
 
 # Google Gemini API 라이브러리 임포트
 import google.generativeai as genai
 
 # API 키 설정 (Streamlit secrets 사용)
 # st.secrets에 google.api_key로 저장된 키를 사용합니다.
-try:
-    genai.configure(api_key=st.secrets["google"]["api_key"])
-    # 사용할 Gemini 모델 지정
-    # 'gemini-1.5-pro-latest' 또는 다른 안정화 버전 사용
-    GEMINI_MODEL_NAME = "gemini-1.5-pro" # 또는 'gemini-1.5-pro-latest'
-except KeyError:
-    st.error("Streamlit secrets에 'google.api_key'가 설정되어 있지 않습니다. API 키를 설정해주세요.")
-    st.stop()
-except Exception as e:
-    st.error(f"Gemini API 설정 중 오류 발생: {e}")
-    st.stop()
+# 사용할 Gemini 모델 지정
+# 'gemini-1.5-pro-latest' 또는 다른 안정화 버전 사용
+GEMINI_MODEL_NAME = "gemini-1.5-pro" # 또는 'gemini-1.5-pro-latest'
+if not config.GEMINI_FAKE_RESPONSE_FILE: # 가짜 클라이언트로 실행할 때는 API 키 불필요
+    try:
+        genai.configure(api_key=st.secrets["google"]["api_key"])
+    except KeyError:
+        st.error("Streamlit secrets에 'google.api_key'가 설정되어 있지 않습니다. API 키를 설정해주세요.")
+        st.stop()
+    except Exception as e:
+        st.error(f"Gemini API 설정 중 오류 발생: {e}")
+        st.stop()
+
+
+# 질문 생성 응답 캐시 (모든 세션 공유, 로컬 SQLite)
+@st.cache_resource
+def get_llm_cache():
+    return LLMResponseCache(
+        config.LLM_CACHE_PATH,
+        ttl_seconds=config.LLM_CACHE_TTL_HOURS * 3600,
+        max_bytes=int(config.LLM_CACHE_MAX_MB * 1024 * 1024),
+    )
+
+llm_cache = get_llm_cache()
+
+
+def make_gemini_model():
+    """질문 생성에 사용할 모델 객체를 만듭니다 (GEMINI_FAKE_RESPONSE_FILE 설정 시 로컬 가짜 모델)."""
+    if config.GEMINI_FAKE_RESPONSE_FILE:
+        with open(config.GEMINI_FAKE_RESPONSE_FILE, encoding="utf-8") as f:
+            return FakeStreamingModel(f.read())
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+# 캐시 키에 쓰는 모델 식별자 (가짜 클라이언트 응답이 실제 모델 응답과 섞이지 않도록 구분)
+GEMINI_MODEL_ID = f"fake:{config.GEMINI_FAKE_RESPONSE_FILE}" if config.GEMINI_FAKE_RESPONSE_FILE else GEMINI_MODEL_NAME
 
 
 @st.cache_resource
 def load_whisper_model():
-    """Whisper 모델을 로드하고 캐싱합니다."""
-    st.info("Whisper 모델 로드 중 (처음 실행 시 시간이 걸릴 수 있습니다)...")
-    model = whisper.load_model("base") # 'base', 'small', 'medium' 등 선택 가능
-    st.success("Whisper 모델 로드 완료!")
-    return model
+    """음성 인식 모델을 로드하고 캐싱합니다 (백엔드/모델은 config.ASR_BACKEND, ASR_MODEL).
+
+    ASR_SERVER_URL 을 설정하면 모델을 올리지 않고 로컬 음성 인식 서버(asr_server.py)에 연결합니다.
+    """
+    backend = create_backend() # 'whisper' 또는 'faster-whisper', 모델 'base', 'small', 'medium' 등 선택 가능
+    st.info(f"음성 인식 모델 로드 중: {backend.description} (처음 실행 시 시간이 걸릴 수 있습니다)...")
+    backend.load()
+    st.success("음성 인식 모델 로드 완료!")
+    return backend
 
 # Whisper 모델 로드
 whisper_model = load_whisper_model()
 
 
+# 여러 세션의 음성 인식 요청을 잠깐 모아 한 번의 배치로 인식 (모델은 배치 스레드만 호출)
+# 배치를 끄거나 음성 인식 서버 클라이언트일 때는 모델을 그대로 사용
+@st.cache_resource
+def get_asr_batcher():
+    if not config.ASR_BATCHING or isinstance(whisper_model, RemoteBackend):
+        return whisper_model
+    return DynamicBatcher(whisper_model, config.ASR_BATCH_MAX_REQUESTS, config.ASR_BATCH_MAX_WAIT_MS / 1000)
+
+
+asr_batcher = get_asr_batcher()
+
+
+# 음성 인식 결과 캐시를 앞에 둔 인식기 (바뀌지 않은 오디오를 다시 인식하면 디코딩 없이 보관된 결과를 사용)
+@st.cache_resource
+def get_transcriber():
+    cache = TranscriptionCache(int(config.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024))
+    return CachedTranscriber(asr_batcher, cache, whisper_model.description)
+
+
+transcriber = get_transcriber()
+
+
 st.title("🎤 AI 면접 에이전트")
 st.info("지원자 이력서를 맥락 기반으로 분석하고, PDF 기반 질문을 생성하며, 음성 응답까지 기록합니다.")
 
@@ -55,136 +116,174 @@ with col2:
     jd_pdfs = st.file_uploader("📝 직무 기술서 (PDF)", type=["pdf"], accept_multiple_files=True, key="jd_uploader")
     resume_pdfs = st.file_uploader("📄 지원자 이력서 (PDF)", type=["pdf"], accept_multiple_files=True, key="resume_uploader")
 
-def extract_pdf_text(files):
-    """업로드된 PDF 파일들에서 텍스트를 추출합니다."""
-    result = ""
-    if files:
-        for uploaded_file in files:
-            # 파일 포인터를 처음으로 되돌립니다 (Streamlit rerun 시 필요)
-            uploaded_file.seek(0)
-            try:
-                with pdfplumber.open(uploaded_file) as pdf:
-                    # 각 페이지에서 텍스트를 추출하고 합칩니다.
-                    page_texts = []
-                    for page in pdf.pages:
-                         text = page.extract_text()
-                         if text:
-                              page_texts.append(text)
-                    result += "\n\n".join(page_texts) + "\n\n" # 파일 간 구분을 위해 공백 추가
-            except Exception as e:
-                st.warning(f"PDF 파일 읽기 오류: {uploaded_file.name} - {e}")
-                result += f"\n\n[텍스트 추출 실패: {uploaded_file.name}]\n\n"
-    return result.strip() # 마지막 공백 제거
-
-# LLM의 컨텍스트 창 제한을 고려하여 텍스트를 자릅니다.
-# Gemini 1.5 Pro는 큰 컨텍스트를 지원하지만, API 비용 및 처리 시간을 고려하여
-# 적절한 길이로 조절하는 것이 좋습니다. 여기서는 OpenAI 때보다 여유 있게 잡습니다.
-def truncate_text(text, max_tokens=128000): # 128K 토큰 기준 예시
-    """텍스트를 토큰 기준으로 자릅니다 (대략적인 길이)."""
-    # 실제 토큰 계산은 API를 사용해야 정확하지만, 여기서는 글자 수로 대략 추정
-    # 한국어는 1토큰당 글자 수가 적으므로, 보수적으로 접근
-    # 예를 들어 1토큰 = 1~2 글자로 가정하고, 128000 토큰 * 1.5 글자/토큰 = 약 192000 글자
-    max_chars = int(max_tokens * 1.5) # 대략적인 글자 수 제한
-    if len(text) > max_chars:
-        st.warning(f"텍스트가 너무 길어 {max_chars}자로 잘랐습니다.")
-        return text[:max_chars] + "..." # 잘렸음을 표시
-    return text
+# PDF 텍스트 추출기 (모든 세션 공유): 내용이 같은 PDF 는 다시 파싱하지 않고, 새 파일은 프로세스 풀에서 병렬 추출
+@st.cache_resource
+def get_pdf_extractor():
+    return PdfTextExtractor(
+        max_workers=config.PDF_WORKERS,
+        max_entries=config.PDF_TEXT_CACHE_ENTRIES,
+        pages_per_task=config.PDF_PAGES_PER_TASK,
+    )
+
+pdf_extractor = get_pdf_extractor()
+
+def extract_pdf_texts(*file_groups):
+    """업로더별 PDF 파일 목록에서 텍스트를 추출해 업로더 순서대로 반환합니다.
+
+    모든 업로더의 파일을 한 번에 추출기에 넘겨, 캐시에 없는 파일들만 함께 병렬로 처리합니다.
+    """
+    files = []
+    owners = [] # 각 파일이 속한 업로더 인덱스
+    for group_idx, group in enumerate(file_groups):
+        for uploaded_file in group or []:
+            files.append((uploaded_file.name, uploaded_file.getvalue()))
+            owners.append(group_idx)
+
+    texts = [""] * len(file_groups)
+    for group_idx, result in zip(owners, pdf_extractor.extract(files)):
+        if result.error is not None:
+            st.warning(f"PDF 파일 읽기 오류: {result.name} - {result.error}")
+            texts[group_idx] += f"\n\n[텍스트 추출 실패: {result.name}]\n\n"
+        else:
+            texts[group_idx] += result.text + "\n\n" # 파일 간 구분을 위해 공백 추가
+    return [text.strip() for text in texts] # 마지막 공백 제거
+
+# 프롬프트에 넣을 문서 토큰 예산 배분기 (토크나이저는 한 번만 로드)
+@st.cache_resource
+def get_token_counter():
+    return TokenCounter()
+
+def fit_documents_to_budget(documents, priority=DEFAULT_PRIORITY):
+    """문서들(이름 -> 텍스트)을 실제 토큰 수 기준으로 전체 예산(config.PROMPT_BUDGET_TOKENS_GEMINI) 안에 맞춥니다.
+
+    예산을 넘으면 `priority` 의 뒤쪽 문서부터 줄입니다 (기본: 핵심 가치 -> 인재상 -> JD -> 이력서 순).
+    """
+    result = allocate(
+        documents,
+        config.PROMPT_BUDGET_TOKENS_GEMINI,
+        priority=priority,
+        min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+        counter=get_token_counter(),
+    )
+    if result.truncated:
+        labels = {"core": "핵심 가치", "persona": "인재상", "jd": "JD", "resume": "이력서", "profile": "회사 프로필"}
+        st.warning("문서가 길어 토큰 예산에 맞게 줄였습니다: " + ", ".join(
+            f"{labels[name]} {result.original_tokens[name]:,} → {result.tokens[name]:,} 토큰" for name in result.truncated
+        ))
+    st.caption(f"프롬프트 문서 토큰: {result.total_tokens:,} / {config.PROMPT_BUDGET_TOKENS_GEMINI:,} ({result.counter_name})")
+    return result.texts
+
+def fit_company_documents(core_text, persona_text, jd_text):
+    """회사 프로필을 만들 세 회사 문서를 이력서와 상관없이 예산에 맞춥니다 (지원자마다 같은 프로필 키가 되도록)."""
+    return allocate(
+        {"core": core_text, "persona": persona_text, "jd": jd_text},
+        config.PROMPT_BUDGET_TOKENS_GEMINI, min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+        counter=get_token_counter(),
+    ).texts
+
+# 회사 프로필 요약 저장소 (모든 세션 공유, 디스크)
+@st.cache_resource
+def get_company_profile_store():
+    return CompanyProfileStore(config.COMPANY_PROFILE_DIR)
+
+def load_company_profile(core_text, persona_text, jd_text, force=False):
+    """세 회사 문서의 요약(회사 프로필)을 반환합니다. 저장된 것이 없으면 Gemini 로 한 번 만들어 저장합니다."""
+    def generate(prompt):
+        response = make_gemini_model().generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(temperature=0.2, max_output_tokens=1500),
+        )
+        return response_text(response)
+
+    profile, created = get_company_profile_store().get_or_create(
+        core_text, persona_text, jd_text, GEMINI_MODEL_ID, generate, force=force
+    )
+    if created:
+        st.caption("🏢 회사 프로필을 새로 만들었습니다. 같은 회사 문서로 면접하는 다음 지원자부터는 이 요약을 재사용합니다.")
+    with st.expander("🏢 회사 프로필 요약 보기 (모든 지원자 공통)"):
+        st.text(profile["digest"])
+    return profile["digest"]
 
 st.header("2️⃣ 질문 자동 생성 (AI 기반)")
 num_questions = st.slider("질문 수", 1, 15, 5) # 질문 수 범위 및 기본값 조정
+force_regenerate = st.checkbox("🔄 새로 생성 (저장된 질문 무시)", key="force_regenerate",
+                               help="같은 문서와 설정으로 생성한 질문이 저장되어 있어도 AI를 다시 호출합니다.")
 
 if st.button("🚀 질문 생성", key="generate_button"):
     with st.spinner("AI가 문서를 분석하고 질문을 생성 중입니다..."):
-        core_text = extract_pdf_text(core_pdfs)
-        persona_text = extract_pdf_text(persona_pdfs)
-        jd_text = extract_pdf_text(jd_pdfs)
-        resume_text = extract_pdf_text(resume_pdfs)
+        core_text, persona_text, jd_text, resume_text = extract_pdf_texts(
+            core_pdfs, persona_pdfs, jd_pdfs, resume_pdfs
+        )
 
         if not all([core_text, persona_text, jd_text, resume_text]):
             st.warning("모든 PDF 항목을 업로드해야 질문을 생성할 수 있습니다.")
         else:
-            # Gemini 1.5 Pro의 대용량 컨텍스트를 활용하여 좀 더 많은 텍스트를 전달
-            # 하지만 너무 길면 비용 및 지연이 발생하므로 적절한 길이 조절 필요
-            # 여기서는 truncate_text 함수로 대략적인 최대 길이를 제한
-            truncated_core = truncate_text(core_text)
-            truncated_persona = truncate_text(persona_text)
-            truncated_jd = truncate_text(jd_text)
-            truncated_resume = truncate_text(resume_text)
-
-
-            prompt_text = f"""
-            당신은 기업의 시니어 인사담당자이며, AI 면접 질문 자동 생성 시스템입니다.
-
-            아래 4가지 문서를 제공합니다:
-            1. 회사의 핵심 가치 (Core Values)
-            2. 채용 인재상 (Ideal Persona)
-            3. 직무 기술서 (Job Description)
-            4. 지원자의 이력서 (Resume)
-
-            당신의 역할은 위 4가지 문서의 내용을 모두 종합적으로 분석하여, 특히 이력서 내용을 기반으로 지원자가 회사의 **핵심 가치**, **인재상**, **직무 요건**에 얼마나 부합하는지 검증하기 위한 **경험 기반 면접 질문**을 생성하는 것입니다.
-
-            ---
-
-            📌 질문 설계 지침:
-
-            1. **경험 기반 질문**을 생성하세요. 반드시 지원자의 **이력서에 언급된 구체적인 과거 경험, 프로젝트, 활동, 경력 사항** 등을 기반으로 질문해야 합니다.
-            2. 질문은 **핵심 가치**, **인재상**, **직무 요건** 중 하나 이상과 연관시켜, 지원자의 역량, 행동 방식, 가치관 등을 심층적으로 파악할 수 있도록 구성되어야 합니다.
-            3. 이력서의 특정 문장, 경력 내용, 키워드 등을 활용하여 다른 문서들과 **교차 분석**한 결과로 도출된 통찰을 바탕으로 질문을 생성하세요.
-            4. 질문은 명확하고 간결해야 하며, 지원자가 자신의 경험을 구체적으로 설명하도록 유도해야 합니다.
-            5. 형식은 반드시 다음과 같아야 합니다. 각 질문과 질문 의도를 구분하여 명확하게 제시해주세요.
-
-            각 질문은 반드시 아래 형식으로 출력해 주세요:
-            ===
-            Q. [질문 내용]
-            질문 의도: [이 질문을 통해 검증하려는 핵심 역량, 경험 또는 가치관]
-            ===
-
-            요청된 질문 수: {num_questions}개
-
-            ---
-            제공된 문서 내용:
-
-            핵심 가치:
-            {truncated_core}
-
-            인재상:
-            {truncated_persona}
-
-            JD:
-            {truncated_jd}
-
-            이력서:
-            {truncated_resume}
-            """
+            # 세 회사 문서는 한 번 요약해 저장한 회사 프로필로 대체 (같은 채용 차수의 모든 지원자가 재사용)
+            # 프로필은 회사 문서끼리만 예산에 맞춰 만들므로 이력서 길이와 상관없이 같은 프로필을 씀
+            company_digest = None
+            if config.COMPANY_PROFILE:
+                try:
+                    company = fit_company_documents(core_text, persona_text, jd_text)
+                    company_digest = load_company_profile(company["core"], company["persona"], company["jd"], force_regenerate)
+                except Exception as e:
+                    st.warning(f"회사 프로필 요약에 실패하여 문서 원문을 사용합니다: {e}")
+
+            # Gemini 1.5 Pro는 큰 컨텍스트를 지원하지만, 너무 길면 비용 및 지연이 발생하므로
+            # 실제로 보낼 문서(프로필 + 이력서, 또는 네 문서)를 정해진 토큰 예산 안에 들어가도록 우선순위에 따라 줄임
+            if company_digest:
+                fitted = fit_documents_to_budget(
+                    {"profile": company_digest, "resume": resume_text}, priority=("resume", "profile")
+                )
+                documents, prompt_documents = documents_section(fitted["resume"], fitted["profile"])
+            else:
+                fitted = fit_documents_to_budget(
+                    {"core": core_text, "persona": persona_text, "jd": jd_text, "resume": resume_text}
+                )
+                documents, prompt_documents = documents_section(
+                    fitted["resume"], None, fitted["core"], fitted["persona"], fitted["jd"]
+                )
+            prompt_text = build_question_prompt(num_questions, documents)
 
             try:
-                # Gemini API 호출
-                model = genai.GenerativeModel(GEMINI_MODEL_NAME)
-                response = model.generate_content(
-                    prompt_text,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.7, # 창의성 조절 (0에 가까울수록 보수적)
-                        max_output_tokens=2000 # 생성될 응답의 최대 토큰 수 (질문 수에 따라 조절)
-                    )
-                )
+                # 프롬프트 문서 + 모델 + 질문 수 + 생성 설정이 같으면 저장된 응답을 사용 (API 호출 생략)
+                cache_key = make_key(prompt_documents, GEMINI_MODEL_ID, num_questions, GENERATION_SETTINGS)
+                cached_output = None if force_regenerate else llm_cache.get(cache_key)
+
+                response = None
+                if cached_output is not None:
+                    output = cached_output
+                    questions_data = parse_questions(output)
+                    st.info("📦 같은 문서와 설정으로 생성했던 질문을 불러왔습니다. 다시 생성하려면 '새로 생성'을 선택하세요.")
+                elif config.GEMINI_STREAMING:
+                    # Gemini API 호출
+                    model = make_gemini_model()
+                    generation_config = genai.types.GenerationConfig(**GENERATION_SETTINGS)
+                    # 스트리밍: `===` 로 닫힌 질문 블록이 도착하는 대로 바로 표시
+                    response = model.generate_content(prompt_text, generation_config=generation_config, stream=True)
+                    parser = QuestionStreamParser()
+                    live_questions = st.container()
+                    def show_new_questions(new_questions):
+                        first = len(parser.questions) - len(new_questions)
+                        for n, q in enumerate(new_questions, start=first + 1):
+                            live_questions.markdown(f"**Q{n}.** {q['question']}")
+                    for chunk in response:
+                        show_new_questions(parser.feed(chunk_text(chunk)))
+                    show_new_questions(parser.close())
+                    output = parser.text
+                    questions_data = parser.questions
+                else:
+                    model = make_gemini_model()
+                    generation_config = genai.types.GenerationConfig(**GENERATION_SETTINGS)
+                    response = model.generate_content(prompt_text, generation_config=generation_config)
+                    output = response_text(response)
+                    questions_data = parse_questions(output) if output else []
 
                 # 응답에서 텍스트 추출 및 오류 처리
-                if response and response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                    output = response.candidates[0].content.parts[0].text
+                if cached_output is not None or (response and response.candidates):
                     if output:
                         st.session_state["questions_raw_output"] = output # 원본 저장
-                        # 응답 파싱 및 질문 데이터 구조화
-                        blocks = output.strip().split("===")
-                        questions_data = []
-                        for b in blocks:
-                            lines = b.strip().split("\n")
-                            q_line = next((l for l in lines if re.search(r"^[Qq][.:]\s*", l)), "") # 'Q.' 또는 'Q:' 등 대소문자 구분 없이 찾기
-                            intent_line = next((l for l in lines if "질문 의도:" in l), "")
-                            if q_line:
-                                questions_data.append({
-                                    "question": re.sub(r"^[Qq][.:]\s*", "", q_line).strip(),
-                                    "intent": intent_line.replace("질문 의도:", "").strip() if intent_line else "질문 의도 파싱 실패 또는 없음"
-                                })
+                        if cached_output is None and questions_data:
+                            llm_cache.put(cache_key, output, GEMINI_MODEL_ID)
                         st.session_state["questions_data"] = questions_data # 구조화된 질문 데이터 저장
 
                         # 결과 저장을 위한 session_state 초기화 또는 불러오기
@@ -228,6 +327,59 @@ if st.button("🚀 질문 생성", key="generate_button"):
                 st.session_state["interview_results_state"] = {} # 초기화
 
 
+# 여러 지원자 일괄 생성: 위의 회사 문서 한 벌로 zip 안의 모든 이력서 질문을 만들어 파일 하나로 내려받음
+with st.expander("📚 여러 지원자 질문 일괄 생성"):
+    batch_zip = st.file_uploader("🗂️ 이력서 PDF 묶음 (ZIP)", type=["zip"], key="batch_resume_zip")
+    if st.button("🚀 일괄 생성", key="batch_generate_button") and batch_zip is not None:
+        core_text, persona_text, jd_text = extract_pdf_texts(core_pdfs, persona_pdfs, jd_pdfs)
+        resume_files = iter_resume_files(batch_zip.getvalue())
+        if not all([core_text, persona_text, jd_text]) or not resume_files:
+            st.warning("회사 문서 세 가지와 이력서 PDF가 들어 있는 ZIP 파일이 필요합니다.")
+        else:
+            try:
+                company = fit_company_documents(core_text, persona_text, jd_text)
+                company_digest = load_company_profile(company["core"], company["persona"], company["jd"], force_regenerate)
+                resumes = []
+                for result in pdf_extractor.extract(resume_files):
+                    if result.error is not None or not result.text.strip():
+                        st.warning(f"이력서를 읽지 못해 건너뜁니다: {result.name}")
+                    else:
+                        resumes.append((result.name, result.text))
+
+                def generate(prompt):
+                    response = make_gemini_model().generate_content(
+                        prompt, generation_config=genai.types.GenerationConfig(**GENERATION_SETTINGS)
+                    )
+                    return response_text(response)
+
+                generator = BatchQuestionGenerator(
+                    generate, GEMINI_MODEL_ID, num_questions, company_digest, get_token_counter(),
+                    budget_tokens=config.PROMPT_BUDGET_TOKENS_GEMINI, min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+                    cache=None if force_regenerate else llm_cache,
+                    concurrency=config.BATCH_CONCURRENCY, max_retries=config.BATCH_MAX_RETRIES,
+                    checkpoint_path=source_checkpoint_path(resume_files, company_digest, num_questions),
+                )
+                progress = st.progress(0.0, text="일괄 생성 준비 중...")
+                def show_progress(done, total, result):
+                    progress.progress(done / max(total, 1), text=f"{done}/{total} 완료")
+                batch_results = generator.run(resumes, progress_fn=show_progress)
+
+                failed = [r["name"] for r in batch_results if r["status"] != "ok"]
+                st.success(f"일괄 생성 완료: {len(batch_results) - len(failed)}/{len(batch_results)}명")
+                if failed:
+                    st.warning("질문을 만들지 못한 이력서: " + ", ".join(failed))
+                batch_output = io.BytesIO()
+                write_results(batch_results, batch_output)
+                st.download_button(
+                    "📥 일괄 생성 결과 (XLSX)", batch_output.getvalue(),
+                    "batch_interview_questions.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    key="batch_download_button",
+                )
+            except Exception as e:
+                st.error(f"일괄 질문 생성 중 오류 발생: {e}")
+
+
 # 질문 데이터가 session_state에 있을 경우 면접 UI 표시
 if "questions_data" in st.session_state and st.session_state["questions_data"]:
     with st.expander("🧾 AI 응답 원본 보기"):
@@ -258,24 +410,36 @@ if "questions_data" in st.session_state and st.session_state["questions_data"]:
     class InterviewAudioProcessor(AudioProcessorBase):
          def __init__(self) -> None:
              self.frames = []
-             self._samples = [] # NumPy 배열 형태로 샘플 저장
+             self._samples = [] # mono int16 NumPy 배열 형태로 샘플 저장
+             self.sample_rate = 0 # 첫 프레임에서 실제 샘플링 레이트를 기록
 
          def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
              # 오디오 프레임을 수집합니다.
              self.frames.append(frame)
-             # NumPy 배열 형태로 변환하여 별도로 저장 (WAV 파일 생성에 용이)
-             self._samples.append(frame.to_ndarray(format="s16le")) # s16le: 16비트 Little Endian PCM
+             if not self.sample_rate:
+                  self.sample_rate = frame.sample_rate
+             # mono int16 샘플로 변환하여 별도로 저장 (모델 입력 준비에 용이)
+             self._samples.append(frames_to_mono_int16([frame]))
 
              # 메모리 사용량 관리를 위해 일정 프레임/샘플 이상 쌓이면 오래된 것 삭제 고려 필요
              # pass # 현재는 모든 프레임을 수집
 
              return frame
 
+         async def recv_queued(self, frames):
+             # 쌓인 프레임 묶음을 한 번에 mono int16 으로 조립
+             if frames:
+                  self.frames.extend(frames)
+                  if not self.sample_rate:
+                       self.sample_rate = frames[0].sample_rate
+                  self._samples.append(frames_to_mono_int16(frames))
+             return frames
+
          def get_audio_samples(self) -> np.ndarray:
-             """수집된 오디오 샘플을 하나의 NumPy 배열로 반환합니다."""
+             """수집된 오디오 샘플을 하나의 mono int16 NumPy 배열로 반환합니다."""
              if not self._samples:
                   return np.array([], dtype=np.int16)
-             return np.concatenate(self._samples, axis=1).T # 채널을 두 번째 축으로 합치고 전치 (샘플 수, 채널 수) 형태
+             return np.concatenate(self._samples)
 
          def clear_samples(self):
              """수집된 오디오 샘플을 비웁니다."""
@@ -310,19 +474,14 @@ if "questions_data" in st.session_state and st.session_state["questions_data"]:
                  if audio_samples.size > 0:
                      with st.spinner(f"질문 {idx+1} 답변 인식 중..."):
                          try:
-                             # 임시 WAV 파일로 저장 (WAV 헤더 포함)
-                             with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                                 temp_wav_path = f.name
-                                 # SciPy를 사용하여 WAV 파일 쓰기
-                                 # 샘플링 레이트 정보 필요 (av.AudioFrame에서 얻을 수 있음)
-                                 # AudioProcessorBase에서 샘플링 레이트를 저장하거나, 첫 프레임에서 얻어야 함
-                                 # 간편하게 44100Hz로 가정 (실제 스트림의 샘플링 레이트를 확인하고 적용 필요)
-                                 sample_rate = 44100 # 실제 샘플링 레이트로 변경해야 함!
-                                 scipy.io.wavfile.write(temp_wav_path, sample_rate, audio_samples)
-
-                             # Whisper 모델로 변환
-                             result = whisper_model.transcribe(temp_wav_path, language="ko") # 한국어 지정
-                             transcribed_text = result["text"]
+                             # 임시 WAV 파일 없이 실제 샘플링 레이트 기준으로 16kHz float32 배열을 만들어 모델에 바로 전달
+                             sample_rate = webrtc_ctx.audio_processor.sample_rate
+                             audio_input = prepare_whisper_input(audio_samples, sample_rate)
+                             dump_debug_wav(audio_input, f"question_{idx+1}") # AUDIO_DEBUG_DUMP_DIR 설정 시에만 저장
+
+                             # 음성 인식 모델로 변환
+                             segments = transcriber.transcribe(audio_input, language="ko") # 한국어 지정
+                             transcribed_text = segments_to_text(segments)
 
                              # session_state에 결과 저장 및 UI 업데이트
                              st.session_state["interview_results_state"][f"answer_{idx}"] = transcribed_text
@@ -338,11 +497,6 @@ if "questions_data" in st.session_state and st.session_state["questions_data"]:
                              import traceback
                              st.error(traceback.format_exc()) # 디버깅을 위해 스택 트레이스 출력
 
-                         finally:
-                              # 임시 파일 삭제
-                              if 'temp_wav_path' in locals() and tempfile.exists(temp_wav_path):
-                                   tempfile.remove(temp_wav_path)
-
                  else:
                       st.warning(f"❓ 질문 {idx+1} 답변 오디오가 수집되지 않았습니다. 마이크 아이콘을 클릭하여 스트림을 시작해주세요.")
 
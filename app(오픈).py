@@ -2,22 +2,64 @@ import streamlit as st
 st.set_page_config(page_title="AI 면접 에이전트", layout="wide")
 
 import pandas as pd
-import whisper
-import av
-import tempfile
 import pdfplumber
 import re
-from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
+from streamlit_webrtc import webrtc_streamer, WebRtcMode
 from openai import OpenAI
 
+import config
+from asr_backend import RemoteBackend, create_backend, segments_to_text
+from asr_batching import DynamicBatcher
+from audio_pipeline import prepare_whisper_input, dump_debug_wav
+from company_profile import CompanyProfileStore
+from llm_cache import LLMResponseCache, make_key
+from prompt_budget import TokenCounter, allocate
+from recorder import GlobalRecorder
+from transcription_cache import CachedTranscriber, TranscriptionCache
+
 client = OpenAI(api_key=st.secrets["openai"]["api_key"])
 
 @st.cache_resource
 def load_whisper_model():
-    return whisper.load_model("base")
+    # 백엔드/모델은 config.ASR_BACKEND, ASR_MODEL 로 선택 (예: faster-whisper int8)
+    # ASR_SERVER_URL 을 설정하면 모델 대신 로컬 음성 인식 서버(asr_server.py) 클라이언트를 사용
+    return create_backend().load()
 
 model = load_whisper_model()
 
+
+# 여러 세션의 음성 인식 요청을 잠깐 모아 한 번의 배치로 인식 (모델은 배치 스레드만 호출)
+# 배치를 끄거나 음성 인식 서버 클라이언트일 때는 모델을 그대로 사용
+@st.cache_resource
+def get_asr_batcher():
+    if not config.ASR_BATCHING or isinstance(model, RemoteBackend):
+        return model
+    return DynamicBatcher(model, config.ASR_BATCH_MAX_REQUESTS, config.ASR_BATCH_MAX_WAIT_MS / 1000)
+
+
+asr_batcher = get_asr_batcher()
+
+
+# 음성 인식 결과 캐시를 앞에 둔 인식기 (바뀌지 않은 오디오를 다시 인식하면 디코딩 없이 보관된 결과를 사용)
+@st.cache_resource
+def get_transcriber():
+    cache = TranscriptionCache(int(config.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024))
+    return CachedTranscriber(asr_batcher, cache, model.description)
+
+
+transcriber = get_transcriber()
+
+# 질문 생성 응답 캐시 (모든 세션 공유, 로컬 SQLite)
+@st.cache_resource
+def get_llm_cache():
+    return LLMResponseCache(
+        config.LLM_CACHE_PATH,
+        ttl_seconds=config.LLM_CACHE_TTL_HOURS * 3600,
+        max_bytes=int(config.LLM_CACHE_MAX_MB * 1024 * 1024),
+    )
+
+llm_cache = get_llm_cache()
+
 st.title("🎤 AI 면접 에이전트")
 st.info("지원자 이력서를 맥락 기반으로 분석하고, PDF 기반 질문을 생성하며, 음성 응답까지 기록합니다.")
 
@@ -40,17 +82,44 @@ def extract_pdf_text(files):
                 result += "\n".join([page.extract_text() or "" for page in pdf.pages])
     return result
 
-def truncate_text(text, max_chars=4000):
-    return text[:max_chars]
+@st.cache_resource
+def get_token_counter():
+    return TokenCounter() # gpt-3.5-turbo 와 같은 cl100k_base 인코딩 (없으면 어림 계산)
+
+# 회사 프로필 요약 저장소 (모든 세션 공유, 디스크)
+@st.cache_resource
+def get_company_profile_store():
+    return CompanyProfileStore(config.COMPANY_PROFILE_DIR)
+
+def load_company_profile(core_text, persona_text, jd_text, llm_model, force=False):
+    """세 회사 문서의 요약(회사 프로필)을 반환합니다. 저장된 것이 없으면 한 번 만들어 저장합니다."""
+    def generate(prompt):
+        response = client.chat.completions.create(
+            model=llm_model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=1200
+        )
+        return response.choices[0].message.content
+
+    profile, created = get_company_profile_store().get_or_create(
+        core_text, persona_text, jd_text, llm_model, generate, force=force
+    )
+    if created:
+        st.caption("🏢 회사 프로필을 새로 만들었습니다. 같은 회사 문서로 면접하는 다음 지원자부터는 이 요약을 재사용합니다.")
+    with st.expander("🏢 회사 프로필 요약 보기 (모든 지원자 공통)"):
+        st.text(profile["digest"])
+    return profile["digest"]
 
 st.header("2️⃣ 질문 자동 생성 (AI 기반)")
 num_questions = st.slider("질문 수", 1, 10, 3)
+force_regenerate = st.checkbox("🔄 새로 생성 (저장된 질문 무시)")
 
 if st.button("🚀 질문 생성"):
-    core_text = truncate_text(extract_pdf_text(core_pdfs))
-    persona_text = truncate_text(extract_pdf_text(persona_pdfs))
-    jd_text = truncate_text(extract_pdf_text(jd_pdfs))
-    resume_text = truncate_text(extract_pdf_text(resume_pdfs))
+    core_text, persona_text, jd_text, resume_text = (
+        extract_pdf_text(core_pdfs), extract_pdf_text(persona_pdfs),
+        extract_pdf_text(jd_pdfs), extract_pdf_text(resume_pdfs),
+    )
 
     if not all([core_text, persona_text, jd_text, resume_text]):
         st.warning("모든 PDF 항목을 업로드해야 질문을 생성할 수 있습니다.")
@@ -82,14 +151,67 @@ Q. [질문 내용]
 
 질문 수: {num_questions}개
 """
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt + "\n\n핵심 가치:\n" + core_text + "\n\n인재상:\n" + persona_text + "\n\nJD:\n" + jd_text + "\n\n이력서:\n" + resume_text}],
-            temperature=0.7,
-            max_tokens=1000
-        )
-        output = response.choices[0].message.content
+        llm_model = "gpt-3.5-turbo"
+        generation_settings = dict(temperature=0.7, max_tokens=1000)
+
+        # 세 회사 문서는 한 번 요약해 저장한 회사 프로필로 대체 (같은 채용 차수의 모든 지원자가 재사용)
+        # 프로필은 회사 문서끼리만 예산에 맞춰 만들므로 이력서 길이와 상관없이 같은 프로필을 씀
+        company_digest = None
+        if config.COMPANY_PROFILE:
+            try:
+                company = allocate(
+                    {"core": core_text, "persona": persona_text, "jd": jd_text},
+                    config.PROMPT_BUDGET_TOKENS_OPENAI,
+                    min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+                    counter=get_token_counter(),
+                ).texts
+                company_digest = load_company_profile(
+                    company["core"], company["persona"], company["jd"], llm_model, force_regenerate
+                )
+            except Exception as e:
+                st.warning(f"회사 프로필 요약에 실패하여 문서 원문을 사용합니다: {e}")
+        if company_digest:
+            # 실제로 보낼 프로필 + 이력서를 토큰 예산 안에 맞춤 (넘치면 프로필 -> 이력서 순으로 줄임)
+            budget = allocate(
+                {"profile": company_digest, "resume": resume_text},
+                config.PROMPT_BUDGET_TOKENS_OPENAI,
+                priority=("resume", "profile"),
+                min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+                counter=get_token_counter(),
+            )
+            profile_text, resume_text = budget.texts["profile"], budget.texts["resume"]
+            prompt_documents = [profile_text, resume_text]
+            documents_section = "\n\n회사 프로필 (핵심 가치 / 인재상 / 직무 요건 요약):\n" + profile_text + "\n\n이력서:\n" + resume_text
+        else:
+            # 네 문서를 합쳐 토큰 예산 안에 맞춤 (넘치면 핵심 가치 -> 인재상 -> JD -> 이력서 순으로 줄임)
+            budget = allocate(
+                {"core": core_text, "persona": persona_text, "jd": jd_text, "resume": resume_text},
+                config.PROMPT_BUDGET_TOKENS_OPENAI,
+                min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+                counter=get_token_counter(),
+            )
+            core_text, persona_text, jd_text, resume_text = (
+                budget.texts["core"], budget.texts["persona"], budget.texts["jd"], budget.texts["resume"]
+            )
+            prompt_documents = [core_text, persona_text, jd_text, resume_text]
+            documents_section = "\n\n핵심 가치:\n" + core_text + "\n\n인재상:\n" + persona_text + "\n\nJD:\n" + jd_text + "\n\n이력서:\n" + resume_text
+
+        # 프롬프트 문서 + 모델 + 질문 수 + 생성 설정이 같으면 저장된 응답을 사용 (API 호출 생략)
+        cache_key = make_key(prompt_documents, llm_model, num_questions, generation_settings)
+        output = None if force_regenerate else llm_cache.get(cache_key)
+        if output is not None:
+            st.info("📦 같은 문서와 설정으로 생성했던 질문을 불러왔습니다. 다시 생성하려면 '새로 생성'을 선택하세요.")
+        else:
+            response = client.chat.completions.create(
+                model=llm_model,
+                messages=[{"role": "user", "content": prompt + documents_section}],
+                **generation_settings
+            )
+            output = response.choices[0].message.content
+            if output:
+                llm_cache.put(cache_key, output, llm_model)
         st.session_state["questions"] = output
+        st.session_state.pop("answer_segments", None) # 새 질문에는 이전 답변 녹음 구간을 쓰지 않음
         st.success("질문 생성 완료")
 
 if "questions" in st.session_state and st.session_state["questions"] != "":
@@ -110,13 +232,25 @@ if "questions" in st.session_state and st.session_state["questions"] != "":
                 "intent": intent_line.replace("질문 의도:", "").strip()
             })
 
-    class Recorder(AudioProcessorBase):
-        def __init__(self) -> None:
-            self.frames = []
-
-        def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
-            self.frames.append(frame)
-            return frame
+    # 면접 전체에 WebRTC 스트림 하나만 사용 (질문마다 연결을 새로 만들지 않음)
+    # 질문별 답변은 녹음 시작/중지 시점의 샘플 구간으로 구분
+    ctx = webrtc_streamer(
+        key="interview_audio_stream",
+        mode=WebRtcMode.SENDONLY,
+        audio_receiver_size=1024,
+        rtc_configuration={"iceServers": [{"urls": ["stun:stun.l.google.com:19302"]}]},
+        media_stream_constraints={"audio": True, "video": False},
+        audio_processor_factory=GlobalRecorder,
+        async_processing=True,
+    )
+    processor = ctx.audio_processor if ctx.state.playing else None
+    if processor is None:
+        st.info("🎙️ 위의 'START' 버튼으로 마이크 스트림을 먼저 연결한 뒤 질문별로 녹음하세요.")
+
+    # 질문별 답변 구간 (시작, 끝 샘플 오프셋) 과 현재 녹음 중인 질문
+    if len(st.session_state.get("answer_segments", [])) != len(questions_data):
+        st.session_state["answer_segments"] = [None] * len(questions_data)
+        st.session_state["recording_idx"] = None
 
     interview_results = []
 
@@ -125,27 +259,36 @@ if "questions" in st.session_state and st.session_state["questions"] != "":
         st.markdown(f"**{q['question']}**")
         st.markdown(f"📌 질문 의도: _{q['intent']}_")
 
-        ctx = webrtc_streamer(
-            key=f"webrtc_{idx}",
-            mode=WebRtcMode.SENDONLY,
-            audio_receiver_size=1024,
-            rtc_configuration={"iceServers": [{"urls": ["stun:stun.l.google.com:19302"]}]},
-            media_stream_constraints={"audio": True, "video": False},
-            audio_processor_factory=Recorder,
-        )
-
         if f"answer_{idx}" not in st.session_state:
             st.session_state[f"answer_{idx}"] = ""
 
-        if ctx.audio_processor and len(ctx.audio_processor.frames) > 0:
-            if st.button(f"🧠 질문 {idx+1} - 음성 인식 실행"):
+        if processor is not None:
+            recording_idx = st.session_state["recording_idx"]
+            if recording_idx == idx:
+                if st.button(f"⏹️ 질문 {idx+1} - 녹음 중지", key=f"stop_rec_{idx}"):
+                    segment = processor.end_segment()
+                    st.session_state["answer_segments"][idx] = segment
+                    st.session_state["recording_idx"] = None
+                    if segment is None:
+                        st.warning("⚠ 녹음된 오디오가 너무 짧습니다. 다시 녹음해 주세요.")
+                    else:
+                        st.rerun()
+                else:
+                    st.caption("🎧 답변 녹음 중...")
+            elif st.button(f"▶️ 질문 {idx+1} - 녹음 시작", key=f"start_rec_{idx}", disabled=recording_idx is not None):
+                processor.begin_segment()
+                st.session_state["recording_idx"] = idx
+                st.rerun()
+
+            segment = st.session_state["answer_segments"][idx]
+            if segment is not None and st.button(f"🧠 질문 {idx+1} - 음성 인식 실행", key=f"transcribe_{idx}"):
                 with st.spinner("Whisper가 인식 중..."):
-                    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                        audio = b''.join([frame.to_ndarray().tobytes() for frame in ctx.audio_processor.frames])
-                        f.write(audio)
-                        audio_path = f.name
-                    result = model.transcribe(audio_path, language="ko")
-                    st.session_state[f"answer_{idx}"] = result["text"]
+                    # 링 버퍼의 답변 구간(이미 16kHz mono int16)을 float32 배열로 변환해 모델에 바로 전달
+                    samples = processor.read_segment(*segment)
+                    audio = prepare_whisper_input(samples, processor.sample_rate)
+                    dump_debug_wav(audio, f"question_{idx+1}")
+                    segments = transcriber.transcribe(audio, language="ko")
+                    st.session_state[f"answer_{idx}"] = segments_to_text(segments)
                     st.success("🎯 인식 완료!")
 
         st.text_input("🎤 지원자 답변", value=st.session_state[f"answer_{idx}"], key=f"answer_field_{idx}")
@@ -1,33 +1,124 @@
 import streamlit as st
-import whisper
-import av
-import tempfile
-import pandas as pd
 import datetime
-import os
-import numpy as np
-import soundfile as sf
-from streamlit_webrtc import webrtc_streamer, AudioProcessorBase, WebRtcMode
-import io
-import librosa # <-- Add this import for resampling
+import time
+import uuid
+
+import config
+from asr_backend import RemoteBackend, create_backend, segments_to_text
+from asr_batching import DynamicBatcher
+from audio_cache import PreparedAudio, PreparedAudioCache
+from audio_pipeline import WHISPER_SAMPLE_RATE, prepare_whisper_input, dump_debug_wav
+from interview_history import InterviewHistoryStore
+from long_form import LongFormTranscriber
+from model_loader import BackgroundModelLoader
+from results_export import EXPORT_FORMATS, ExportCache, export_history_bytes
+from transcription_cache import TranscriptionCache, make_key as make_transcription_key
+from vad import SkipStats, trim_silence
+from transcription_scheduler import TranscriptionScheduler, QueueFullError, QUEUED, DONE, FAILED
 
 # --- Streamlit 페이지 설정 ---
 st.set_page_config(page_title="면접 Agent", layout="wide")
 st.title("면접 Agent 🤖")
 st.markdown("지원자 면접을 위한 질문 준비, 실시간 오디오 녹음/텍스트 변환, 기록 기능을 제공합니다.")
 
-# --- Whisper 모델 로드 (캐싱) ---
+# --- 음성 인식 모델 로드 (캐싱) ---
+# 모델은 백그라운드 스레드에서 로드하므로 화면은 바로 그려지고, 준비 상태는 사이드바에 표시됨
+# 로드가 끝나기 전에 요청한 음성 인식 작업은 작업자 스레드에서 로드 완료를 기다림
 @st.cache_resource
-def load_model():
-    # base 모델 로드 (다른 모델 사용 시 모델 이름 변경)
-    # return whisper.load_model("base") # 기본
-    # return whisper.load_model("small") # 더 정확하지만 느림
-    return whisper.load_model("base") # 여기서는 base 모델 유지
-    # 로컬 경로에서 모델 로드 시 예: return whisper.load_model("path/to/your/model.pt")
+def get_model_loader():
+    # 백엔드와 모델 크기는 config.py (ASR_BACKEND, ASR_MODEL 환경 변수)에서 선택
+    # 예: ASR_BACKEND=faster-whisper → CTranslate2 int8 엔진 (CPU에서 openai-whisper보다 빠름)
+    # 예: ASR_MODEL=small → 더 정확하지만 느림
+    # 예: ASR_SERVER_URL=http://127.0.0.1:8765 → 모델은 asr_server.py 프로세스가 갖고 여기서는 요청만 보냄
+    # 녹음 저장/다운로드에 쓰는 soundfile 도 함께 미리 import
+    loader = BackgroundModelLoader(create_backend(), preload_modules=("soundfile",))
+    return loader.start(background=config.ASR_BACKGROUND_LOAD)
 
 
-model = load_model()
-# st.sidebar.success("✅ Whisper 모델 로드 완료") # --> 위치 이동됨
+model_loader = get_model_loader()
+model = model_loader.backend # 아직 로드 전일 수 있음 (transcribe 가 로드 완료를 기다림)
+
+
+# --- 음성 인식 동적 배치 (모든 세션 공유) ---
+# 여러 세션의 인식 요청을 잠깐 모아 한 번의 배치로 인식 (서버 클라이언트일 때는 서버가 모으므로 사용하지 않음)
+@st.cache_resource
+def get_asr_batcher():
+    if not config.ASR_BATCHING or isinstance(model, RemoteBackend):
+        return None
+    return DynamicBatcher(model, config.ASR_BATCH_MAX_REQUESTS, config.ASR_BATCH_MAX_WAIT_MS / 1000)
+
+
+asr_batcher = get_asr_batcher()
+
+
+# --- 긴 답변 분할 병렬 인식 (모든 세션 공유, LONG_FORM_WORKERS 를 2 이상으로 설정했을 때만) ---
+# 긴 답변은 무음 경계에서 청크로 나눠 작업자 프로세스들이 동시에 인식 (작업자마다 모델 하나를 더 올림)
+@st.cache_resource
+def get_long_form_transcriber():
+    if config.LONG_FORM_WORKERS < 2 or isinstance(model, RemoteBackend):
+        return None
+    long_form = LongFormTranscriber(
+        model.name, model.model_name, config.LONG_FORM_WORKERS,
+        chunk_seconds=config.LONG_FORM_CHUNK_SECONDS,
+        overlap_seconds=config.LONG_FORM_OVERLAP_SECONDS,
+        min_seconds=config.LONG_FORM_MIN_SECONDS,
+    )
+    long_form.warm() # 작업자 프로세스의 모델 로드를 미리 시작 (기다리지 않음)
+    return long_form
+
+
+long_form = get_long_form_transcriber()
+
+
+# --- 답변 오디오 캐시 (모든 세션 공유, 크기 예산 내 LRU) ---
+@st.cache_resource
+def get_audio_cache():
+    return PreparedAudioCache(int(config.AUDIO_CACHE_MAX_MB * 1024 * 1024))
+
+
+audio_cache = get_audio_cache()
+# 캐시 키에 사용할 세션 식별자
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+
+
+# --- 음성 인식 작업 스케줄러 (모든 세션 공유) ---
+# 스크립트 스레드에서 모델을 직접 호출하지 않고 작업 큐에 넣어, 인식 중에도 메모 입력 등을 계속할 수 있음
+@st.cache_resource
+def get_transcription_scheduler():
+    # 모델 하나를 모든 세션이 공유하므로, 작업자 수는 모델이 허용하는 동시 처리 수를 넘지 않음
+    # 동적 배치를 쓰면 모델은 배치 스레드만 호출하므로, 작업자는 배치에 넣고 기다리기만 함
+    max_workers = config.TRANSCRIBE_WORKERS if asr_batcher else min(config.TRANSCRIBE_WORKERS, model.max_concurrency)
+    return TranscriptionScheduler(
+        max_workers=max_workers,
+        max_pending_per_session=config.TRANSCRIBE_MAX_PENDING_PER_SESSION,
+    )
+
+
+scheduler = get_transcription_scheduler()
+
+
+# --- 음성 인식 결과 캐시 (모든 세션 공유, 오디오 내용 해시 기준) ---
+# 같은 답변 구간을 다시 인식하면 디코딩 없이 보관된 구간 목록을 사용
+@st.cache_resource
+def get_transcription_cache():
+    return TranscriptionCache(int(config.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024))
+
+
+transcription_cache = get_transcription_cache()
+
+
+# --- 무음 제거로 건너뛴 오디오 지표 (모든 세션 합계) ---
+@st.cache_resource
+def get_vad_stats():
+    return SkipStats()
+
+
+vad_stats = get_vad_stats()
+# 질문 인덱스 -> 진행 중인 음성 인식 작업 ID
+if "transcribe_jobs" not in st.session_state:
+    st.session_state["transcribe_jobs"] = {}
+# st.sidebar.success(f"✅ 음성 인식 모델 로드 완료: {model.description}") # --> 위치 이동됨
 
 # --- 입력 정보 ---
 st.sidebar.header("📌 면접 정보 입력")
@@ -151,36 +242,46 @@ for i in range(len(st.session_state["questions"])):
     st.session_state["questions"][i] = st.text_input(f"질문 {i+1}", value=current_value, key=f"q_{i}")
 
 # 질문 추가/삭제 버튼
+# 버튼 콜백에서 상태를 바꾸므로 클릭에 따른 재실행 한 번으로 반영 (st.rerun 으로 한 번 더 실행하지 않음)
+def add_question():
+    st.session_state["questions"].append("")
+    # 새로운 질문에 대한 상태 초기화 (None 또는 빈 문자열)
+    if "answer_segments" in st.session_state:
+        st.session_state["answer_segments"].append(None)
+    # 답변 및 메모 텍스트 영역 상태는 해당 질문 UI가 그려질 때 초기화될 것임
+
+
+def remove_last_question():
+    removed_idx = len(st.session_state["questions"]) - 1
+    st.session_state["questions"].pop()
+    # 삭제된 질문과 관련된 상태(답변, 메모, 세그먼트, 결과)도 함께 정리
+    if f"answer_{removed_idx}" in st.session_state:
+         del st.session_state[f"answer_{removed_idx}"]
+    if f"memo_{removed_idx}" in st.session_state:
+         del st.session_state[f"memo_{removed_idx}"]
+    st.session_state.get("interview_rows", {}).pop(removed_idx, None)
+    audio_cache.invalidate(st.session_state["session_id"], removed_idx) # 준비된 답변 오디오도 정리
+    removed_job_id = st.session_state["transcribe_jobs"].pop(removed_idx, None)
+    if removed_job_id:
+        scheduler.cancel(removed_job_id) # 진행 중인 음성 인식 작업 취소
+    if "answer_segments" in st.session_state and len(st.session_state["answer_segments"]) > removed_idx:
+        # 해당 인덱스의 세그먼트 정보 삭제
+        st.session_state["answer_segments"].pop() # 마지막 항목 pop
+        # 만약 삭제된 질문이 현재 녹음 중인 질문이었다면 상태 초기화
+        if st.session_state.get("currently_recording_idx") == removed_idx:
+            st.session_state["currently_recording_idx"] = None
+            # processor 상태도 초기화 필요 (이 부분은 WebRTC 특성상 어려움이 있을 수 있음 - restart 또는 logic 보완 필요)
+
+
 col_add, col_remove = st.columns([1, 1])
 with col_add:
     # 3. 질문 추가 버튼에 강조 표시 (빨간색 배경은 직접 지원되지 않아 이모지로 대체)
-    if st.button("✨ 질문 추가", key="add_question_button"): # 이모지 추가 및 고유 key 설정
-        st.session_state["questions"].append("")
-        # 새로운 질문에 대한 상태 초기화 (None 또는 빈 문자열)
-        if "answer_segments" in st.session_state:
-            st.session_state["answer_segments"].append(None)
-        # 답변 및 메모 텍스트 영역 상태는 해당 질문 UI가 그려질 때 초기화될 것임
-        st.rerun() # 상태 변경 후 새로고침
+    st.button("✨ 질문 추가", key="add_question_button", on_click=add_question) # 이모지 추가 및 고유 key 설정
 
 with col_remove:
     # 질문이 0개일 때는 삭제 버튼 비활성화
     if len(st.session_state["questions"]) > 0: # 질문이 0개일 때는 삭제 버튼 비활성화
-         if st.button("🗑️ 마지막 질문 삭제", key="remove_question_button"): # 고유 key 설정
-            removed_idx = len(st.session_state["questions"]) - 1
-            st.session_state["questions"].pop()
-            # 삭제된 질문과 관련된 상태(답변, 메모, 세그먼트)도 함께 정리
-            if f"answer_{removed_idx}" in st.session_state:
-                 del st.session_state[f"answer_{removed_idx}"]
-            if f"memo_{removed_idx}" in st.session_state:
-                 del st.session_state[f"memo_{removed_idx}"]
-            if "answer_segments" in st.session_state and len(st.session_state["answer_segments"]) > removed_idx:
-                # 해당 인덱스의 세그먼트 정보 삭제
-                st.session_state["answer_segments"].pop() # 마지막 항목 pop
-                # 만약 삭제된 질문이 현재 녹음 중인 질문이었다면 상태 초기화
-                if st.session_state.get("currently_recording_idx") == removed_idx:
-                    st.session_state["currently_recording_idx"] = None
-                    # processor 상태도 초기화 필요 (이 부분은 WebRTC 특성상 어려움이 있을 수 있음 - restart 또는 logic 보완 필요)
-            st.rerun() # 상태 변경 후 새로고침
+         st.button("🗑️ 마지막 질문 삭제", key="remove_question_button", on_click=remove_last_question) # 고유 key 설정
 
 
 # --- 실시간 면접 진행 ---
@@ -202,24 +303,9 @@ st.info("""
 st.warning("⚠️ 브라우저 탭/창을 닫거나 새로고침하면 녹음 중인 오디오 데이터는 유실됩니다.")
 
 
-# 오디오 프레임을 수집할 전역 Recorder 클래스
-class GlobalRecorder(AudioProcessorBase):
-    def __init__(self):
-        self.frames = [] # 모든 오디오 프레임 저장
-        # self.is_recording_answer = False # 이제 이 상태는 Streamlit 세션 상태에서 관리
-        self.current_segment_start_idx = -1 # 현재 녹음 중인 답변의 시작 프레임 인덱스
-        # WebRTC 스트림 시작 시점의 프레임 인덱스 (오디오 전처리 시 초반 노이즈/버퍼링 프레임 무시 등에 활용될 수 있음)
-        self.stream_start_frame_idx = -1
-
-    def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
-        # 스트림 시작 시점 기록 (recv가 처음 호출될 때)
-        if self.stream_start_frame_idx == -1:
-             self.stream_start_frame_idx = len(self.frames)
-
-        self.frames.append(frame)
-
-        # 오디오 프레임을 가공 없이 그대로 반환 (여기서는 가공 필요 없음)
-        return frame
+# WebRTC(aiortc, av) 모듈은 import 가 무거우므로, 위의 면접 준비 화면이 먼저 그려진 뒤에 불러옴
+from streamlit_webrtc import webrtc_streamer, WebRtcMode
+from recorder import GlobalRecorder
 
 # 단일 WebRTC 스트리머 인스턴스 생성 (질문 루프 밖)
 # key는 Streamlit 앱 내에서 유일해야 하며, 이 인스턴스를 식별하는 데 사용됨
@@ -237,10 +323,28 @@ global_ctx = webrtc_streamer(
 )
 
 
-# 2. 위스퍼 모델 로드 완료 메시지 위치 이동
-# 사이드바에서 오디오 스트림 상태 메시지 바로 위로 이동
-# global_ctx가 초기화된 후 상태 표시 블록 이전에 위치
-st.sidebar.success("✅ Whisper 모델 로드 완료") # --> 위치 이동됨
+# 2. 위스퍼 모델 준비 상태 표시
+# 사이드바에서 오디오 스트림 상태 메시지 바로 위에 위치
+# 로드 중에는 이 영역만 주기적으로 다시 그리고, 로드가 끝나면 전체를 한 번 다시 실행해 완료 메시지로 바꿈
+@st.fragment(run_every=config.MODEL_STATUS_POLL_SECONDS)
+def render_model_loading_status():
+    if not model_loader.loading:
+        st.rerun()
+    st.info(f"⏳ 음성 인식 모델 로드 중... ({model_loader.elapsed:.0f}초 경과) 면접 준비는 계속 진행할 수 있습니다.")
+
+
+if model_loader.ready:
+    st.sidebar.success(f"✅ 음성 인식 모델 로드 완료: {model.description} ({model_loader.elapsed:.1f}초)")
+elif model_loader.error is not None:
+    st.sidebar.error(f"❌ 음성 인식 모델 로드 실패: {model_loader.error}")
+else:
+    with st.sidebar:
+        render_model_loading_status()
+if config.VAD_TRIM and vad_stats.calls:
+    st.sidebar.caption(
+        f"🔇 무음 제거: 전체 {vad_stats.original_seconds:.0f}초 중 "
+        f"{vad_stats.skipped_seconds:.0f}초 건너뜀 ({vad_stats.skipped_ratio:.0%})"
+    )
 
 
 # 전역 스트리머 상태 표시 (사이드바)
@@ -261,7 +365,7 @@ else:
          st.sidebar.error("❌ 오디오 스트림 연결 실패. 마이크 권한을 확인하거나 페이지 새로고침이 필요할 수 있습니다.")
 
 
-# 답변 오디오 세그먼트 정보를 저장할 상태 (시작, 종료 프레임 인덱스 튜플 또는 None)
+# 답변 오디오 세그먼트 정보를 저장할 상태 (시작, 종료 샘플 오프셋 튜플 또는 None)
 # 질문 목록 길이 변경에 맞춰 이 리스트의 길이도 관리되어야 함 (질문 추가/삭제 버튼 로직에 반영됨)
 if "answer_segments" not in st.session_state:
     st.session_state["answer_segments"] = [None] * len(st.session_state["questions"])
@@ -270,15 +374,136 @@ if "currently_recording_idx" not in st.session_state:
     st.session_state["currently_recording_idx"] = None
 
 
-interview_results = [] # 최종 결과(질문, 답변, 메모)를 수집할 리스트 (Excel 저장, 기록 저장에 사용)
+# 질문 인덱스 -> 최종 결과(질문, 답변, 메모) dict (Excel 저장, 기록 저장에 사용)
+# 카드 fragment 가 다시 실행될 때마다 해당 질문 항목만 갱신됨
+if "interview_rows" not in st.session_state:
+    st.session_state["interview_rows"] = {}
+interview_rows = st.session_state["interview_rows"]
 
 # 스트리머가 활성화되면 오디오 프로세서 객체를 가져옴
 processor = global_ctx.audio_processor if global_ctx and global_ctx.audio_processor else None
 
-
-# 각 질문에 대해 반복하며 면접 진행 UI 생성
-# 질문 목록이 비어있으면 아래 루프는 실행되지 않음
-for idx, question in enumerate(st.session_state["questions"]):
+# 녹음 중인 답변이 없는데 점진적 인식이 남아 있으면 정리 (질문 삭제 등으로 녹음이 끊긴 경우)
+if processor and st.session_state["currently_recording_idx"] is None:
+    processor.cancel_streaming()
+
+
+def prepare_answer_audio(idx):
+    """질문 idx 답변 구간의 준비된 오디오(PreparedAudio)를 반환합니다. 캐시에 없을 때만 계산합니다."""
+    start_idx, end_idx = st.session_state["answer_segments"][idx]
+    key = PreparedAudioCache.make_key(st.session_state["session_id"], idx, start_idx, end_idx)
+
+    def build():
+        if processor is None:
+            return None
+        samples = processor.read_segment(start_idx, end_idx)
+        if samples.size == 0:
+            return None
+        return PreparedAudio(prepare_whisper_input(samples, processor.sample_rate))
+
+    return audio_cache.get_or_create(key, build)
+
+
+def transcription_key(audio):
+    """답변 오디오의 음성 인식 결과 캐시 키 (무음 제거 설정도 결과에 영향을 주므로 포함)."""
+    options = {"language": "ko", "vad": [config.VAD_TRIM, config.VAD_AGGRESSIVENESS]}
+    return make_transcription_key(audio, model.description, options)
+
+
+def recognize_segments(audio, debug_name=None):
+    """16kHz float32 배열을 인식해 원본 녹음 기준 시간의 구간 목록을 반환합니다."""
+    speech_map = None
+    if config.VAD_TRIM:
+        # 무음 구간을 잘라내고, 구간 시간은 타임스탬프 맵으로 원본 녹음 기준으로 되돌림
+        audio, speech_map = trim_silence(audio, WHISPER_SAMPLE_RATE, config.VAD_AGGRESSIVENESS)
+        vad_stats.record(speech_map)
+        if audio.size == 0:
+            return []
+    if debug_name:
+        dump_debug_wav(audio, debug_name) # AUDIO_DEBUG_DUMP_DIR 설정 시에만 저장 (무음 제거 후 모델 입력)
+    if long_form is not None and long_form.accepts(audio):
+        segments = long_form.transcribe(audio, language="ko") # 긴 답변: 청크 병렬 인식 후 이어 붙임
+    else:
+        segments = (asr_batcher or model).transcribe(audio, language="ko")
+    if speech_map is not None:
+        segments = speech_map.remap_segments(segments)
+    return segments
+
+
+def run_transcription(audio, debug_name=None, cache_key=None):
+    """스케줄러 작업자 스레드에서 실행: 16kHz float32 배열을 텍스트로 변환합니다.
+
+    `cache_key` 를 주면 결과를 캐시에 보관하고, 같은 오디오를 다시 인식할 때는 보관된 결과를 씁니다.
+    """
+    if cache_key is None:
+        return segments_to_text(recognize_segments(audio, debug_name))
+    return segments_to_text(transcription_cache.get_or_transcribe(cache_key, lambda: recognize_segments(audio, debug_name)))
+
+
+def make_chunk_transcriber(session_id):
+    """점진적 인식용: 청크를 스케줄러에 넣고 결과를 기다리는 함수를 만듭니다 (세션 공정성 유지)."""
+    def transcribe_chunk(audio):
+        return scheduler.run(session_id, run_transcription, audio)
+    return transcribe_chunk
+
+
+def apply_finished_transcription(idx):
+    """끝난 음성 인식 작업 결과를 답변 상태에 반영합니다 (답변 영역이 그려지기 전에 호출)."""
+    job_id = st.session_state["transcribe_jobs"].get(idx)
+    if job_id is None:
+        return
+    job = scheduler.get(job_id)
+    if job is not None and not job.finished:
+        return
+    del st.session_state["transcribe_jobs"][idx]
+    if job is None:
+        st.session_state[f"answer_{idx}"] = "⚠ 음성 인식 작업 정보를 찾을 수 없습니다. 다시 시도해 주세요."
+    elif job.status == DONE:
+        st.session_state[f"answer_{idx}"] = job.result
+        st.toast(f"✅ 질문 {idx+1} 답변 음성 인식 완료!")
+    elif job.status == FAILED:
+        st.session_state[f"answer_{idx}"] = f"❌ 음성 처리 오류: {job.error}"
+    else:
+        st.session_state[f"answer_{idx}"] = "⏹️ 음성 인식이 취소되었습니다."
+    scheduler.forget(job_id)
+
+
+# 진행 중인 음성 인식 작업 상태를 주기적으로 확인하는 영역 (이 영역만 다시 그려짐)
+@st.fragment(run_every=config.TRANSCRIBE_POLL_SECONDS)
+def render_transcription_status(idx):
+    job_id = st.session_state["transcribe_jobs"].get(idx)
+    job = scheduler.get(job_id) if job_id else None
+    if job is None or job.finished:
+        st.rerun() # 결과를 답변 영역에 반영하기 위해 전체 재실행
+    if job.status == QUEUED:
+        st.info(f"⏳ 답변 {idx+1} 음성 인식 대기 중... (앞선 작업 약 {scheduler.queue_position(job_id)}건)")
+    elif not model.loaded:
+        st.info(f"⏳ 답변 {idx+1} 음성 인식 모델 로드를 기다리는 중... (로드 {model_loader.elapsed:.0f}초 경과)")
+    else:
+        st.info(f"🎙️ 답변 {idx+1} 음성 인식 중... ({time.time() - job.started_at:.0f}초 경과)")
+    if st.button(f"✖️ 답변 {idx+1} 음성 인식 취소", key=f"cancel_transcribe_{idx}"):
+        scheduler.cancel(job_id)
+        st.rerun()
+
+
+# 녹음 중인 답변의 부분 인식 결과를 주기적으로 갱신하는 답변 영역 (이 영역만 다시 그려짐)
+@st.fragment(run_every=config.STREAMING_REFRESH_SECONDS)
+def render_live_answer(idx, processor):
+    streaming = processor.streaming if processor else None
+    if streaming is not None:
+        partial = streaming.text
+        if partial:
+            st.session_state[f"answer_{idx}"] = partial
+        st.caption(f"🎧 녹음 중 실시간 인식... (미인식 구간 {streaming.pending_seconds:.1f}초)")
+    st.text_area("🖍️ 지원자 답변 (음성 인식 결과 및 수정)", value=st.session_state[f"answer_{idx}"], key=f"answer_{idx}", height=150)
+
+
+# 질문 하나의 면접 진행 카드 (이 영역만 다시 그려짐)
+# 카드 안의 녹음 시작/중지, 음성 인식, 답변/메모 입력은 이 카드만 다시 실행하므로
+# 질문 수가 늘어도 클릭 한 번의 재실행 비용은 일정함 (다른 카드, 안내 expander, 기록 목록은 다시 그리지 않음)
+@st.fragment
+def render_question_card(idx):
+    question = st.session_state["questions"][idx]
     st.subheader(f"❓ 질문 {idx+1}: {question if question.strip() else ' (질문 내용을 입력해주세요)'}")
 
     # 질문별 답변, 메모 텍스트 영역의 상태 초기화 (필요 시)
@@ -287,6 +512,7 @@ for idx, question in enumerate(st.session_state["questions"]):
          st.session_state[f"answer_{idx}"] = ""
     if f"memo_{idx}" not in st.session_state:
          st.session_state[f"memo_{idx}"] = ""
+    apply_finished_transcription(idx)
 
     # 답변 녹음 및 텍스트 변환 버튼을 위한 컬럼 레이아웃
     col_rec, col_transcribe = st.columns([1, 3]) # 녹음 버튼 컬럼을 작게
@@ -298,40 +524,51 @@ for idx, question in enumerate(st.session_state["questions"]):
             if st.session_state["currently_recording_idx"] == idx:
                 # ▶️ 녹음 중지 버튼 표시
                 if st.button(f"⏹️ 답변 {idx+1} 녹음 중지", key=f"stop_rec_{idx}"):
-                    end_idx = len(processor.frames) # 현재 시점의 누적 프레임 수를 종료 인덱스로
-                    start_idx = processor.current_segment_start_idx
-
-                    # 유효한 세그먼트인지 확인 (시작 인덱스가 기록되었고 종료 인덱스보다 큰지)
-                    # 최소 길이 제한 등을 추가하여 너무 짧은 오디오는 무시할 수 있음
-                    if start_idx != -1 and end_idx > start_idx + 10: # 예: 최소 10프레임 이상
-                         st.session_state["answer_segments"][idx] = (start_idx, end_idx)
-                         st.session_state[f"answer_{idx}"] = "✅ 답변 녹음 완료. 아래 '음성 인식' 버튼을 눌러 텍스트로 변환하거나 오디오를 확인하세요." # 메시지 수정
-                         processor.current_segment_start_idx = -1 # processor의 시작 인덱스 초기화
+                    # 현재 시점의 누적 샘플 수를 종료 오프셋으로 구간 확정 (최소 0.2초 미만이면 None)
+                    segment = processor.end_segment(min_seconds=0.2)
+
+                    if segment is not None:
+                         start_idx, end_idx = segment
+                         st.session_state["answer_segments"][idx] = segment
+                         prepare_answer_audio(idx) # 다운로드/음성 인식용 오디오를 녹음 종료 시 한 번만 준비
+                         # 녹음 중 미리 인식된 부분이 있으면 마지막 남은 구간만 인식하여 바로 답변에 반영
+                         with st.spinner(f"🎙️ 질문 {idx+1} 마지막 구간 인식 중..."):
+                             # 공유 큐가 밀려 있거나 모델이 아직 로드 중이면 오래 걸릴 수 있으므로 최대 시간만 기다림
+                             streamed_text = processor.finish_streaming(end_idx, config.STREAMING_FINISH_TIMEOUT_SECONDS)
+                         if streamed_text:
+                             st.session_state[f"answer_{idx}"] = streamed_text
+                         elif processor.streaming_error is not None and not isinstance(processor.streaming_error, TimeoutError):
+                             # 일부 구간 인식이 실패하면 빠진 부분이 있는 텍스트를 답변으로 쓰지 않음
+                             st.session_state[f"answer_{idx}"] = "⚠ 녹음 중 일부 구간의 음성 인식에 실패했습니다. 아래 '음성 인식' 버튼을 눌러 답변 전체를 다시 변환하세요."
+                         else:
+                             st.session_state[f"answer_{idx}"] = "✅ 답변 녹음 완료. 아래 '음성 인식' 버튼을 눌러 텍스트로 변환하거나 오디오를 확인하세요." # 메시지 수정
                          st.session_state["currently_recording_idx"] = None # 현재 녹음 중인 답변 인덱스 초기화
-                         st.success(f"✅ 질문 {idx+1} 답변 녹음이 중지되었습니다. 오디오 프레임: {start_idx} ~ {end_idx}")
-                         st.rerun() # 상태 업데이트를 위해 재실행
+                         st.success(f"✅ 질문 {idx+1} 답변 녹음이 중지되었습니다. 오디오 샘플: {start_idx} ~ {end_idx}")
+                         st.rerun(scope="fragment") # 이 카드만 다시 그림
                     else:
                          # 녹음 시작 버튼은 눌렀으나 유의미한 프레임이 캡처되지 않은 경우
                          st.session_state[f"answer_{idx}"] = "⚠ 녹음된 오디오가 너무 짧거나 없습니다. 다시 녹음해 주세요."
                          st.warning(f"⚠ 질문 {idx+1} 녹음된 오디오 프레임이 너무 짧거나 없습니다.")
-                         processor.current_segment_start_idx = -1 # processor의 시작 인덱스 초기화
+                         processor.cancel_streaming()
                          st.session_state["currently_recording_idx"] = None # 현재 녹음 중인 답변 인덱스 초기화
-                         st.rerun()
+                         st.rerun(scope="fragment")
 
 
-            # 현재 녹음 중이 아닌 경우 (다른 답변이 녹음 중이거나 모든 녹음이 중지된 상태)
-            elif st.session_state["currently_recording_idx"] is None:
-                # ▶️ 녹음 시작 버튼 표시 (현재 녹음 중인 답변이 없을 때만 활성화)
-                 if st.button(f"▶️ 답변 {idx+1} 녹음 시작", key=f"start_rec_{idx}"):
-                     # 현재 시점의 누적 프레임 수를 시작 인덱스로 기록
-                     processor.current_segment_start_idx = len(processor.frames)
+            # 현재 녹음 중이 아닌 경우
+            # 다른 카드는 함께 다시 그려지지 않으므로 버튼을 비활성화하지 않고, 누른 시점에 다른 답변 녹음 여부를 확인
+            elif st.button(f"▶️ 답변 {idx+1} 녹음 시작", key=f"start_rec_{idx}"):
+                 if st.session_state["currently_recording_idx"] is not None:
+                     st.warning(f"⚠ 질문 {st.session_state['currently_recording_idx']+1} 답변 녹음 중입니다. 먼저 녹음을 중지해 주세요.")
+                 else:
+                     # 현재 시점의 누적 샘플 수를 시작 오프셋으로 기록
+                     processor.begin_segment()
+                     audio_cache.invalidate(st.session_state["session_id"], idx) # 재녹음 시 이전 답변 오디오 정리
+                     if config.STREAMING_TRANSCRIPTION:
+                         processor.start_streaming(make_chunk_transcriber(st.session_state["session_id"])) # 녹음과 동시에 청크 단위 인식 시작
                      st.session_state["currently_recording_idx"] = idx # 현재 녹음 중인 답변 인덱스 기록
                      st.session_state[f"answer_{idx}"] = "🎧 답변 녹음 중..." # 사용자에게 피드백
                      st.info(f"▶️ 질문 {idx+1} 답변 녹음이 시작되었습니다. 답변 완료 후 '녹음 중지'를 눌러주세요.")
-                     st.rerun() # 상태 업데이트를 위해 재실행
-            else:
-                 # 다른 답변이 녹음 중일 때는 이 질문의 녹음 시작 버튼 비활성화
-                 st.button(f"▶️ 답변 {idx+1} 녹음 시작", key=f"start_rec_{idx}_disabled", disabled=True, help="다른 답변 녹음 중입니다.")
+                     st.rerun(scope="fragment") # 이 카드만 다시 그림
 
 
         # 텍스트 변환 버튼 영역
@@ -339,119 +576,53 @@ for idx, question in enumerate(st.session_state["questions"]):
             # 해당 질문에 대한 답변 세그먼트가 기록된 경우 (None이 아닌 경우)
             if st.session_state["answer_segments"][idx] is not None:
                 # 🎤 음성 인식 버튼 표시
-                # 현재 다른 답변이 녹음 중일 때는 변환 버튼 비활성화 (처리 중 부하 방지 등)
-                is_transcribe_disabled = st.session_state["currently_recording_idx"] is not None
-                if st.button(f"🎤 답변 {idx+1} 음성 인식", key=f"transcribe_{idx}", disabled=is_transcribe_disabled, help="다른 답변 녹음 중에는 음성 인식을 할 수 없습니다." if is_transcribe_disabled else None):
-                    start_idx, end_idx = st.session_state["answer_segments"][idx]
-                    segment_frames = processor.frames[start_idx:end_idx]
-
-                    if not segment_frames:
-                        st.warning("⚠ 녹음된 오디오 프레임이 없습니다. 다시 녹음해 주세요.")
-                        st.session_state[f"answer_{idx}"] = "⚠ 오디오 프레임 부족 또는 오류."
+                # 이 답변의 인식 작업이 진행 중일 때는 변환 버튼 비활성화
+                # 다른 답변 녹음 중 여부는 다른 카드에서 바뀔 수 있으므로 누른 시점에 확인 (처리 중 부하 방지 등)
+                is_transcribing = idx in st.session_state["transcribe_jobs"]
+                if st.button(f"🎤 답변 {idx+1} 음성 인식", key=f"transcribe_{idx}", disabled=is_transcribing):
+                    prepared = prepare_answer_audio(idx)
+
+                    if st.session_state["currently_recording_idx"] is not None:
+                        st.warning("⚠ 다른 답변 녹음 중에는 음성 인식을 할 수 없습니다.")
+                    elif prepared is None:
+                        st.warning("⚠ 녹음된 오디오가 없습니다. 다시 녹음해 주세요.")
+                        st.session_state[f"answer_{idx}"] = "⚠ 오디오 샘플 부족 또는 오류."
                     else:
-                        with st.spinner(f"🎙️ 질문 {idx+1} 답변 음성 인식 중..."):
-                            temp_audio_path = None
+                        cache_key = transcription_key(prepared.audio)
+                        cached_segments = transcription_cache.get(cache_key)
+                        if cached_segments is not None:
+                            # 이미 인식한 오디오: 작업 큐를 거치지 않고 보관된 결과를 바로 표시
+                            st.session_state[f"answer_{idx}"] = segments_to_text(cached_segments)
+                            st.toast(f"✅ 질문 {idx+1} 답변 음성 인식 완료! (이전 결과 재사용)")
+                        else:
                             try:
-                                # Determine the actual sample rate from the first frame
-                                # Assuming all frames have the same sample rate as the first.
-                                original_sample_rate = segment_frames[0].rate if segment_frames else 0
-
-                                # Convert frames to numpy array and handle stereo to mono
-                                audio_np_list = []
-                                for f_ in segment_frames:
-                                    data = f_.to_ndarray()
-                                    if f_.layout.name in ["stereo", "stereo_downmix"]:
-                                        audio_np_list.append(np.mean(data, axis=0)) # Downmix stereo to mono
-                                    else:
-                                        audio_np_list.append(data.flatten()) # Assume mono or handle other layouts as mono
-
-                                audio_np_combined = np.concatenate(audio_np_list)
-
-                                # Resample if necessary (Whisper requires 16kHz)
-                                target_sample_rate = 16000
-                                if original_sample_rate != target_sample_rate and original_sample_rate > 0:
-                                    # Ensure audio_np_combined is float type for librosa
-                                    audio_np_combined = audio_np_combined.astype(np.float32)
-                                    audio_final_for_whisper = librosa.resample(y=audio_np_combined, orig_sr=original_sample_rate, target_sr=target_sample_rate)
-                                    st.info(f"🎤 오디오를 {original_sample_rate}Hz에서 {target_sample_rate}Hz로 리샘플링했습니다.")
-                                else:
-                                    audio_final_for_whisper = audio_np_combined
-
-                                # Normalize and convert to int16 for WAV file
-                                if np.max(np.abs(audio_final_for_whisper)) > 0:
-                                    audio_final_for_whisper = audio_final_for_whisper / np.max(np.abs(audio_final_for_whisper))
-                                audio_int16 = np.int16(audio_final_for_whisper * 32767)
-
-                                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-                                    sf.write(f.name, audio_int16, target_sample_rate, format='WAV', subtype='PCM_16')
-                                    temp_audio_path = f.name
-
-                                result = model.transcribe(temp_audio_path, language="ko")
-                                st.session_state[f"answer_{idx}"] = result["text"].strip()
-                                st.success(f"✅ 질문 {idx+1} 답변 음성 인식 완료!")
-
-                                # 🎧 디버깅: 오디오 파형과 수치 확인
-                                st.write("🔍 평균값:", np.mean(audio_final_for_whisper), "최댓값:", np.max(audio_final_for_whisper))
-                                st.line_chart(audio_final_for_whisper[:1000])
-
-                            except Exception as e:
-                                st.error(f"❌ 질문 {idx+1} 음성 처리 오류: {e}")
-                                st.session_state[f"answer_{idx}"] = f"❌ 음성 처리 오류: {e}"
-                            finally:
-                                if temp_audio_path and os.path.exists(temp_audio_path):
-                                    os.remove(temp_audio_path)
+                                # 녹음 중지 시 준비해 둔 16kHz float32 배열을 작업 큐에 넣고 바로 반환 (스크립트 실행을 막지 않음)
+                                job_id = scheduler.submit(st.session_state["session_id"], run_transcription,
+                                                          prepared.audio, f"answer_{idx+1}", cache_key)
+                                st.session_state["transcribe_jobs"][idx] = job_id
+                                st.session_state[f"answer_{idx}"] = "⏳ 음성 인식 중... 완료되면 자동으로 표시됩니다."
+                                is_transcribing = True
+                            except QueueFullError as e:
+                                st.warning(f"⚠ {e}")
+
+                if is_transcribing:
+                    render_transcription_status(idx) # 진행 상태 표시 및 완료 시 결과 반영
 
                 # --- Audio Download Button ---
-                # Downloader will also provide 16kHz resampled audio for consistency
-                temp_audio_path_download = None
+                # 녹음 중지 시 한 번 준비해 둔 16kHz WAV 바이트를 그대로 제공 (rerun마다 다시 인코딩하지 않음)
+                # 바이트는 버튼을 누를 때만 넘겨, 재실행마다 미디어 저장소에 WAV 를 다시 올리지 않음
                 try:
-                    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f_dl:
-                        start_idx_dl, end_idx_dl = st.session_state["answer_segments"][idx]
-                        segment_frames_dl = processor.frames[start_idx_dl:end_idx_dl]
-
-                        if segment_frames_dl:
-                            original_sample_rate_dl = segment_frames_dl[0].rate if segment_frames_dl else 0
-
-                            audio_np_list_dl = []
-                            for f_dl_frame in segment_frames_dl:
-                                data_dl = f_dl_frame.to_ndarray()
-                                if f_dl_frame.layout.name in ["stereo", "stereo_downmix"]:
-                                    audio_np_list_dl.append(np.mean(data_dl, axis=0))
-                                else:
-                                    audio_np_list_dl.append(data_dl.flatten())
-
-                            audio_np_combined_dl = np.concatenate(audio_np_list_dl)
-
-                            # Resample to 16kHz for download as well, for consistency with transcription
-                            target_sample_rate_dl = 16000
-                            if original_sample_rate_dl != target_sample_rate_dl and original_sample_rate_dl > 0:
-                                audio_np_combined_dl = audio_np_combined_dl.astype(np.float32)
-                                audio_final_dl = librosa.resample(y=audio_np_combined_dl, orig_sr=original_sample_rate_dl, target_sr=target_sample_rate_dl)
-                            else:
-                                audio_final_dl = audio_np_combined_dl
-
-                            if np.max(np.abs(audio_final_dl)) > 0:
-                                audio_final_dl = audio_final_dl / np.max(np.abs(audio_final_dl))
-                            audio_int16_dl = np.int16(audio_final_dl * 32767)
-
-                            sf.write(f_dl.name, audio_int16_dl, target_sample_rate_dl, format='WAV', subtype='PCM_16')
-                            temp_audio_path_download = f_dl.name
-
-                    if temp_audio_path_download and os.path.exists(temp_audio_path_download):
-                        with open(temp_audio_path_download, "rb") as file:
-                            st.download_button(
-                                label=f"⬇️ 답변 {idx+1} 오디오 다운로드 (.wav)",
-                                data=file,
-                                file_name=f"답변_{idx+1}_오디오_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.wav",
-                                mime="audio/wav",
-                                key=f"actual_download_btn_{idx}"
-                            )
+                    prepared_dl = prepare_answer_audio(idx)
+                    if prepared_dl is not None:
+                        st.download_button(
+                            label=f"⬇️ 답변 {idx+1} 오디오 다운로드 (.wav)",
+                            data=lambda prepared=prepared_dl: prepared.wav_bytes,
+                            file_name=f"답변_{idx+1}_오디오_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.wav",
+                            mime="audio/wav",
+                            key=f"actual_download_btn_{idx}"
+                        )
                 except Exception as e:
                      st.error(f"❌ 답변 {idx+1} 오디오 다운로드 준비 중 오류 발생: {e}")
-                finally:
-                    # Files created with delete=False will persist until process ends or manual cleanup.
-                    # This is necessary for st.download_button to work correctly.
-                    pass
 
 
             else:
@@ -461,16 +632,29 @@ for idx, question in enumerate(st.session_state["questions"]):
 
 
         # 음성 인식 결과 (수정 가능) 및 면접관 메모 입력 필드
-        st.text_area("🖍️ 지원자 답변 (음성 인식 결과 및 수정)", value=st.session_state[f"answer_{idx}"], key=f"answer_{idx}", height=150)
+        if st.session_state["currently_recording_idx"] == idx and processor.streaming is not None:
+            render_live_answer(idx, processor) # 녹음 중에는 부분 인식 결과를 주기적으로 갱신
+        else:
+            st.text_area("🖍️ 지원자 답변 (음성 인식 결과 및 수정)", value=st.session_state[f"answer_{idx}"], key=f"answer_{idx}", height=150)
         st.text_area("🗂️ 면접관 메모", value=st.session_state[f"memo_{idx}"], key=f"memo_{idx}", height=100)
 
-        interview_results.append({
+        # 카드가 다시 그려질 때마다 이 질문의 최신 결과를 갱신 (Excel 저장, 기록 저장에 사용)
+        interview_rows[idx] = {
             "질문번호": idx+1,
             "질문": question,
             "지원자 답변": st.session_state[f"answer_{idx}"],
             "면접관 메모": st.session_state[f"memo_{idx}"]
-        })
+        }
         st.markdown("---") # 각 질문 섹션 구분선
+    else:
+        interview_rows.pop(idx, None)
+
+
+# 질문 목록이 비어있으면 카드를 그리지 않음
+for idx in range(len(st.session_state["questions"])):
+    render_question_card(idx)
+# 질문 순서대로 최종 결과(질문, 답변, 메모) 목록 구성
+interview_results = [interview_rows[idx] for idx in sorted(interview_rows) if idx < len(st.session_state["questions"])]
 
 # --- 결과 저장 및 기록 관리 ---
 st.header("4️⃣ 결과 저장 및 기록 관리")
@@ -478,94 +662,178 @@ st.header("4️⃣ 결과 저장 및 기록 관리")
 # Excel 다운로드 버튼과 기록 관리 버튼을 위한 컬럼 레이아웃
 col_excel, col_history = st.columns([1, 1])
 
+# 내보내기 파일 캐시 (모든 세션 공유): 결과 내용 해시가 같으면 만들어 둔 파일을 재사용
+@st.cache_resource
+def get_export_cache():
+    return ExportCache()
+
+
+export_cache = get_export_cache()
+EXPORT_FORMAT_LABELS = {
+    fmt: label
+    for fmt, label in {"xlsx": "Excel (.xlsx)", "csv": "CSV (.csv)", "parquet": "Parquet (.parquet)"}.items()
+    if fmt in EXPORT_FORMATS # pyarrow 가 없으면 Parquet 은 숨김
+}
+
 with col_excel:
-    # interview_results 리스트(현재 면접의 최신 상태)를 DataFrame으로 변환
-    df = pd.DataFrame(interview_results)
-
-    # DataFrame을 Excel 파일 형식으로 메모리(BytesIO)에 저장
-    excel_output = io.BytesIO()
-    # ExcelWriter를 사용하여 xlsx 형식으로 저장
-    with pd.ExcelWriter(excel_output, engine='xlsxwriter') as writer:
-        # DataFrame을 Excel 시트에 쓰기 (인덱스 제외)
-        df.to_excel(writer, sheet_name=f"{st.session_state.get('candidate', '면접결과')}_면접 결과", index=False)
-        # Excel 파일 닫기 (writer가 종료될 때 자동 저장)
-
-    # Excel 파일 다운로드 버튼 생성
+    export_format = st.selectbox("내보내기 형식", list(EXPORT_FORMAT_LABELS), format_func=EXPORT_FORMAT_LABELS.get, key="export_format")
+    extension, mime = EXPORT_FORMATS[export_format]
+    candidate_name = st.session_state.get('candidate', '면접결과')
+    # 결과 파일 다운로드 버튼 생성
+    # 파일은 버튼을 누를 때 만들며 (재실행마다 워크북을 다시 만들지 않음), 질문 카드만 다시 그려진 뒤에도
+    # 최신 답변/메모가 담기도록 카드가 갱신하는 interview_rows 를 읽음
     st.download_button(
-        label="📥 현재 면접 결과 Excel 다운로드", # 버튼 라벨
-        data=excel_output.getvalue(),          # 다운로드할 데이터 (BytesIO의 값)
-        file_name=f"{datetime.datetime.now().strftime('%Y%m%d_%H%M')}_{st.session_state.get('candidate', '면접결과')}_면접결과.xlsx", # 다운로드될 파일 이름
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" # 파일 MIME 타입
+        label=f"📥 현재 면접 결과 {EXPORT_FORMAT_LABELS[export_format].split()[0]} 다운로드", # 버튼 라벨
+        data=lambda rows=interview_rows, fmt=export_format, sheet=f"{candidate_name}_면접 결과": export_cache.get_or_create(
+            [row for _, row in sorted(list(rows.items()))], fmt, sheet # 카드 갱신과 겹쳐도 안전하도록 한 번에 복사
+        ),
+        file_name=f"{datetime.datetime.now().strftime('%Y%m%d_%H%M')}_{candidate_name}_면접결과.{extension}", # 다운로드될 파일 이름
+        mime=mime # 파일 MIME 타입
     )
 
 # --- 면접 기록 저장 및 조회 ---
 
-# 전체 면접 기록을 저장할 리스트를 세션 상태에 초기화
-if "history" not in st.session_state:
-    st.session_state["history"] = [] # 전체 면접 기록 리스트
+# 면접 기록 저장소 (모든 세션 공유, 로컬 SQLite): 새로고침/재시작 후에도 남고, 답변/메모 전문 검색 지원
+@st.cache_resource
+def get_history_store():
+    return InterviewHistoryStore(config.HISTORY_DB_PATH)
+
+
+history_store = get_history_store()
 
 # 현재 기록 중인 면접의 상세 정보 표시 상태를 관리할 변수
-# None: 아무 기록도 상세 표시 안함, 숫자: 해당 인덱스의 기록 상세 표시
+# None: 아무 기록도 상세 표시 안함, 숫자: 해당 기록 ID 의 상세 표시
 if "showing_history_details" not in st.session_state:
      st.session_state["showing_history_details"] = None
+# 기록 목록의 현재 페이지 (0부터 시작)
+if "history_page" not in st.session_state:
+     st.session_state["history_page"] = 0
 
 with col_history:
-    # 현재 면접 상태를 기록 리스트에 추가하는 버튼
+    # 현재 면접 상태를 기록 저장소에 추가하는 버튼
     if st.button("📌 현재 면접 기록 저장"):
-        # 현재 interview_results 리스트 (화면에 보이는 최신 상태)를 기록 리스트에 추가
-        # 기록 리스트에 추가될 때의 스냅샷을 저장하기 위해 interview_results[:]와 같이 복사본 저장
-        st.session_state["history"].append({
-            "일시": datetime.datetime.now().strftime('%Y-%m-%d %H:%M'), # 저장 시점 일시
-            "면접관": st.session_state.get("interviewer", "N/A"), # 세션 상태에서 면접관 이름 가져옴
-            "부서": st.session_state.get("department", "N/A"),     # 세션 상태에서 부서명 가져옴
-            "지원자": st.session_state.get("candidate", "N/A"),     # 세션 상태에서 지원자 이름 가져옴
-            "기록": interview_results[:] # 현재 면접 결과 리스트의 복사본 저장
-        })
+        # 현재 interview_results 리스트 (화면에 보이는 최신 상태)의 스냅샷을 저장
+        history_store.save(
+            st.session_state.get("interviewer", "N/A"), # 세션 상태에서 면접관 이름 가져옴
+            st.session_state.get("department", "N/A"),  # 세션 상태에서 부서명 가져옴
+            st.session_state.get("candidate", "N/A"),   # 세션 상태에서 지원자 이름 가져옴
+            interview_results,
+            interview_date=today,
+        )
         st.success("✅ 현재 면접 기록이 저장되었습니다.")
 
+
+def reset_history_page():
+    # 검색 조건이 바뀌면 첫 페이지부터 표시
+    st.session_state["history_page"] = 0
+
+
+def set_history_state(key, value):
+    st.session_state[key] = value
+
+
+# 저장된 면접 기록 목록 (이 영역만 다시 그려짐)
+# 상세 보기/닫기, 페이지 이동, 검색 조건 변경은 이 fragment 만 다시 실행하므로
+# 녹음 UI, 질문 목록, Excel 내보내기는 다시 그리지 않음
+@st.fragment
+def render_history():
+    # 검색 조건: 답변/메모 전문 검색, 지원자 이름, 부서, 면접 기간
+    col_q, col_cand, col_dept, col_date = st.columns([3, 2, 2, 3])
+    with col_q:
+        history_query = st.text_input("🔎 답변/메모 검색", key="history_query", on_change=reset_history_page)
+    with col_cand:
+        history_candidate = st.text_input("지원자", key="history_candidate", on_change=reset_history_page)
+    with col_dept:
+        history_department = st.selectbox("부서", [""] + history_store.departments(), key="history_department",
+                                          format_func=lambda d: d or "전체", on_change=reset_history_page)
+    with col_date:
+        history_dates = st.date_input("면접 기간", value=(), key="history_dates", on_change=reset_history_page)
+    date_from = history_dates[0] if len(history_dates) > 0 else None
+    date_to = history_dates[1] if len(history_dates) > 1 else date_from
+
+    # 현재 페이지의 요약만 읽고 그림 (상세 기록은 열려 있는 기록 하나만 읽음)
+    page_size = config.HISTORY_PAGE_SIZE
+    filters = dict(query=history_query, candidate=history_candidate, department=history_department,
+                   date_from=date_from, date_to=date_to)
+    summaries, total = history_store.search(**filters, page=st.session_state["history_page"], page_size=page_size)
+    page_count = max(1, (total + page_size - 1) // page_size)
+    if st.session_state["history_page"] >= page_count:
+        # 기록 삭제 등으로 현재 페이지가 사라진 경우 마지막 페이지를 표시
+        st.session_state["history_page"] = page_count - 1
+        summaries, total = history_store.search(**filters, page=page_count - 1, page_size=page_size)
+
+    # 저장된 기록이 없을 경우 안내 메시지
+    if total == 0:
+        st.info("저장된 면접 기록이 없습니다." if history_store.count() == 0 else "조건에 맞는 면접 기록이 없습니다.")
+        return
+
+    # 저장소가 최신 기록부터 반환하므로 최신 기록이 상단에 옴
+    for h in summaries:
+        i = h["id"]
+        is_open = st.session_state["showing_history_details"] == i
+
+        st.markdown(f"---") # 각 기록 섹션 구분선
+
+        # 기록 요약 정보와 상세 보기/닫기 버튼을 위한 컬럼 레이아웃
+        col_hist_sum, col_hist_btn = st.columns([3, 1])
+        with col_hist_sum:
+             # 기록 요약 정보 표시 (한 번에 그려 요소 수를 줄임)
+             st.markdown(
+                 f"**🕒 일시:** {h['interview_date']} (저장 {h['saved_at']})  \n"
+                 f"**🧑‍💼 지원자:** {h['candidate']} / **🏢 부서:** {h['department']}  \n"
+                 f"**👤 면접관:** {h['interviewer']} / **질문 수:** {h['question_count']}"
+             )
+
+        with col_hist_btn:
+             # 버튼 콜백에서 상태만 바꾸고, 클릭에 따른 fragment 재실행 한 번으로 반영 (st.rerun 불필요)
+             if is_open:
+                 st.button("➖ 상세 보기 닫기", key=f"hide_his_{i}",
+                           on_click=set_history_state, args=("showing_history_details", None))
+             else:
+                 st.button("🔍 상세 보기", key=f"show_his_{i}",
+                           on_click=set_history_state, args=("showing_history_details", i))
+
+        # 상세 보기 중인 기록만 저장소에서 읽어 표시
+        if is_open:
+            detail = history_store.get(i)
+            st.markdown("---") # 상세 내용 시작 구분선
+            st.subheader("상세 기록")
+            # 저장된 기록(질문-답변-메모 리스트)을 순회하며 상세 내용 표시
+            for row in (detail or {}).get("records", []): # 기록이 삭제되었을 경우를 대비하여 [] 사용
+                # 각 항목의 키가 없을 경우 기본값 'N/A' 표시
+                st.markdown(f"**Q{row.get('질문번호', 'N/A')}:** {row.get('질문', 'N/A')}")
+                st.markdown(f"**🖍️ 지원자 답변:** {row.get('지원자 답변', 'N/A')}")
+                st.markdown(f"**🗂️ 면접관 메모:** {row.get('면접관 메모', 'N/A')}")
+                st.markdown("---") # 질문별 구분선
+
+    # 검색 결과 전체 내보내기: 버튼을 누를 때 저장소에서 조금씩 읽어 임시 파일로 쓴 뒤 그 내용을 내려보냄
+    col_fmt, col_dl = st.columns([1, 2])
+    with col_fmt:
+        history_format = st.selectbox("형식", list(EXPORT_FORMAT_LABELS), format_func=EXPORT_FORMAT_LABELS.get,
+                                      key="history_export_format", label_visibility="collapsed")
+    with col_dl:
+        extension, mime = EXPORT_FORMATS[history_format]
+        st.download_button(
+            f"📦 검색된 면접 {total:,}건 내보내기",
+            data=lambda fmt=history_format, filters=filters: export_history_bytes(history_store, fmt, **filters),
+            file_name=f"{datetime.datetime.now().strftime('%Y%m%d_%H%M')}_면접기록.{extension}",
+            mime=mime,
+            key="history_export_button",
+        )
+
+    # 페이지 이동
+    page = st.session_state["history_page"]
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("◀ 이전", key="history_prev", disabled=page == 0,
+                  on_click=set_history_state, args=("history_page", page - 1))
+    with col_page:
+        st.caption(f"{page + 1} / {page_count} 페이지 (전체 {total:,}건)")
+    with col_next:
+        st.button("다음 ▶", key="history_next", disabled=page >= page_count - 1,
+                  on_click=set_history_state, args=("history_page", page + 1))
+
+
 # 저장된 면접 히스토리를 볼 수 있는 Expander
 with st.expander("📚 저장된 면접 기록 보기", expanded=False):
-    # 저장된 기록이 없을 경우 안내 메시지
-    if not st.session_state["history"]:
-        st.info("저장된 면접 기록이 없습니다.")
-    else:
-        # 저장된 기록 리스트를 역순으로 순회하여 최신 기록이 상단에 오도록 함
-        # enumerate(reversed(...)) 사용 시 인덱스가 역순이 되므로, range와 reversed 사용
-        for i in reversed(range(len(st.session_state["history"]))):
-            h = st.session_state["history"][i] # 해당 인덱스의 기록 데이터
-
-            st.markdown(f"---") # 각 기록 섹션 구분선
-
-            # 기록 요약 정보와 상세 보기/닫기 버튼을 위한 컬럼 레이아웃
-            col_hist_sum, col_hist_btn = st.columns([3, 1])
-            with col_hist_sum:
-                 # 기록 요약 정보 표시 (get() 사용으로 키 오류 방지)
-                 st.markdown(f"**🕒 일시:** {h.get('일시', 'N/A')}")
-                 st.markdown(f"**🧑‍💼 지원자:** {h.get('지원자', 'N/A')} / **🏢 부서:** {h.get('부서', 'N/A')}")
-                 st.markdown(f"**👤 면접관:** {h.get(' 면접관', 'N/A')}")
-
-            with col_hist_btn:
-                 # 현재 이 기록의 상세 내용을 보고 있는 경우
-                 if st.session_state["showing_history_details"] == i:
-                     # '상세 보기 닫기' 버튼 표시
-                     if st.button(f"➖ 상세 보기 닫기", key=f"hide_his_{i}"):
-                          st.session_state["showing_history_details"] = None # 상세 보기 상태 초기화
-                          st.rerun() # 상태 변경 반영을 위해 새로고침
-
-                 # 현재 이 기록의 상세 내용을 보고 있지 않은 경우
-                 else:
-                     if st.button(f"🔍 상세 보기", key=f"show_his_{i}"):
-                          st.session_state["showing_history_details"] = i # 상세 보기 상태를 현재 기록 인덱스로 설정
-                          st.rerun() # 상태 변경 반영을 위해 새로고침
-
-            # `showing_history_details` 상태가 현재 기록의 인덱스와 일치할 경우에만 상세 내용을 표시
-            if st.session_state["showing_history_details"] == i:
-                st.markdown("---") # 상세 내용 시작 구분선
-                st.subheader("상세 기록")
-                # 저장된 기록(질문-답변-메모 리스트)을 순회하며 상세 내용 표시
-                for row in h.get("기록", []): # '기록' 키가 없거나 비어있을 경우를 대비하여 [] 반환
-                    # 각 항목의 키가 없을 경우 기본값 'N/A' 표시
-                    st.markdown(f"**Q{row.get('질문번호', 'N/A')}:** {row.get('질문', 'N/A')}")
-                    st.markdown(f"**🖍️ 지원자 답변:** {row.get('지원자 답변', 'N/A')}")
-                    st.markdown(f"**🗂️ 면접관 메모:** {row.get('면접관 메모', 'N/A')}")
-                    st.markdown("---") # 질문별 구분선
\ No newline at end of file
+    render_history()
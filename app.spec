@@ -25,19 +25,18 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# onefile 로 묶으면 실행할 때마다 모든 파일(streamlit 전체 포함)을 임시 폴더에 풀고 나서 시작하므로,
+# 폴더(onedir) 배포로 바꾸어 압축 해제 없이 바로 시작함. UPX 압축도 시작 시 해제 비용이 들어 끔.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='app',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -45,3 +44,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='app',
+)
@@ -0,0 +1,354 @@
+"""음성 인식(ASR) 백엔드.
+
+모든 백엔드는 `load()` 로 모델을 준비하고, `transcribe(audio)` 로 구간(segment) 목록을 반환합니다.
+구간은 {"start": 초, "end": 초, "text": 문자열} 형태의 dict 입니다.
+사용할 백엔드와 모델은 config.ASR_BACKEND / config.ASR_MODEL 로 고릅니다.
+config.ASR_SERVER_URL 을 설정하면 모델을 직접 올리지 않고 로컬 음성 인식 서버(asr_server.py)에 요청합니다.
+"""
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+
+import config
+
+
+class ASRBackend:
+    """ASR 백엔드 공통 인터페이스."""
+
+    name = "base"
+    # 한 모델 객체로 동시에 처리할 수 있는 인식 작업 수
+    max_concurrency = 1
+
+    def __init__(self, model_name="base", language="ko"):
+        self.model_name = model_name
+        self.language = language
+        self._model = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def description(self) -> str:
+        return f"{self.name} ({self.model_name})"
+
+    def load(self):
+        """모델을 메모리에 올립니다. 여러 번 호출해도 한 번만 로드합니다.
+
+        백그라운드 로드 중에 다른 스레드가 호출하면 로드가 끝날 때까지 기다립니다.
+        """
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def transcribe(self, audio, **options) -> list:
+        """오디오를 인식해 구간 목록을 반환합니다.
+
+        audio 는 16kHz mono float32 NumPy 배열 또는 오디오 파일 경로입니다.
+        """
+        self.load()
+        options.setdefault("language", self.language)
+        return self._transcribe(audio, **options)
+
+    def transcribe_batch(self, audios, **options) -> list:
+        """여러 오디오를 인식해 오디오별 구간 목록을 반환합니다 (음성 인식 서버의 배치 처리용).
+
+        기본 구현은 하나씩 차례로 인식합니다.
+        """
+        return [self.transcribe(audio, **options) for audio in audios]
+
+    def _load_model(self):
+        raise NotImplementedError
+
+    def _transcribe(self, audio, **options):
+        raise NotImplementedError
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper (PyTorch FP32, CPU).
+
+    디코딩 시 모델 모듈에 kv-cache hook 을 거는 구조라 같은 모델을 여러 스레드에서 동시에 호출하면 안 됩니다.
+    """
+
+    name = "whisper"
+    # whisper.transcribe 의 기본 판정 기준 (배치 인식에서 창별로 같은 기준을 씀)
+    COMPRESSION_RATIO_THRESHOLD = 2.4
+    LOGPROB_THRESHOLD = -1.0
+    NO_SPEECH_THRESHOLD = 0.6
+    # 배치 인식 창의 목표 길이(초, 이 근처의 무음에서 자름)와 타임스탬프 토큰 한 칸의 길이(초)
+    WINDOW_SECONDS = 24.0
+    TIME_PRECISION = 0.02
+
+    def __init__(self, model_name="base", language="ko", batch_windows=8):
+        super().__init__(model_name, language)
+        # transcribe_batch 에서 encoder/decoder 한 번에 넣는 최대 30초 창 수
+        self.batch_windows = max(1, batch_windows)
+
+    def _load_model(self):
+        import whisper
+
+        return whisper.load_model(self.model_name)
+
+    def _transcribe(self, audio, **options):
+        options.setdefault("fp16", False) # CPU에서는 FP16 미지원
+        result = self._model.transcribe(audio, **options)
+        return [
+            {"start": float(seg["start"]), "end": float(seg["end"]), "text": seg["text"].strip()}
+            for seg in result.get("segments", [])
+        ]
+
+    def transcribe_batch(self, audios, **options) -> list:
+        """여러 오디오를 무음 경계에서 30초 이하의 창으로 잘라, 모든 오디오의 창을 모아 배치 encoder/decoder 로 인식합니다.
+
+        창마다 타임스탬프 토큰으로 구간을 나눕니다. 반복/저신뢰 판정(whisper.transcribe 와 같은 기준)에 걸린 창만
+        온도 fallback 이 있는 기존 방식으로 다시 인식합니다. 오디오가 하나이거나 언어 외의 옵션을 주면 하나씩 인식합니다.
+        """
+        if len(audios) < 2 or set(options) - {"language"}:
+            return super().transcribe_batch(audios, **options)
+        import torch
+        import whisper
+        from whisper.audio import N_SAMPLES, SAMPLE_RATE
+        from whisper.tokenizer import get_tokenizer
+
+        from vad import split_at_silence
+
+        self.load()
+        language = options.get("language", self.language)
+        windows = []  # (오디오 번호, 시작 초, 창 샘플)
+        for i, audio in enumerate(audios):
+            if isinstance(audio, str):
+                audio = whisper.load_audio(audio)
+            # 단어가 창 경계에서 잘리지 않도록 발화 사이의 무음에서 자름 (무음이 없으면 30초에서)
+            for start, end in split_at_silence(audio, SAMPLE_RATE, self.WINDOW_SECONDS, N_SAMPLES / SAMPLE_RATE):
+                if end - start >= SAMPLE_RATE // 10:  # 0.1초 미만의 끝 조각은 버림
+                    windows.append((i, start / SAMPLE_RATE, audio[start:end]))
+
+        results = [[] for _ in audios]
+        tokenizer = get_tokenizer(self._model.is_multilingual, num_languages=self._model.num_languages,
+                                  language=language, task="transcribe")
+        decode_options = whisper.DecodingOptions(language=language, fp16=False)
+        for b in range(0, len(windows), self.batch_windows):
+            part = windows[b:b + self.batch_windows]
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(whisper.pad_or_trim(chunk), self._model.dims.n_mels)
+                for _, _, chunk in part
+            ]).to(self._model.device)
+            with torch.no_grad():
+                decoded = whisper.decode(self._model, mel, decode_options)
+            for (i, offset, chunk), result in zip(part, decoded):
+                results[i].extend(self._window_segments(result, tokenizer, offset, chunk, language))
+        return results
+
+    def _window_segments(self, result, tokenizer, offset, chunk, language):
+        if result.no_speech_prob > self.NO_SPEECH_THRESHOLD and result.avg_logprob < self.LOGPROB_THRESHOLD:
+            return []  # 무음 창
+        if result.compression_ratio > self.COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < self.LOGPROB_THRESHOLD:
+            segments = self._transcribe(chunk, language=language)
+            return [{**seg, "start": seg["start"] + offset, "end": seg["end"] + offset} for seg in segments]
+
+        from whisper.audio import SAMPLE_RATE
+
+        duration = len(chunk) / SAMPLE_RATE
+        segments, start, text_tokens = [], 0.0, []
+
+        def close(end):
+            text = tokenizer.decode(text_tokens).strip()
+            if text:
+                segments.append({"start": offset + start, "end": offset + max(start, min(end, duration)), "text": text})
+
+        # <|0.00|> 텍스트 <|2.40|><|2.40|> 텍스트 <|5.00|> ... 형태의 토큰을 구간으로 나눔
+        for token in result.tokens:
+            if token < tokenizer.timestamp_begin:
+                text_tokens.append(token)
+                continue
+            seconds = (token - tokenizer.timestamp_begin) * self.TIME_PRECISION
+            if text_tokens:
+                close(seconds)
+                text_tokens = []
+            start = min(seconds, duration)
+        if text_tokens:
+            close(duration)  # 끝 타임스탬프 없이 끝난 마지막 구간
+        return segments
+
+
+class FasterWhisperBackend(ASRBackend):
+    """faster-whisper (CTranslate2, int8 양자화, CPU)."""
+
+    name = "faster-whisper"
+
+    def __init__(self, model_name="base", language="ko", compute_type="int8", cpu_threads=0, num_workers=1):
+        super().__init__(model_name, language)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        # CTranslate2 는 num_workers 만큼 여러 스레드의 동시 호출을 병렬로 처리
+        self.max_concurrency = max(1, num_workers)
+
+    @property
+    def description(self) -> str:
+        return f"{self.name} ({self.model_name}, {self.compute_type})"
+
+    def _load_model(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError(
+                "faster-whisper 백엔드를 사용하려면 'pip install faster-whisper' 로 설치해야 합니다."
+            ) from e
+        return WhisperModel(
+            self.model_name,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads or (os.cpu_count() or 4),
+            num_workers=self.max_concurrency,
+        )
+
+    def _transcribe(self, audio, **options):
+        options.setdefault("beam_size", 5)
+        segments, _info = self._model.transcribe(audio, **options)
+        # faster-whisper 는 제너레이터를 반환하므로 여기서 끝까지 디코딩
+        return [{"start": float(seg.start), "end": float(seg.end), "text": seg.text.strip()} for seg in segments]
+
+    def transcribe_batch(self, audios, **options) -> list:
+        # CTranslate2 는 num_workers 만큼의 동시 호출을 병렬로 처리하므로 배치를 스레드로 나누어 넘김
+        if self.max_concurrency == 1 or len(audios) < 2:
+            return super().transcribe_batch(audios, **options)
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(min(self.max_concurrency, len(audios))) as pool:
+            return list(pool.map(lambda audio: self.transcribe(audio, **options), audios))
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self._socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._socket_path)
+
+
+class RemoteBackend(ASRBackend):
+    """로컬 음성 인식 서버(asr_server.py)에 요청하는 클라이언트 백엔드.
+
+    모델은 서버 프로세스 하나만 가지므로, 노드의 Streamlit 프로세스 수와 관계없이 모델 메모리는 하나입니다.
+    `model_name` 자리에 서버 주소("http://127.0.0.1:8765" 또는 "unix:///tmp/asr.sock")를 받습니다.
+    """
+
+    name = "remote"
+
+    def __init__(self, model_name="http://127.0.0.1:8765", language="ko", timeout=600.0, connect_timeout=60.0,
+                 max_concurrency=4):
+        super().__init__(model_name, language)
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        # 서버가 여러 세션의 요청을 모아 배치로 처리하므로 동시에 여러 요청을 보냄
+        self.max_concurrency = max(1, max_concurrency)
+
+    @property
+    def description(self) -> str:
+        if self._model:
+            return f"{self.name} ({self._model.get('backend')} @ {self.model_name})"
+        return f"{self.name} ({self.model_name})"
+
+    def _load_model(self):
+        # 모델은 서버가 올리므로, 서버가 준비될 때까지 기다린 뒤 서버 정보를 보관
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                info = self._request("GET", "/health")
+                if info.get("ready"):
+                    return info
+                if info.get("error"):
+                    raise RuntimeError(f"음성 인식 서버의 모델 로드 실패: {info['error']}")
+            except OSError:
+                pass  # 서버가 아직 시작 중
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"음성 인식 서버({self.model_name})가 {self.connect_timeout:.0f}초 안에 준비되지 않았습니다.")
+            time.sleep(0.5)
+
+    def _transcribe(self, audio, **options):
+        import numpy as np
+
+        if isinstance(audio, str):
+            audio = self._read_audio_file(audio)
+        body = np.ascontiguousarray(audio, dtype="<f4").tobytes()
+        query = urllib.parse.urlencode({"options": json.dumps(options, ensure_ascii=False)})
+        return self._request("POST", f"/transcribe?{query}", body)["segments"]
+
+    def _connection(self, timeout):
+        if self.model_name.startswith("unix://"):
+            return _UnixHTTPConnection(self.model_name[len("unix://"):], timeout)
+        url = urllib.parse.urlsplit(self.model_name)
+        return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+
+    def _request(self, method, path, body=None):
+        conn = self._connection(self.timeout if body is not None else 5.0)
+        try:
+            headers = {"Content-Type": "application/octet-stream"} if body is not None else {}
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            payload = json.loads(response.read() or b"{}")
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise RuntimeError(f"음성 인식 서버 오류 ({response.status}): {payload.get('error', '')}")
+        return payload
+
+    @staticmethod
+    def _read_audio_file(path):
+        # 서버에는 16kHz mono float32 배열만 보내므로 파일은 여기서 읽어 변환
+        import numpy as np
+        import soundfile as sf
+
+        from audio_pipeline import WHISPER_SAMPLE_RATE
+        from resampler import resample
+
+        data, rate = sf.read(path, dtype="float32", always_2d=True)
+        audio = data.mean(axis=1)
+        if rate != WHISPER_SAMPLE_RATE:
+            audio = resample(audio, rate, WHISPER_SAMPLE_RATE)
+        return audio.astype(np.float32, copy=False)
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    RemoteBackend.name: RemoteBackend,
+}
+
+
+def create_backend(name=None, model_name=None, **kwargs) -> ASRBackend:
+    """설정에 맞는 백엔드를 만들어 반환합니다 (모델은 아직 로드하지 않음).
+
+    `name` 을 주지 않고 config.ASR_SERVER_URL 이 설정되어 있으면 음성 인식 서버 클라이언트를 만듭니다.
+    """
+    if name is None and config.ASR_SERVER_URL:
+        name = RemoteBackend.name
+    name = name or config.ASR_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 ASR 백엔드: {name} (사용 가능: {', '.join(BACKENDS)})")
+    if name == FasterWhisperBackend.name:
+        kwargs.setdefault("compute_type", config.ASR_COMPUTE_TYPE)
+        kwargs.setdefault("cpu_threads", config.ASR_CPU_THREADS)
+        kwargs.setdefault("num_workers", config.TRANSCRIBE_WORKERS)
+    if name == WhisperBackend.name:
+        kwargs.setdefault("batch_windows", config.ASR_BATCH_MAX_WINDOWS)
+    if name == RemoteBackend.name:
+        kwargs.setdefault("connect_timeout", config.ASR_SERVER_CONNECT_TIMEOUT)
+        kwargs.setdefault("max_concurrency", config.TRANSCRIBE_WORKERS)
+        return RemoteBackend(model_name or config.ASR_SERVER_URL, **kwargs)
+    return BACKENDS[name](model_name or config.ASR_MODEL, **kwargs)
+
+
+def segments_to_text(segments) -> str:
+    """구간 목록을 하나의 텍스트로 합칩니다."""
+    return " ".join(seg["text"] for seg in segments if seg["text"]).strip()
@@ -0,0 +1,86 @@
+"""여러 세션의 음성 인식 요청을 모아 한 번에 처리하는 동적 배치.
+
+여러 면접관이 거의 동시에 "음성 인식" 을 누르면 요청이 공유 모델을 하나씩 차례로 기다리게 됩니다.
+DynamicBatcher 는 첫 요청 이후 `max_wait` 초 동안(또는 `max_batch` 개가 모일 때까지) 들어온 요청을 모아
+`backend.transcribe_batch` 한 번으로 넘깁니다. Whisper 백엔드는 모인 답변들을 무음 경계에서 30초 이하의 창으로 잘라
+한 번의 배치 encoder/decoder 실행으로 처리합니다. 기다리는 요청이 하나뿐이면 `backend.transcribe` 로 그대로 인식합니다.
+
+모델은 배치 스레드 하나만 호출하므로, 동시 호출이 안전하지 않은 모델(openai-whisper)도 여러 세션이 함께 쓸 수 있습니다.
+"""
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DynamicBatcher:
+    """여러 세션의 인식 요청을 모아 `backend.transcribe_batch` 로 한 번에 처리합니다 (프로세스당 하나)."""
+
+    def __init__(self, backend, max_batch=8, max_wait=0.02):
+        self.backend = backend
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+        self.requests = 0
+        self.batches = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = threading.Thread(target=self._run, name="asr-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, audio, options=None) -> Future:
+        """요청 하나를 대기열에 넣고, 구간 목록을 돌려줄 Future 를 반환합니다."""
+        future = Future()
+        self._queue.put((audio, dict(options or {}), future))
+        return future
+
+    def transcribe(self, audio, **options) -> list:
+        """`backend.transcribe` 와 같은 사용법: 배치에 넣고 결과가 나올 때까지 기다립니다."""
+        return self.submit(audio, options).result()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # 옵션(언어 등)이 같은 요청끼리만 한 번에 처리
+            groups = {}
+            for item in batch:
+                groups.setdefault(json.dumps(item[1], sort_keys=True), []).append(item)
+            for items in groups.values():
+                self._process(items)
+
+    def _process(self, items):
+        items = [item for item in items if item[2].set_running_or_notify_cancel()]
+        if not items:
+            return
+        with self._lock:
+            self.requests += len(items)
+            self.batches += 1
+        try:
+            if len(items) == 1:
+                # 기다리는 요청이 하나뿐이면 배치로 자르지 않고 보통 인식 (타임스탬프 구간, 앞 창 문맥 유지)
+                results = [self.backend.transcribe(items[0][0], **items[0][1])]
+            else:
+                results = self.backend.transcribe_batch([audio for audio, _, _ in items], **items[0][1])
+        except Exception as e:
+            for _, _, future in items:
+                future.set_exception(e)
+            return
+        for (_, _, future), segments in zip(items, results):
+            future.set_result(segments)
@@ -0,0 +1,136 @@
+"""로컬 음성 인식 서버.
+
+노드 하나에 Streamlit 프로세스를 여러 개 띄우면 프로세스마다 Whisper 모델을 올리게 되어 메모리와 준비 시간이 늘어납니다.
+이 서버 프로세스 하나가 모델을 갖고, 앱(app.py, app(구글).py, app(오픈).py)은 ASR_SERVER_URL 을 설정하면
+`asr_backend.RemoteBackend` 로 인식을 요청하는 얇은 클라이언트가 됩니다.
+
+여러 세션에서 거의 동시에 들어온 요청은 `asr_batching.DynamicBatcher` 로 모아서(최대 ASR_BATCH_MAX_REQUESTS 개,
+첫 요청 후 최대 ASR_BATCH_MAX_WAIT_MS 밀리초) `backend.transcribe_batch` 한 번으로 처리합니다.
+
+HTTP API (localhost TCP 또는 Unix 소켓):
+    GET  /health                       {"ready": bool, "backend": 설명, "error": 문자열, 처리 통계...}
+    POST /transcribe?options=<JSON>    본문: 16kHz mono float32(little-endian) PCM → {"segments": [...]}
+
+사용 예:
+    python asr_server.py --port 8765
+    ASR_SERVER_URL=http://127.0.0.1:8765 streamlit run app.py --server.port 8501
+    ASR_SERVER_URL=http://127.0.0.1:8765 streamlit run app.py --server.port 8502
+
+    python asr_server.py --unix-socket /tmp/asr.sock
+    ASR_SERVER_URL=unix:///tmp/asr.sock streamlit run app.py
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import config
+from asr_backend import BACKENDS, RemoteBackend, create_backend
+from asr_batching import DynamicBatcher
+from model_loader import BackgroundModelLoader
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "InterviewASR/1.0"
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path != "/health":
+            return self._send(404, {"error": "not found"})
+        loader, batcher = self.server.loader, self.server.batcher
+        self._send(200, {
+            "ready": loader.ready,
+            "backend": loader.backend.description,
+            "error": str(loader.error) if loader.error else "",
+            "load_seconds": round(loader.elapsed, 2),
+            "requests": batcher.requests,
+            "batches": batcher.batches,
+            "mean_batch_size": round(batcher.mean_batch_size, 2),
+        })
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path != "/transcribe":
+            return self._send(404, {"error": "not found"})
+        try:
+            options = json.loads(urllib.parse.parse_qs(url.query).get("options", ["{}"])[0])
+            length = int(self.headers.get("Content-Length", 0))
+            audio = np.frombuffer(self.rfile.read(length), dtype="<f4").astype(np.float32)
+        except ValueError as e:
+            return self._send(400, {"error": f"잘못된 요청: {e}"})
+        try:
+            segments = self.server.batcher.submit(audio, options).result()
+        except Exception as e:
+            return self._send(500, {"error": str(e)})
+        self._send(200, {"segments": segments})
+
+    def address_string(self):
+        # Unix 소켓 연결에는 클라이언트 주소가 없음
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(loader, batcher, host="127.0.0.1", port=8765, unix_socket=None, verbose=False):
+    """HTTP 서버를 만듭니다 (serve_forever 로 실행). `unix_socket` 을 주면 TCP 대신 Unix 소켓에서 받습니다."""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.remove(unix_socket)  # 이전 실행이 남긴 소켓 파일
+        server = _UnixHTTPServer(unix_socket, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    server.loader = loader
+    server.batcher = batcher
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="TCP 대신 이 경로의 Unix 소켓에서 받음")
+    parser.add_argument("--backend", default=config.ASR_BACKEND, choices=[n for n in BACKENDS if n != RemoteBackend.name])
+    parser.add_argument("--model", default=config.ASR_MODEL)
+    parser.add_argument("--max-batch", type=int, default=config.ASR_BATCH_MAX_REQUESTS)
+    parser.add_argument("--max-wait-ms", type=float, default=config.ASR_BATCH_MAX_WAIT_MS)
+    parser.add_argument("--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args()
+
+    # 모델 로드를 기다리지 않고 바로 받기 시작하며, 준비 전 요청은 로드가 끝날 때까지 기다림
+    loader = BackgroundModelLoader(create_backend(args.backend, args.model)).start()
+    batcher = DynamicBatcher(loader.backend, args.max_batch, args.max_wait_ms / 1000)
+    server = make_server(loader, batcher, args.host, args.port, args.unix_socket, args.verbose)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"음성 인식 서버 시작: {where} ({loader.backend.description}, 배치 최대 {batcher.max_batch}개)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.remove(args.unix_socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
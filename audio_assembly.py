@@ -0,0 +1,101 @@
+"""`av.AudioFrame` 묶음을 mono int16 샘플 배열 하나로 조립합니다.
+
+프레임마다 `to_ndarray()` 로 배열을 만들고 downmix 한 뒤 리스트에 모아 concatenate 하는 대신,
+각 프레임의 raw plane 바이트를 한 버퍼로 한 번에 이어 붙이고
+downmix 와 int16 변환은 버퍼 전체에 대해 한 번에 벡터 연산으로 처리합니다.
+interleaved(packed)/planar, mono/stereo 등 레이아웃을 모두 지원합니다.
+"""
+import numpy as np
+
+# av 샘플 포맷 이름(planar 접미사 'p' 제외) -> NumPy dtype
+_SAMPLE_DTYPES = {
+    "u8": np.dtype(np.uint8),
+    "s16": np.dtype(np.int16),
+    "s32": np.dtype(np.int32),
+    "s64": np.dtype(np.int64),
+    "flt": np.dtype(np.float32),
+    "dbl": np.dtype(np.float64),
+}
+
+
+def _sample_dtype(fmt) -> np.dtype:
+    name = fmt.name[:-1] if fmt.is_planar else fmt.name
+    return _SAMPLE_DTYPES[name]
+
+
+def _to_int16(samples: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    if dtype.kind == "f":
+        return np.clip(samples * 32767.0, -32768, 32767).astype(np.int16)
+    if dtype == np.uint8:
+        return ((samples.astype(np.int16) - 128) * 256).astype(np.int16)
+    if dtype.itemsize > 2:
+        return (samples / float(1 << (8 * dtype.itemsize - 16))).astype(np.int16)
+    return samples.astype(np.int16, copy=False)
+
+
+def _same_layout_runs(frames):
+    # 포맷/레이아웃이 같은 연속 프레임끼리 묶음 (보통은 스트림 전체가 한 묶음)
+    start = 0
+    for i in range(1, len(frames) + 1):
+        if i == len(frames) or (
+            frames[i].format.name != frames[start].format.name
+            or frames[i].layout.name != frames[start].layout.name
+        ):
+            yield frames[start:i]
+            start = i
+
+
+def _join_plane(frames, plane_idx, nbytes_per_frame):
+    # 각 프레임 plane 의 raw 바이트(패딩 제외)를 복사 없이 이어 붙여 하나의 버퍼로 만듦
+    return bytearray().join([memoryview(f.planes[plane_idx])[:n] for f, n in zip(frames, nbytes_per_frame)])
+
+
+def _downmix(channels, dtype):
+    # 채널 배열들을 더해 평균 (정수 포맷은 넘치지 않도록 넓은 정수형으로 누적)
+    if len(channels) == 1:
+        return channels[0]
+    if dtype.kind == "f":
+        acc = channels[0].astype(np.float32)
+    else:
+        acc = channels[0].astype(np.int32 if dtype.itemsize <= 2 else np.int64)
+    for ch in channels[1:]:
+        acc += ch
+    if dtype.kind == "f":
+        acc /= len(channels)
+    else:
+        acc //= len(channels)
+    return acc
+
+
+def _assemble_run(frames) -> np.ndarray:
+    first = frames[0]
+    dtype = _sample_dtype(first.format)
+    n_channels = len(first.layout.channels)
+
+    if first.format.is_planar:
+        nbytes = [f.samples * dtype.itemsize for f in frames]
+        channels = [
+            np.frombuffer(_join_plane(frames, ch, nbytes), dtype=dtype)
+            for ch in range(n_channels)
+        ]
+    else:
+        nbytes = [f.samples * n_channels * dtype.itemsize for f in frames]
+        raw = np.frombuffer(_join_plane(frames, 0, nbytes), dtype=dtype)
+        # interleaved: 채널 c 의 샘플은 raw[c::채널 수]
+        channels = [raw[ch::n_channels] for ch in range(n_channels)]
+
+    return _to_int16(_downmix(channels, dtype), dtype)
+
+
+def frames_to_mono_int16(frames) -> np.ndarray:
+    """프레임 목록을 하나의 mono int16 배열로 조립합니다."""
+    frames = list(frames)
+    if not frames:
+        return np.zeros(0, dtype=np.int16)
+    runs = [_assemble_run(run) for run in _same_layout_runs(frames)]
+    return runs[0] if len(runs) == 1 else np.concatenate(runs)
+
+
+def frame_to_mono_int16(frame) -> np.ndarray:
+    """`av.AudioFrame` 하나를 mono int16 샘플 배열로 변환합니다."""
+    return _assemble_run([frame])
@@ -0,0 +1,156 @@
+"""녹음 오디오를 mono int16 샘플로 보관하는 링 버퍼.
+
+`av.AudioFrame` 객체를 세션 내내 붙잡아 두는 대신, 프레임이 들어오는 즉시
+mono int16 샘플로 바꿔 미리 할당한 NumPy 배열에 기록합니다.
+답변 구간은 프레임 인덱스가 아니라 스트림 시작부터 센 절대 샘플 오프셋으로 다룹니다.
+"""
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+
+class PcmRingBuffer:
+    """크기가 늘어나는 mono int16 링 버퍼.
+
+    메모리에 유지하는 샘플 수가 `max_memory_samples` 를 넘으면 가장 오래된 오디오를
+    디스크의 spill 파일로 옮깁니다. `mark_segmented` 로 확정된 구간(답변 녹음이 끝난 오디오)을
+    먼저 옮기고, 그래도 자리가 부족할 때(보존 상한보다 긴 답변)만 확정되지 않은 오디오를 옮깁니다.
+    옮겨진 구간도 `read` 로 그대로 읽을 수 있습니다.
+    """
+
+    def __init__(self, initial_capacity=16000 * 30, max_memory_samples=None, spill_dir=None):
+        if max_memory_samples is not None:
+            initial_capacity = min(initial_capacity, max_memory_samples)
+        self._buf = np.zeros(max(int(initial_capacity), 1), dtype=np.int16)
+        self._max_memory_samples = max_memory_samples
+        self._spill_dir = spill_dir
+        self._spill_file = None
+        self._start = 0  # 가장 오래된 메모리 샘플의 물리 인덱스
+        self._head = 0  # 메모리에 남아 있는 가장 오래된 샘플의 절대 오프셋 (그 이전은 디스크)
+        self._total = 0  # 지금까지 기록된 전체 샘플 수 (= 다음 샘플의 절대 오프셋)
+        self._segmented_until = 0  # 이 오프셋 이전은 확정된 구간
+        self._lock = threading.Lock()
+
+    @property
+    def total_samples(self) -> int:
+        return self._total
+
+    @property
+    def memory_samples(self) -> int:
+        return self._total - self._head
+
+    @property
+    def spilled_samples(self) -> int:
+        return self._head
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def append(self, samples: np.ndarray) -> int:
+        """샘플을 기록하고, 기록을 마친 뒤의 절대 오프셋을 반환합니다."""
+        samples = np.asarray(samples, dtype=np.int16).reshape(-1)
+        n = len(samples)
+        if n == 0:
+            return self._total
+        with self._lock:
+            self._ensure_room(n)
+            cap = len(self._buf)
+            pos = (self._start + self.memory_samples) % cap
+            first = min(n, cap - pos)
+            self._buf[pos:pos + first] = samples[:first]
+            if first < n:
+                self._buf[:n - first] = samples[first:]
+            self._total += n
+            return self._total
+
+    def mark_segmented(self, offset: int) -> None:
+        """`offset` 이전의 오디오가 답변 구간으로 확정되었음을 표시합니다."""
+        with self._lock:
+            self._segmented_until = max(self._segmented_until, min(int(offset), self._total))
+
+    def read(self, start: int, end: int) -> np.ndarray:
+        """절대 오프셋 [start, end) 구간의 샘플을 반환합니다."""
+        with self._lock:
+            start = max(0, int(start))
+            end = min(int(end), self._total)
+            if end <= start:
+                return np.zeros(0, dtype=np.int16)
+            out = np.empty(end - start, dtype=np.int16)
+            if start < self._head:
+                disk_end = min(end, self._head)
+                out[:disk_end - start] = self._read_spilled(start, disk_end)
+                mem_start = disk_end
+            else:
+                mem_start = start
+            if mem_start < end:
+                out[mem_start - start:] = self._read_memory(mem_start, end)
+            return out
+
+    def close(self) -> None:
+        """spill 파일을 닫고 지웁니다."""
+        with self._lock:
+            if self._spill_file is not None:
+                path = self._spill_file.name
+                self._spill_file.close()
+                self._spill_file = None
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # --- 내부 구현 ---
+
+    def _read_memory(self, start, end):
+        cap = len(self._buf)
+        pos = (self._start + (start - self._head)) % cap
+        n = end - start
+        first = min(n, cap - pos)
+        if first == n:
+            return self._buf[pos:pos + n].copy()
+        return np.concatenate([self._buf[pos:], self._buf[:n - first]])
+
+    def _read_spilled(self, start, end):
+        self._spill_file.flush()
+        self._spill_file.seek(start * 2)
+        return np.frombuffer(self._spill_file.read((end - start) * 2), dtype=np.int16)
+
+    def _ensure_room(self, n):
+        needed = self.memory_samples + n
+        cap = len(self._buf)
+        if needed <= cap:
+            return
+        limit = self._max_memory_samples
+        if limit is None or cap < limit:
+            new_cap = max(cap * 2, needed)
+            if limit is not None:
+                new_cap = min(new_cap, max(limit, n))
+            self._resize(new_cap)
+            if needed <= len(self._buf):
+                return
+        overflow = needed - len(self._buf)
+        # 확정된 오디오를 먼저 옮기되, 부족하면 확정되지 않은 오래된 오디오도 옮깁니다.
+        segmented = max(0, self._segmented_until - self._head)
+        self._spill(max(overflow, min(segmented, self.memory_samples)))
+
+    def _resize(self, new_cap):
+        count = self.memory_samples
+        new_buf = np.zeros(new_cap, dtype=np.int16)
+        if count:
+            new_buf[:count] = self._read_memory(self._head, self._total)
+        self._buf = new_buf
+        self._start = 0
+
+    def _spill(self, count):
+        if count <= 0:
+            return
+        if self._spill_file is None:
+            if self._spill_dir:
+                os.makedirs(self._spill_dir, exist_ok=True)
+            self._spill_file = tempfile.NamedTemporaryFile(
+                prefix="pcm_spill_", suffix=".raw", dir=self._spill_dir, delete=False
+            )
+        self._spill_file.seek(0, os.SEEK_END)
+        self._spill_file.write(self._read_memory(self._head, self._head + count).tobytes())
+        self._start = (self._start + count) % len(self._buf)
+        self._head += count
@@ -0,0 +1,94 @@
+"""답변별로 준비된 오디오(모델 입력 배열 + 다운로드용 WAV 바이트) 캐시.
+
+녹음이 끝날 때 한 번만 계산해 두고, 이후 rerun 에서는 다운로드 버튼과 음성 인식이 그대로 재사용합니다.
+키는 (세션 ID, 질문 인덱스, 구간 시작, 구간 끝) 이며, 전체 크기가 예산을 넘으면 가장 오래 쓰이지 않은 항목부터 버립니다.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from audio_pipeline import WHISPER_SAMPLE_RATE
+
+
+def encode_wav(audio: np.ndarray, sample_rate: int = WHISPER_SAMPLE_RATE) -> bytes:
+    """float32 오디오를 16비트 PCM WAV 바이트로 인코딩합니다 (파일을 만들지 않음)."""
+    import soundfile as sf
+
+    buf = io.BytesIO()
+    sf.write(buf, audio, sample_rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+class PreparedAudio:
+    """준비된 답변 오디오 하나."""
+
+    def __init__(self, audio: np.ndarray, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.wav_bytes = encode_wav(audio, sample_rate)
+
+    @property
+    def nbytes(self) -> int:
+        return self.audio.nbytes + len(self.wav_bytes)
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+
+class PreparedAudioCache:
+    """여러 세션이 함께 쓰는 크기 제한 LRU 캐시."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(session_id, question_idx, start, end):
+        return (session_id, question_idx, int(start), int(end))
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+            return item
+
+    def put(self, key, item: PreparedAudio) -> PreparedAudio:
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= old.nbytes
+            self._items[key] = item
+            self._size += item.nbytes
+            self._evict()
+            return item
+
+    def get_or_create(self, key, factory):
+        """캐시에 없으면 `factory()` 로 PreparedAudio 를 만들어 넣습니다. factory 가 None 을 반환하면 None."""
+        item = self.get(key)
+        if item is None:
+            item = factory()
+            if item is not None:
+                self.put(key, item)
+        return item
+
+    def invalidate(self, session_id, question_idx=None) -> None:
+        """세션 전체 또는 특정 질문의 항목을 지웁니다 (재녹음, 질문 삭제 시)."""
+        with self._lock:
+            for key in [k for k in self._items if k[0] == session_id and (question_idx is None or k[1] == question_idx)]:
+                self._size -= self._items.pop(key).nbytes
+
+    def _evict(self):
+        # 방금 넣은 항목 하나는 예산보다 커도 남겨 둠
+        while self._size > self.max_bytes and len(self._items) > 1:
+            _key, item = self._items.popitem(last=False)
+            self._size -= item.nbytes
@@ -0,0 +1,42 @@
+"""녹음 샘플을 음성 인식 모델 입력으로 준비하는 파이프라인.
+
+mono int16 샘플을 16kHz float32 NumPy 배열로 바로 변환해 모델에 넘깁니다.
+임시 WAV 파일 저장, ffmpeg 디코딩, int16 재양자화 없이 메모리 안에서만 처리합니다.
+리샘플링은 `resampler` 의 polyphase 필터를 사용합니다 (librosa 불필요).
+"""
+import datetime
+import os
+
+import numpy as np
+
+import config
+from resampler import resample
+
+WHISPER_SAMPLE_RATE = 16000
+
+
+def prepare_whisper_input(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """mono int16 샘플을 Whisper 입력 형식(16kHz float32, 최대 진폭 1)으로 변환합니다."""
+    audio = samples.astype(np.float32) / 32768.0
+    if sample_rate != WHISPER_SAMPLE_RATE and sample_rate > 0:
+        audio = resample(audio, sample_rate, WHISPER_SAMPLE_RATE)
+    peak = np.max(np.abs(audio)) if audio.size else 0
+    if peak > 0:
+        audio = audio / peak
+    return audio.astype(np.float32, copy=False)
+
+
+def dump_debug_wav(audio: np.ndarray, name: str, sample_rate: int = WHISPER_SAMPLE_RATE):
+    """디버깅용: 모델에 넘긴 오디오를 WAV 파일로 남깁니다.
+
+    config.AUDIO_DEBUG_DUMP_DIR 이 설정된 경우에만 동작하며, 저장한 경로(또는 None)를 반환합니다.
+    """
+    if not config.AUDIO_DEBUG_DUMP_DIR:
+        return None
+    import soundfile as sf
+
+    os.makedirs(config.AUDIO_DEBUG_DUMP_DIR, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    path = os.path.join(config.AUDIO_DEBUG_DUMP_DIR, f"{name}_{stamp}.wav")
+    sf.write(path, audio, sample_rate, format="WAV", subtype="FLOAT")
+    return path
@@ -0,0 +1,380 @@
+"""여러 지원자 이력서의 면접 질문 일괄 생성.
+
+한 벌의 회사 문서(핵심 가치, 인재상, JD)에 대해 폴더나 zip 안의 이력서 PDF 전체의 질문을 생성합니다.
+
+- 이력서 텍스트는 PdfTextExtractor 로 한꺼번에(프로세스 풀) 추출하고, 회사 문서는 회사 프로필 요약으로 한 번만 보냅니다.
+- LLM 호출은 정해진 수만큼만 동시에 실행하고, 요청 한도 초과(429)가 나면 모든 작업자가 함께 잠시 쉬었다가 재시도합니다.
+- 끝난 이력서는 체크포인트 JSONL 에 한 줄씩 기록하므로, 중간에 멈춰도 다시 실행하면 남은 것만 처리합니다.
+- 결과는 지원자별 질문을 모은 파일 하나(.xlsx 또는 .csv)로 저장합니다.
+
+사용 예:
+    python batch_questions.py --resumes resumes.zip --core core.pdf --persona persona.pdf --jd jd.pdf \\
+        --questions 5 --out results.xlsx --concurrency 4
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import config
+from llm_cache import make_key
+from prompt_budget import allocate
+from question_generation import GENERATION_SETTINGS, build_question_prompt, documents_section
+from question_stream import parse_questions
+
+
+def iter_resume_files(source) -> list:
+    """폴더 경로, zip 경로, zip bytes/파일 객체에서 (이름, PDF bytes) 목록을 이름 순으로 반환합니다."""
+    if isinstance(source, str) and os.path.isdir(source):
+        files = []
+        for root, _dirs, names in os.walk(source):
+            for name in names:
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as f:
+                        files.append((os.path.relpath(path, source), f.read()))
+        return sorted(files)
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as zf:
+        return sorted(
+            (info.filename, zf.read(info))
+            for info in zf.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".pdf") and not info.filename.startswith("__MACOSX/")
+        )
+
+
+def is_rate_limit_error(error) -> bool:
+    """요청 한도 초과(HTTP 429) 오류인지 판단합니다 (google-api-core, openai 예외 모두)."""
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError"):
+        return True
+    return getattr(error, "code", None) == 429 or getattr(error, "status_code", None) == 429 or "429" in str(error)
+
+
+# 잠시 뒤 다시 시도하면 성공할 수 있는 일시적 오류의 예외 이름 (google-api-core, openai)
+_TRANSIENT_ERROR_NAMES = (
+    "ServiceUnavailable", "InternalServerError", "DeadlineExceeded", "GatewayTimeout", "Aborted",
+    "APITimeoutError", "APIConnectionError",
+)
+
+
+def is_transient_error(error) -> bool:
+    """다시 시도할 만한 오류(요청 한도 초과, 시간 초과, 연결 오류, 서버 5xx)인지 판단합니다.
+
+    인증 실패, 잘못된 인자 등은 다시 시도해도 같은 결과이므로 False 입니다.
+    """
+    if is_rate_limit_error(error):
+        return True
+    if type(error).__name__ in _TRANSIENT_ERROR_NAMES or isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    return isinstance(status, int) and 500 <= status < 600
+
+
+class _Cooldown:
+    """요청 한도 초과 시 모든 작업자가 함께 기다리도록 하는 공유 대기 시점."""
+
+    def __init__(self):
+        self._until = 0.0
+        self._lock = threading.Lock()
+
+    def trip(self, seconds):
+        with self._lock:
+            self._until = max(self._until, time.monotonic() + seconds)
+
+    def wait(self):
+        while True:
+            with self._lock:
+                remaining = self._until - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 1.0))
+
+
+class BatchQuestionGenerator:
+    """이력서 목록의 질문을 제한된 동시성으로 생성하는 실행기."""
+
+    def __init__(self, generate_fn, model_id, num_questions, company_digest, counter,
+                 budget_tokens=30000, min_tokens=300, cache=None, concurrency=4,
+                 max_retries=5, base_delay=2.0, checkpoint_path=None):
+        self.generate_fn = generate_fn  # prompt -> 응답 텍스트
+        self.model_id = model_id
+        self.num_questions = num_questions
+        self.company_digest = company_digest
+        self.counter = counter
+        self.budget_tokens = budget_tokens
+        self.min_tokens = min_tokens
+        self.cache = cache
+        self.concurrency = max(1, int(concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.checkpoint_path = checkpoint_path
+        self._cooldown = _Cooldown()
+        self._checkpoint_lock = threading.Lock()
+
+    def run(self, resumes, progress_fn=None) -> list:
+        """(이름, 이력서 텍스트) 목록을 처리해 같은 순서의 결과 dict 목록을 반환합니다.
+
+        일시적 오류는 지수 백오프로 다시 시도하고, 그 밖의 오류(인증 실패 등)는 바로 예외로 올립니다.
+        `progress_fn(완료 수, 전체 수, 결과)` 는 호출한 스레드에서 불립니다 (Streamlit 진행 표시용).
+        """
+        done = self._load_checkpoint()
+        results = [None] * len(resumes)
+        pending = []
+        for i, (name, text) in enumerate(resumes):
+            prompt, key = self._prepare(text)
+            if key in done:
+                results[i] = {**done[key], "name": name, "from_checkpoint": True}
+            else:
+                pending.append((i, name, prompt, key))
+
+        finished = len(resumes) - len(pending)
+        if progress_fn:
+            progress_fn(finished, len(resumes), None)
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="batch-questions") as pool:
+            futures = {pool.submit(self._generate_one, name, prompt, key): i for i, name, prompt, key in pending}
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[futures[future]] = result
+                    self._write_checkpoint(result)
+                    finished += 1
+                    if progress_fn:
+                        progress_fn(finished, len(resumes), result)
+            except BaseException:
+                # 다시 시도해도 안 되는 오류: 남은 이력서는 시작하지 않음 (끝난 것은 체크포인트에 남아 있음)
+                for future in futures:
+                    future.cancel()
+                raise
+        return results
+
+    # --- 내부 구현 ---
+
+    def _prepare(self, resume_text):
+        # 이력서를 회사 프로필과 함께 토큰 예산에 맞추고, 화면에서 생성할 때와 같은 방식으로 캐시 키를 만듦
+        fitted = allocate(
+            {"profile": self.company_digest, "resume": resume_text}, self.budget_tokens,
+            priority=("resume", "profile"), min_tokens=self.min_tokens, counter=self.counter,
+        )
+        section, prompt_documents = documents_section(fitted.texts["resume"], fitted.texts["profile"])
+        key = make_key(prompt_documents, self.model_id, self.num_questions, GENERATION_SETTINGS)
+        return build_question_prompt(self.num_questions, section), key
+
+    def _generate_one(self, name, prompt, key):
+        start = time.time()
+        result = {"name": name, "key": key, "status": "failed", "questions": [], "raw": "", "error": "",
+                  "attempts": 0, "cached": False}
+        output = self.cache.get(key) if self.cache is not None else None
+        if output is not None:
+            result["cached"] = True
+        for attempt in range(self.max_retries + 1):
+            if output is None:
+                self._cooldown.wait()
+                result["attempts"] = attempt + 1
+                try:
+                    output = self.generate_fn(prompt) or ""
+                except Exception as e:
+                    if not is_transient_error(e):
+                        raise  # 인증 실패, 잘못된 요청 등은 다시 시도하지 않음
+                    result["error"] = f"{type(e).__name__}: {e}"
+                    if attempt == self.max_retries:
+                        break  # 마지막 시도 뒤에는 기다리지 않음
+                    delay = self.base_delay * (2 ** attempt) * (1 + random.random() * 0.25)
+                    if is_rate_limit_error(e):
+                        self._cooldown.trip(delay)  # 다른 작업자도 함께 쉬도록
+                    else:
+                        time.sleep(delay)
+                    continue
+            questions = parse_questions(output)
+            if questions:
+                result.update(status="ok", questions=questions, raw=output, error="")
+                if self.cache is not None and not result["cached"]:
+                    self.cache.put(key, output, self.model_id)
+                break
+            result["error"] = "응답에서 질문을 찾지 못했습니다."
+            output = None
+            result["cached"] = False
+        result["seconds"] = round(time.time() - start, 2)
+        return result
+
+    def _load_checkpoint(self):
+        done = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return done
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # 중단될 때 쓰다 만 마지막 줄
+                if record.get("status") == "ok":
+                    done[record["key"]] = record
+        return done
+
+    def _write_checkpoint(self, result):
+        if not self.checkpoint_path:
+            return
+        with self._checkpoint_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+            with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def results_dataframe(results):
+    """결과 목록을 질문 한 줄씩의 표로 만듭니다 (실패한 지원자는 오류 한 줄)."""
+    import pandas as pd
+
+    rows = []
+    for result in results:
+        if result["status"] != "ok":
+            rows.append({"지원자 파일": result["name"], "번호": None, "질문": "", "질문 의도": "",
+                         "오류": result.get("error", "")})
+            continue
+        for n, q in enumerate(result["questions"], start=1):
+            rows.append({"지원자 파일": result["name"], "번호": n, "질문": q["question"], "질문 의도": q["intent"],
+                         "오류": ""})
+    return pd.DataFrame(rows, columns=["지원자 파일", "번호", "질문", "질문 의도", "오류"])
+
+
+def write_results(results, path_or_buffer, fmt="xlsx"):
+    """결과를 .xlsx 또는 .csv 파일(또는 버퍼) 하나로 저장합니다."""
+    df = results_dataframe(results)
+    if fmt == "csv":
+        df.to_csv(path_or_buffer, index=False, encoding="utf-8-sig")
+    else:
+        import pandas as pd
+
+        with pd.ExcelWriter(path_or_buffer, engine="xlsxwriter") as writer:
+            df.to_excel(writer, index=False, sheet_name="질문")
+
+
+def source_checkpoint_path(resume_files, company_digest, num_questions) -> str:
+    """입력 묶음별 기본 체크포인트 경로 (같은 이력서 묶음을 다시 돌리면 이어서 처리)."""
+    h = hashlib.sha256()
+    for name, data in resume_files:
+        h.update(name.encode("utf-8"))
+        h.update(hashlib.sha256(data).digest())
+    h.update(company_digest.encode("utf-8"))
+    h.update(str(num_questions).encode())
+    return os.path.join(config.DATA_DIR, "batch", f"{h.hexdigest()[:16]}.jsonl")
+
+
+# --- 명령줄 실행 ---
+
+def _gemini_generate_fn(model_name, settings):
+    import google.generativeai as genai
+
+    from question_generation import response_text
+    from question_stream import FakeStreamingModel
+
+    if config.GEMINI_FAKE_RESPONSE_FILE:
+        with open(config.GEMINI_FAKE_RESPONSE_FILE, encoding="utf-8") as f:
+            model = FakeStreamingModel(f.read(), delay=0)
+    else:
+        api_key = os.environ.get("GOOGLE_API_KEY") or _secrets_api_key()
+        if not api_key:
+            raise SystemExit("GOOGLE_API_KEY 환경 변수 또는 .streamlit/secrets.toml 의 google.api_key 가 필요합니다.")
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name)
+
+    def generate(prompt):
+        return response_text(model.generate_content(prompt, generation_config=genai.types.GenerationConfig(**settings)))
+    return generate
+
+
+def _secrets_api_key():
+    import tomllib
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f).get("google", {}).get("api_key")
+    except OSError:
+        return None
+
+
+def main():
+    from company_profile import CompanyProfileStore
+    from llm_cache import LLMResponseCache
+    from pdf_text import PdfTextExtractor
+    from prompt_budget import TokenCounter
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", required=True, help="이력서 PDF 폴더 또는 zip 파일")
+    parser.add_argument("--core", nargs="+", required=True, help="핵심 가치 PDF")
+    parser.add_argument("--persona", nargs="+", required=True, help="인재상 PDF")
+    parser.add_argument("--jd", nargs="+", required=True, help="직무 기술서 PDF")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--out", default="batch_questions.xlsx", help="결과 파일 (.xlsx 또는 .csv)")
+    parser.add_argument("--checkpoint", help="체크포인트 JSONL (기본: 결과 파일 이름 + .checkpoint.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=config.BATCH_CONCURRENCY)
+    parser.add_argument("--retries", type=int, default=config.BATCH_MAX_RETRIES)
+    parser.add_argument("--model", default="gemini-1.5-pro")
+    args = parser.parse_args()
+
+    model_id = f"fake:{config.GEMINI_FAKE_RESPONSE_FILE}" if config.GEMINI_FAKE_RESPONSE_FILE else args.model
+    extractor = PdfTextExtractor(config.PDF_WORKERS, pages_per_task=config.PDF_PAGES_PER_TASK)
+    counter = TokenCounter()
+    try:
+        def read_all(paths):
+            files = []
+            for path in paths:
+                with open(path, "rb") as f:
+                    files.append((os.path.basename(path), f.read()))
+            return files
+
+        resume_files = iter_resume_files(args.resumes)
+        company_files = [read_all(args.core), read_all(args.persona), read_all(args.jd)]
+        flat = [f for group in company_files for f in group] + resume_files
+        texts = extractor.extract(flat)
+        for r in texts:
+            if r.error is not None:
+                print(f"PDF 읽기 오류: {r.name} - {r.error}")
+        sizes = [len(g) for g in company_files]
+        company = []
+        offset = 0
+        for size in sizes:
+            company.append("\n\n".join(r.text for r in texts[offset:offset + size] if r.error is None))
+            offset += size
+        resumes = [(r.name, r.text) for r in texts[offset:] if r.error is None and r.text.strip()]
+    finally:
+        extractor.shutdown()
+
+    fitted = allocate(dict(zip(("core", "persona", "jd"), company)), config.PROMPT_BUDGET_TOKENS_GEMINI,
+                      min_tokens=config.PROMPT_MIN_DOC_TOKENS, counter=counter)
+    digest_fn = _gemini_generate_fn(args.model, dict(temperature=0.2, max_output_tokens=1500))
+    profile, created = CompanyProfileStore(config.COMPANY_PROFILE_DIR).get_or_create(
+        fitted.texts["core"], fitted.texts["persona"], fitted.texts["jd"], model_id, digest_fn
+    )
+    print(f"회사 프로필 {'새로 생성' if created else '재사용'}, 이력서 {len(resumes)}개")
+
+    generator = BatchQuestionGenerator(
+        _gemini_generate_fn(args.model, GENERATION_SETTINGS), model_id, args.questions, profile["digest"], counter,
+        budget_tokens=config.PROMPT_BUDGET_TOKENS_GEMINI, min_tokens=config.PROMPT_MIN_DOC_TOKENS,
+        cache=LLMResponseCache(config.LLM_CACHE_PATH, config.LLM_CACHE_TTL_HOURS * 3600,
+                               int(config.LLM_CACHE_MAX_MB * 1024 * 1024)),
+        concurrency=args.concurrency, max_retries=args.retries,
+        checkpoint_path=args.checkpoint or args.out + ".checkpoint.jsonl",
+    )
+    start = time.time()
+
+    def report(done, total, result):
+        if result is not None:
+            state = "OK" if result["status"] == "ok" else f"실패 ({result['error']})"
+            print(f"[{done}/{total}] {result['name']}: {state}")
+
+    results = generator.run(resumes, progress_fn=report)
+    elapsed = time.time() - start
+    write_results(results, args.out, fmt="csv" if args.out.lower().endswith(".csv") else "xlsx")
+    ok = sum(r["status"] == "ok" for r in results)
+    print(f"완료: {ok}/{len(results)}개 성공, {elapsed:.1f}초 ({len(results) / max(elapsed, 1e-9) * 60:.1f}개/분) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
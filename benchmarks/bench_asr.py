@@ -0,0 +1,101 @@
+"""ASR 백엔드 벤치마크: 실시간 계수(RTF)와 최대 메모리(peak RSS) 비교.
+
+각 백엔드를 별도 프로세스에서 로드해 같은 오디오를 인식하고,
+로드 시간, 인식 시간, RTF(인식 시간 / 오디오 길이), peak RSS를 출력합니다.
+
+사용 예:
+    python benchmarks/bench_asr.py answer.wav
+    python benchmarks/bench_asr.py answer.wav --backends whisper faster-whisper --model small
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def _peak_rss_mb():
+    # Linux 에서는 KB, macOS 에서는 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def load_audio(path):
+    """WAV 파일을 16kHz mono float32 로 읽습니다."""
+    import numpy as np
+    import soundfile as sf
+
+    from audio_pipeline import prepare_whisper_input
+
+    data, rate = sf.read(path, dtype="int16", always_2d=True)
+    mono = data.mean(axis=1).astype(np.int16)
+    return prepare_whisper_input(mono, rate)
+
+
+def run_single(backend_name, model_name, audio_path, repeat):
+    """한 백엔드를 현재 프로세스에서 측정하고 결과를 JSON 으로 출력합니다."""
+    from asr_backend import create_backend, segments_to_text
+
+    audio = load_audio(audio_path)
+    duration = len(audio) / 16000
+    backend = create_backend(backend_name, model_name)
+
+    t0 = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - t0
+
+    timings = []
+    text = ""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        text = segments_to_text(backend.transcribe(audio))
+        timings.append(time.perf_counter() - t0)
+
+    best = min(timings)
+    print(json.dumps({
+        "backend": backend.description,
+        "audio_seconds": round(duration, 2),
+        "load_seconds": round(load_seconds, 2),
+        "transcribe_seconds": round(best, 2),
+        "rtf": round(best / duration, 3) if duration else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "text_preview": text[:60],
+    }, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="측정에 사용할 WAV 파일")
+    parser.add_argument("--backends", nargs="+", default=["whisper", "faster-whisper"])
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.backends[0], args.model, args.audio, args.repeat)
+        return
+
+    print(f"{'backend':<36} {'audio(s)':>8} {'load(s)':>8} {'asr(s)':>8} {'RTF':>6} {'peak RSS(MB)':>13}")
+    for name in args.backends:
+        # 백엔드마다 새 프로세스를 띄워 peak RSS 가 서로 섞이지 않도록 함
+        proc = subprocess.run(
+            [sys.executable, __file__, args.audio, "--single", "--backends", name,
+             "--model", args.model, "--repeat", str(args.repeat)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{name:<36} 실패: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{r['backend']:<36} {r['audio_seconds']:>8} {r['load_seconds']:>8} "
+              f"{r['transcribe_seconds']:>8} {r['rtf']:>6} {r['peak_rss_mb']:>13}")
+
+
+if __name__ == "__main__":
+    main()
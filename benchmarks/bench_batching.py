@@ -0,0 +1,119 @@
+"""음성 인식 동적 배치 부하 테스트: 처리량과 p95 지연 비교.
+
+녹음해 둔 답변 WAV 들을 여러 세션이 동시에 다시 보내는 상황을 흉내 냅니다.
+세션마다 답변을 하나씩 보내고, 결과를 받으면 `--think` 초 뒤에 다음 답변을 보냅니다.
+첫 요청은 `--jitter` 초 안에 흩어져 거의 동시에 들어옵니다.
+
+- sequential: 이전 방식. 모든 세션이 모델 하나를 잠금으로 차례로 호출
+- batched:    asr_batching.DynamicBatcher 로 모아 30초 mel 창 배치로 인식
+- server:     --url 의 음성 인식 서버(asr_server.py)에 요청
+
+사용 예:
+    python benchmarks/bench_batching.py answers/*.wav --sessions 8 --requests 3
+    python benchmarks/bench_batching.py answers/ --modes server --url http://127.0.0.1:8765
+"""
+import argparse
+import glob
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_asr import load_audio  # noqa: E402
+
+
+def _answer_paths(inputs):
+    paths = []
+    for item in inputs:
+        paths.extend(sorted(glob.glob(os.path.join(item, "*.wav"))) if os.path.isdir(item) else [item])
+    if not paths:
+        raise SystemExit("답변 WAV 파일이 없습니다.")
+    return paths
+
+
+def _make_transcribe(mode, args):
+    """모드별로 (transcribe 함수, 통계 함수) 를 만듭니다."""
+    from asr_backend import create_backend
+    from asr_batching import DynamicBatcher
+
+    if mode == "server":
+        backend = create_backend("remote", args.url, max_concurrency=args.sessions).load()
+        return (lambda audio: backend.transcribe(audio, language="ko")), (lambda: backend._request("GET", "/health"))
+    backend = create_backend(args.backend, args.model).load()
+    if mode == "sequential":
+        lock = threading.Lock()
+
+        def transcribe(audio):
+            with lock:
+                return backend.transcribe(audio, language="ko")
+        return transcribe, dict
+    batcher = DynamicBatcher(backend, args.max_batch, args.max_wait_ms / 1000)
+    return (lambda audio: batcher.transcribe(audio, language="ko")), (
+        lambda: {"batches": batcher.batches, "mean_batch_size": round(batcher.mean_batch_size, 2)})
+
+
+def run_load(transcribe, answers, sessions, requests, think, jitter, seed=0):
+    """세션별 스레드로 부하를 걸고 (요청별 지연 목록, 처리한 오디오 초, 걸린 시간) 을 반환합니다."""
+    rng = random.Random(seed)
+    latencies, audio_seconds = [], [0.0]
+    lock = threading.Lock()
+    plans = [([rng.choice(answers) for _ in range(requests)], rng.uniform(0, jitter)) for _ in range(sessions)]
+
+    def session(plan, delay):
+        time.sleep(delay)
+        for audio in plan:
+            start = time.perf_counter()
+            transcribe(audio)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                audio_seconds[0] += len(audio) / 16000
+            time.sleep(think)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session, args=plan) for plan in plans]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, audio_seconds[0], time.perf_counter() - start
+
+
+def _p95(values):
+    return statistics.quantiles(values, n=20)[-1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("answers", nargs="+", help="답변 WAV 파일 또는 WAV 가 든 폴더")
+    parser.add_argument("--modes", nargs="+", default=["sequential", "batched"],
+                        choices=["sequential", "batched", "server"])
+    parser.add_argument("--sessions", type=int, default=8, help="동시에 면접 중인 세션 수")
+    parser.add_argument("--requests", type=int, default=3, help="세션당 보내는 답변 수")
+    parser.add_argument("--think", type=float, default=0.0, help="결과를 받은 뒤 다음 답변까지 쉬는 시간(초)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="세션별 첫 요청 시각을 흩뜨리는 범위(초)")
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=50.0)
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="server 모드의 음성 인식 서버 주소")
+    args = parser.parse_args()
+
+    answers = [load_audio(path) for path in _answer_paths(args.answers)]
+    print(f"답변 {len(answers)}개 (평균 {statistics.mean(len(a) for a in answers) / 16000:.1f}초), "
+          f"세션 {args.sessions}개 x 요청 {args.requests}개")
+    for mode in args.modes:
+        transcribe, stats = _make_transcribe(mode, args)
+        transcribe(answers[0])  # 예열 (첫 호출의 지연 시간 제외)
+        latencies, audio_seconds, wall = run_load(
+            transcribe, answers, args.sessions, args.requests, args.think, args.jitter)
+        print(f"  {mode:<10} 처리량 {audio_seconds / wall:6.2f} 오디오초/초 ({len(latencies) / wall:5.2f} 요청/초)   "
+              f"지연 p50 {statistics.median(latencies):6.2f}초  p95 {_p95(latencies):6.2f}초   {stats()}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
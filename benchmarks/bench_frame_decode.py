@@ -0,0 +1,68 @@
+"""프레임 디코딩/다운믹스 마이크로 벤치마크.
+
+기존 방식(프레임마다 to_ndarray → 레이아웃 확인 → mean/flatten → list append → concatenate)과
+audio_assembly.frames_to_mono_int16 의 일괄 조립을 같은 프레임 묶음으로 비교합니다.
+
+사용 예:
+    python benchmarks/bench_frame_decode.py --minutes 10
+"""
+import argparse
+import os
+import sys
+import timeit
+
+import av
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_assembly import frames_to_mono_int16  # noqa: E402
+
+
+def make_frames(count, fmt="s16", layout="stereo", samples=960, rate=48000):
+    """WebRTC 수신 프레임과 같은 형태(20ms, 48kHz)의 테스트 프레임을 만듭니다."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for _ in range(count):
+        frame = av.AudioFrame(format=fmt, layout=layout, samples=samples)
+        frame.sample_rate = rate
+        for plane in frame.planes:
+            if fmt.startswith("flt"):
+                data = rng.uniform(-1, 1, plane.buffer_size // 4).astype(np.float32).tobytes()
+            else:
+                data = rng.integers(0, 256, plane.buffer_size, dtype=np.uint8).tobytes()
+            plane.update(data)
+        frames.append(frame)
+    return frames
+
+
+def legacy_decode(frames):
+    """app.py 에 있던 기존 프레임 루프."""
+    audio_np_list = []
+    for f_ in frames:
+        data = f_.to_ndarray()
+        if f_.layout.name in ["stereo", "stereo_downmix"]:
+            audio_np_list.append(np.mean(data, axis=0))
+        else:
+            audio_np_list.append(data.flatten())
+    return np.concatenate(audio_np_list)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10.0, help="테스트 오디오 길이(분)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    count = int(args.minutes * 60 * 50)  # 20ms 프레임
+    print(f"프레임 {count}개 ({args.minutes}분 분량)")
+    for fmt, layout in [("s16", "stereo"), ("s16", "mono"), ("fltp", "stereo")]:
+        frames = make_frames(count, fmt, layout)
+        legacy = min(timeit.repeat(lambda: legacy_decode(frames), number=1, repeat=args.repeat))
+        batched = min(timeit.repeat(lambda: frames_to_mono_int16(frames), number=1, repeat=args.repeat))
+        print(f"{fmt:>5}/{layout:<7} 기존 {legacy * 1000:8.1f} ms   일괄 {batched * 1000:8.1f} ms   "
+              f"x{legacy / batched:.1f}")
+
+
+if __name__ == "__main__":
+    main()
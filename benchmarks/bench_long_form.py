@@ -0,0 +1,65 @@
+"""긴 답변 분할 병렬 인식 벤치마크: 한 번에 인식할 때와 시간, 결과 텍스트 비교.
+
+같은 긴 답변 WAV 를 한 모델로 한 번에 인식한 결과와, long_form.LongFormTranscriber 로
+청크를 나눠 작업자 N개가 병렬로 인식한 결과의 걸린 시간과 텍스트 유사도(문자 단위)를 출력합니다.
+작업자 프로세스의 모델 로드 시간은 제외합니다 (앱에서는 시작할 때 미리 띄워 둠).
+
+사용 예:
+    python benchmarks/bench_long_form.py long_answer.wav
+    python benchmarks/bench_long_form.py long_answer.wav --workers 2 4 --chunk-seconds 45
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_asr import load_audio  # noqa: E402
+
+
+def _text(segments):
+    return " ".join(seg["text"].strip() for seg in segments)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio", help="긴 답변 WAV 파일")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4], help="비교할 작업자 수")
+    parser.add_argument("--backend", default=None)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--chunk-seconds", type=float, default=60.0)
+    parser.add_argument("--overlap-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    from asr_backend import create_backend
+    from long_form import LongFormTranscriber
+
+    audio = load_audio(args.audio)
+    backend = create_backend(args.backend, args.model).load()
+    print(f"오디오 {len(audio) / 16000:.1f}초, {backend.description}")
+
+    start = time.perf_counter()
+    reference = _text(backend.transcribe(audio, language="ko"))
+    single = time.perf_counter() - start
+    print(f"  한 번에   {single:7.2f}초")
+
+    for workers in args.workers:
+        long_form = LongFormTranscriber(backend.name, backend.model_name, workers, args.chunk_seconds,
+                                        args.overlap_seconds, min_seconds=0)
+        try:
+            long_form.transcribe(audio, language="ko")  # 예열: 모든 작업자가 모델을 로드하도록 한 번 실행
+            start = time.perf_counter()
+            text = _text(long_form.transcribe(audio, language="ko"))
+            elapsed = time.perf_counter() - start
+        finally:
+            long_form.shutdown()
+        similarity = difflib.SequenceMatcher(None, reference, text, autojunk=False).ratio()
+        print(f"  작업자 {workers:<3} {elapsed:7.2f}초  x{single / elapsed:4.2f}  텍스트 유사도 {similarity:.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
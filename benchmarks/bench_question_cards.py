@@ -0,0 +1,147 @@
+"""질문 카드 클릭 한 번의 재실행 시간 측정 (실제 app.py 를 Streamlit AppTest 로 실행).
+
+app.py 의 질문 수를 바꿔 가며 첫 카드의 '답변 녹음 시작'/'녹음 중지' 를 번갈아 누르고 두 시간을 잽니다.
+
+- 전체 재실행: 스크립트 한 번 실행 시간 (카드가 fragment 가 아니라면 클릭마다 드는 비용)
+- 카드 fragment: 그 실행 중 누른 카드의 render_question_card 호출 시간
+  (실제 서버에서 카드 안의 클릭이 다시 실행하는 부분)
+
+AppTest 는 fragment 도 항상 스크립트 전체로 실행하므로, st.fragment 를 감싸 fragment 함수 호출마다 시간을 기록합니다
+(카드 안의 st.rerun(scope="fragment") 는 그 자리에서 멈추지 않고, 클릭마다 한 번 더 실행해 다시 그리는 것으로 대신함).
+음성 인식 모델과 WebRTC 는 이 스크립트 안에서만 가벼운 대역으로 바꿉니다
+(모델은 로드하지 않고, 오디오 스트림은 연결된 상태의 GlobalRecorder 를 돌려줌).
+카드가 다른 카드나 페이지 전체에 기대게 되면 질문 수에 따라 카드 fragment 시간이 함께 늘어납니다.
+
+사용 예:
+    python benchmarks/bench_question_cards.py --questions 3 10 30 --repeat 5
+"""
+import argparse
+import functools
+import os
+import statistics
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (fragment 함수 이름, 인자) -> 호출별 실행 시간(초)
+_FRAGMENT_TIMES = {}
+
+
+def _install_fragment_timer():
+    """st.fragment 로 감싼 함수마다 실행 시간을 _FRAGMENT_TIMES 에 기록하도록 바꿉니다."""
+    import streamlit as st
+
+    original = st.fragment
+
+    def fragment(func=None, **kwargs):
+        if func is None:
+            return lambda f: fragment(f, **kwargs)
+
+        @functools.wraps(func)
+        def timed(*args, **kw):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kw)
+            finally:
+                _FRAGMENT_TIMES.setdefault((func.__name__, args), []).append(time.perf_counter() - start)
+        return original(timed, **kwargs)
+
+    st.fragment = fragment
+
+    # 실제 서버에서는 카드 안의 클릭이 fragment 재실행이라 st.rerun(scope="fragment") 로 카드를 다시 그리지만,
+    # AppTest 는 항상 전체 실행이라 오류가 나므로, 이 경우에는 무시하고 time_clicks 에서 한 번 더 실행함
+    original_rerun = st.rerun
+
+    def rerun(*, scope="app", **kwargs):
+        if scope != "fragment":
+            original_rerun(scope=scope, **kwargs)
+
+    st.rerun = rerun
+
+
+def _install_stubs():
+    """모델 로드와 WebRTC 연결 없이 app.py 를 실행할 수 있도록 대역을 등록합니다."""
+    import streamlit as st
+
+    import asr_backend
+    import config
+
+    class IdleBackend(asr_backend.ASRBackend):
+        name = "bench-idle"
+
+        def _load_model(self):
+            return object()
+
+        def _transcribe(self, audio, **options):
+            return []
+
+    asr_backend.BACKENDS[IdleBackend.name] = IdleBackend
+    config.ASR_BACKEND = IdleBackend.name
+    config.ASR_SERVER_URL = ""
+
+    webrtc = types.ModuleType("streamlit_webrtc")
+
+    class AudioProcessorBase:
+        pass
+
+    class WebRtcMode:
+        SENDONLY = "sendonly"
+        RECVONLY = "recvonly"
+        SENDRECV = "sendrecv"
+
+    def webrtc_streamer(key, audio_processor_factory=None, **kwargs):
+        # 세션마다 프로세서 하나를 만들어 두고, 스트림은 항상 재생 중인 것으로 둠
+        state_key = f"_bench_processor_{key}"
+        if state_key not in st.session_state:
+            st.session_state[state_key] = audio_processor_factory()
+        return types.SimpleNamespace(state=types.SimpleNamespace(playing=True),
+                                     audio_processor=st.session_state[state_key])
+
+    webrtc.AudioProcessorBase = AudioProcessorBase
+    webrtc.WebRtcMode = WebRtcMode
+    webrtc.webrtc_streamer = webrtc_streamer
+    sys.modules["streamlit_webrtc"] = webrtc
+    sys.modules.pop("recorder", None)  # 대역 AudioProcessorBase 로 다시 import
+
+
+def time_clicks(questions, repeat):
+    """질문 `questions` 개로 app.py 를 띄우고 (전체 재실행 중앙값, 카드 fragment 중앙값) 을 반환합니다."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.session_state["questions"] = [f"질문 {i + 1}" for i in range(questions)]
+    at.run()
+    full, card = [], []
+    for i in range(repeat * 2):
+        key = "start_rec_0" if i % 2 == 0 else "stop_rec_0"
+        _FRAGMENT_TIMES.clear()
+        start = time.perf_counter()
+        # 클릭 처리 실행 + st.rerun(scope="fragment") 에 해당하는 다시 그리기 실행
+        at.button(key=key).click().run()
+        at.run()
+        full.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        card.append(sum(_FRAGMENT_TIMES[("render_question_card", (0,))]))
+    return statistics.median(full), statistics.median(card)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[3, 10, 30])
+    parser.add_argument("--repeat", type=int, default=5, help="녹음 시작/중지 클릭 쌍 수")
+    args = parser.parse_args()
+
+    _install_fragment_timer()
+    _install_stubs()
+    print(f"app.py 첫 카드 녹음 시작/중지 {args.repeat * 2}회 중앙값")
+    for n in args.questions:
+        full, card = time_clicks(n, args.repeat)
+        print(f"  질문 {n:>3}개   전체 재실행 {full * 1000:8.1f} ms   카드 fragment {card * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""질문 생성 첫 질문 표시 시간 비교 (로컬 가짜 스트리밍 클라이언트).
+
+같은 응답을 일정 속도로 흘려보내는 FakeStreamingModel 로
+비스트리밍(전체 생성 후 파싱)과 스트리밍(블록이 닫히는 대로 파싱)의
+첫 질문까지 걸린 시간과 전체 시간을 비교합니다.
+
+사용 예:
+    python benchmarks/bench_question_stream.py --questions 5 --chars-per-second 400
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_stream import FakeStreamingModel, QuestionStreamParser, chunk_text, parse_questions  # noqa: E402
+
+
+def sample_response(count):
+    blocks = [
+        f"===\nQ. 이력서의 프로젝트 {i + 1}에서 맡았던 역할과 어려웠던 점을 구체적으로 설명해 주세요.\n"
+        f"질문 의도: 문제 해결 역량과 협업 방식 검증 ({i + 1})\n==="
+        for i in range(count)
+    ]
+    return "\n".join(blocks)
+
+
+def run_blocking(model):
+    start = time.perf_counter()
+    response = model.generate_content("prompt")
+    questions = parse_questions(response.candidates[0].content.parts[0].text)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, len(questions)
+
+
+def run_streaming(model):
+    start = time.perf_counter()
+    parser = QuestionStreamParser()
+    first = None
+    for chunk in model.generate_content("prompt", stream=True):
+        if parser.feed(chunk_text(chunk)) and first is None:
+            first = time.perf_counter() - start
+    parser.close()
+    total = time.perf_counter() - start
+    return first if first is not None else total, total, len(parser.questions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--chunk-chars", type=int, default=24, help="조각 하나의 글자 수")
+    parser.add_argument("--chars-per-second", type=float, default=400.0, help="가짜 모델의 생성 속도")
+    args = parser.parse_args()
+
+    text = sample_response(args.questions)
+    delay = args.chunk_chars / args.chars_per_second
+    model = FakeStreamingModel(text, chunk_chars=args.chunk_chars, delay=delay)
+    print(f"응답 {len(text)}자, 질문 {args.questions}개, 조각 {args.chunk_chars}자 / {delay * 1000:.0f} ms")
+    for name, fn in [("비스트리밍", run_blocking), ("스트리밍", run_streaming)]:
+        first, total, count = fn(model)
+        print(f"  {name:<6} 첫 질문 {first:6.2f} s   전체 {total:6.2f} s   질문 {count}개")
+
+
+if __name__ == "__main__":
+    main()
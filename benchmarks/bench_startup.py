@@ -0,0 +1,176 @@
+"""앱 시작 시간 측정 (스크립트 실행, PyInstaller 빌드).
+
+새 프로세스로 서버를 띄우고 브라우저 대신 웹소켓으로 접속해 다음 시간을 잽니다.
+
+- 서버 준비: 프로세스 시작 ~ /_stcore/health 응답
+- 첫 화면: 접속(스크립트 실행 요청) ~ 첫 요소(제목) 도착
+- 전체 화면: 접속 ~ 스크립트 첫 실행 종료 (면접 준비 안내, 질문 카드까지 모두 그려짐)
+- 모델 준비: 접속 ~ 사이드바에 "모델 로드 완료" 가 표시됨 (화면을 주기적으로 다시 실행해 확인)
+
+스크립트는 모델 백그라운드 로드를 켠 경우(ASR_BACKGROUND_LOAD=1)와 끈 경우(=0, 이전 방식)를 비교합니다.
+--frozen 으로 app.spec 으로 만든 실행 파일을 주면 같은 항목을 잽니다 (서버 포트는 환경 변수로 전달).
+--imports 를 주면 무거운 모듈별 import 시간(새 프로세스, 파이썬 시작 시간 제외)도 잽니다.
+
+사용 예:
+    python benchmarks/bench_startup.py --imports
+    python benchmarks/bench_startup.py --frozen dist/app/app --repeat 3
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+IMPORT_MODULES = ["numpy", "soundfile", "streamlit", "av", "streamlit_webrtc", "torch", "whisper", "faster_whisper"]
+READY_TEXT = "모델 로드 완료"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_health(port, proc, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료되었습니다 (코드 {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"{timeout}초 안에 서버가 준비되지 않았습니다")
+
+
+async def _connect(url):
+    """Streamlit 버전에 따라 websockets(starlette 서버) 또는 tornado 클라이언트로 접속합니다."""
+    try:
+        from websockets.asyncio.client import connect
+    except ImportError:
+        from tornado.websocket import websocket_connect
+
+        ws = await websocket_connect(url, subprotocols=["streamlit"])
+        return (lambda data: ws.write_message(data, binary=True)), ws.read_message, ws.close
+    ws = await connect(url, subprotocols=["streamlit"], max_size=None)
+    return ws.send, ws.recv, ws.close
+
+
+async def _measure_session(port, model_timeout):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    send, recv, close = await _connect(f"ws://127.0.0.1:{port}/_stcore/stream")
+    rerun = BackMsg()
+    rerun.rerun_script.query_string = ""
+    result = {"first_element": None, "page": None, "model_ready": None}
+    start = time.perf_counter()
+    await send(rerun.SerializeToString())
+    deadline = start + model_timeout
+    try:
+        while time.perf_counter() < deadline:
+            msg = ForwardMsg()
+            msg.ParseFromString(await asyncio.wait_for(recv(), deadline - time.perf_counter()))
+            kind = msg.WhichOneof("type")
+            now = time.perf_counter() - start
+            if kind == "delta":
+                if result["first_element"] is None:
+                    result["first_element"] = now
+                element = msg.delta.new_element
+                if element.WhichOneof("type") == "alert" and READY_TEXT in element.alert.body:
+                    result["model_ready"] = now
+            elif kind == "script_finished":
+                if result["page"] is None:
+                    result["page"] = now
+                if result["model_ready"] is not None:
+                    break
+                await asyncio.sleep(0.5)
+                await send(rerun.SerializeToString())  # 브라우저의 주기적 갱신 대신 다시 실행 요청
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        await close()
+    return result
+
+
+def measure_server(cmd, env_overrides, server_timeout, model_timeout):
+    port = _free_port()
+    env = dict(os.environ, STREAMLIT_SERVER_PORT=str(port), STREAMLIT_SERVER_HEADLESS="true",
+               STREAMLIT_BROWSER_GATHER_USAGE_STATS="false", **env_overrides)
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_health(port, proc, server_timeout)
+        result = {"server": time.perf_counter() - start}
+        result.update(asyncio.run(_measure_session(port, model_timeout)))
+        return result
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def _median(samples, key):
+    values = [s[key] for s in samples if s[key] is not None]
+    return f"{statistics.median(values):7.2f}초" if values else "     없음"
+
+
+def report(label, samples):
+    print(f"  {label:<22} 서버 준비 {_median(samples, 'server')}   첫 화면 {_median(samples, 'first_element')}   "
+          f"전체 화면 {_median(samples, 'page')}   모델 준비 {_median(samples, 'model_ready')}")
+
+
+def measure_imports(repeat):
+    def run(code):
+        start = time.perf_counter()
+        done = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+        return time.perf_counter() - start, done.returncode == 0
+
+    baseline = statistics.median(run("pass")[0] for _ in range(repeat))
+    print(f"모듈 import 시간 (새 프로세스, 파이썬 시작 {baseline * 1000:.0f} ms 제외, {repeat}회 중앙값)")
+    for name in IMPORT_MODULES:
+        runs = [run(f"import {name}") for _ in range(repeat)]
+        if not all(ok for _, ok in runs):
+            print(f"  {name:<18} 설치되지 않음")
+            continue
+        print(f"  {name:<18} {(statistics.median(t for t, _ in runs) - baseline) * 1000:8.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--imports", action="store_true", help="모듈별 import 시간도 측정")
+    parser.add_argument("--frozen", help="PyInstaller 로 만든 실행 파일 경로 (예: dist/app/app)")
+    parser.add_argument("--skip-script", action="store_true", help="streamlit run app.py 측정 생략")
+    parser.add_argument("--server-timeout", type=float, default=120.0)
+    parser.add_argument("--model-timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    if args.imports:
+        measure_imports(args.repeat)
+
+    print(f"앱 시작 시간 ({args.repeat}회 중앙값)")
+    targets = []
+    if not args.skip_script:
+        script = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py")]
+        targets.append(("스크립트 (백그라운드 로드)", script, {"ASR_BACKGROUND_LOAD": "1"}))
+        targets.append(("스크립트 (이전: 로드 대기)", script, {"ASR_BACKGROUND_LOAD": "0"}))
+    if args.frozen:
+        targets.append(("PyInstaller 빌드", [os.path.abspath(args.frozen)], {}))
+    for label, cmd, env in targets:
+        samples = [measure_server(cmd, env, args.server_timeout, args.model_timeout) for _ in range(args.repeat)]
+        report(label, samples)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""회사 프로필 요약(digest).
+
+핵심 가치, 인재상, 직무 기술서는 한 채용 차수 동안 모든 지원자에게 같으므로,
+세 문서를 LLM 으로 한 번 요약한 "회사 프로필" 을 디스크에 저장해 두고
+질문 생성 시에는 원문 대신 이 요약과 지원자 이력서만 보냅니다.
+요약은 세 문서 내용의 해시와 모델 이름을 키로 저장되며, 문서가 바뀌면 새로 만듭니다.
+"""
+import hashlib
+import json
+import os
+import time
+
+DIGEST_PROMPT = """
+당신은 기업의 채용 담당자입니다. 아래 세 문서를 면접 질문 생성에 쓸 "회사 프로필" 로 요약해 주세요.
+
+규칙:
+- 원문에 있는 내용만 쓰고, 추측하거나 새로 만들지 마세요.
+- 항목마다 한 줄로, 면접에서 검증할 수 있는 행동/경험 지표가 드러나게 쓰세요.
+- 인사말, 설명, 마크다운 강조 없이 아래 형식만 출력하세요.
+
+[핵심 가치]
+- 가치 이름: 의미와 기대 행동
+
+[인재상]
+- 특성: 의미와 기대 행동
+
+[직무 요건]
+- 필수: 요구 역량/경험
+- 우대: 우대 역량/경험
+- 주요 업무: 담당 업무
+
+---
+핵심 가치:
+{core}
+
+인재상:
+{persona}
+
+직무 기술서:
+{jd}
+"""
+
+
+def profile_key(core_text: str, persona_text: str, jd_text: str, model: str) -> str:
+    """세 문서 내용과 모델 이름으로 프로필 키를 만듭니다."""
+    h = hashlib.sha256()
+    for part in (core_text, persona_text, jd_text, model):
+        h.update(hashlib.sha256(part.encode("utf-8")).digest())
+    return h.hexdigest()
+
+
+def build_digest_prompt(core_text: str, persona_text: str, jd_text: str) -> str:
+    return DIGEST_PROMPT.format(core=core_text, persona=persona_text, jd=jd_text)
+
+
+class CompanyProfileStore:
+    """회사 프로필을 키별 JSON 파일로 보관하는 저장소 (여러 세션/프로세스 공유)."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """저장된 프로필 dict (digest, model, created_at, ...) 또는 None."""
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, digest: str, model: str, **info) -> dict:
+        profile = {"key": key, "model": model, "created_at": time.time(), "digest": digest, **info}
+        # 임시 파일에 쓴 뒤 바꿔치기하여, 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        tmp = self._path(key) + f".{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self._path(key))
+        return profile
+
+    def get_or_create(self, core_text, persona_text, jd_text, model, generate_fn, force=False):
+        """프로필을 반환합니다. 없거나 force 이면 `generate_fn(prompt) -> str` 로 만들어 저장합니다.
+
+        반환값은 (프로필 dict, 새로 만들었는지) 입니다.
+        """
+        key = profile_key(core_text, persona_text, jd_text, model)
+        profile = None if force else self.get(key)
+        if profile is not None:
+            return profile, False
+        digest = (generate_fn(build_digest_prompt(core_text, persona_text, jd_text)) or "").strip()
+        if not digest:
+            raise ValueError("회사 프로필 요약 결과가 비어 있습니다.")
+        source_chars = len(core_text) + len(persona_text) + len(jd_text)
+        return self.put(key, digest, model, source_chars=source_chars), True
@@ -0,0 +1,155 @@
+"""면접 Agent 실행 설정.
+
+환경 변수로 덮어쓸 수 있는 기본값을 한곳에 모아 둡니다.
+"""
+import os
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, "") else default
+
+
+# 캐시, 임시 오디오 등 앱이 로컬에 남기는 파일의 기본 위치
+DATA_DIR = os.environ.get(
+    "INTERVIEW_AGENT_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".interview_agent"),
+)
+
+# --- 오디오 녹음 버퍼 ---
+# 세션당 메모리에 유지할 최대 오디오 길이(초). 넘치는 오래된 오디오는 디스크로 옮깁니다.
+AUDIO_RETENTION_SECONDS = _env_float("AUDIO_RETENTION_SECONDS", 300.0)
+# 버퍼의 최초 할당 크기(초). 필요하면 보존 상한까지 두 배씩 늘어납니다.
+AUDIO_INITIAL_BUFFER_SECONDS = _env_float("AUDIO_INITIAL_BUFFER_SECONDS", 30.0)
+# 보존 상한을 넘긴 오디오가 저장되는 폴더
+AUDIO_SPILL_DIR = os.environ.get("AUDIO_SPILL_DIR", os.path.join(DATA_DIR, "spill"))
+
+# --- 녹음 중 점진적 음성 인식 ---
+# 켜 두면 답변 녹음 중 발화가 끊기는 지점마다 백그라운드에서 미리 인식합니다.
+STREAMING_TRANSCRIPTION = os.environ.get("STREAMING_TRANSCRIPTION", "1") not in ("0", "false", "False")
+# 이 길이(ms) 이상의 무음이 이어지면 청크를 닫습니다.
+STREAMING_MIN_SILENCE_MS = _env_int("STREAMING_MIN_SILENCE_MS", 600)
+# 청크 최소/최대 길이(초). 최대 길이를 넘으면 무음이 없어도 청크를 닫습니다.
+STREAMING_MIN_CHUNK_SECONDS = _env_float("STREAMING_MIN_CHUNK_SECONDS", 2.0)
+STREAMING_MAX_CHUNK_SECONDS = _env_float("STREAMING_MAX_CHUNK_SECONDS", 25.0)
+# 녹음 중인 답변의 부분 인식 결과를 화면에 갱신하는 주기(초)
+STREAMING_REFRESH_SECONDS = _env_float("STREAMING_REFRESH_SECONDS", 2.0)
+# 녹음 중지 시 마지막 구간 인식을 기다리는 최대 시간(초). 넘으면 점진적 인식을 버리고 '음성 인식' 버튼으로 다시 변환
+STREAMING_FINISH_TIMEOUT_SECONDS = _env_float("STREAMING_FINISH_TIMEOUT_SECONDS", 15.0)
+
+# --- 인식 전 무음 제거(VAD) ---
+# 켜 두면 모델에 넘기기 전에 시작 전/끝난 뒤의 무음과 발화 사이의 긴 무음을 잘라냅니다.
+VAD_TRIM = os.environ.get("VAD_TRIM", "1") not in ("0", "false", "False")
+# 0(가장 보수적) ~ 3(가장 많이 잘라냄)
+VAD_AGGRESSIVENESS = _env_int("VAD_AGGRESSIVENESS", 1)
+
+# --- 음성 인식 백엔드 ---
+# "whisper" (openai-whisper, PyTorch FP32) 또는 "faster-whisper" (CTranslate2 int8, CPU에서 더 빠름)
+ASR_BACKEND = os.environ.get("ASR_BACKEND", "whisper")
+# 모델 크기: "tiny", "base", "small", "medium" 등
+ASR_MODEL = os.environ.get("ASR_MODEL", "base")
+# faster-whisper 연산 정밀도 ("int8", "int8_float32", "float32")와 사용할 CPU 스레드 수 (0이면 전체 코어)
+ASR_COMPUTE_TYPE = os.environ.get("ASR_COMPUTE_TYPE", "int8")
+ASR_CPU_THREADS = _env_int("ASR_CPU_THREADS", 0)
+
+# --- 로컬 음성 인식 서버 (asr_server.py) ---
+# 설정하면 앱은 모델을 직접 올리지 않고 이 서버에 인식을 요청합니다 (노드당 모델 하나를 여러 Streamlit 프로세스가 공유).
+# 예: "http://127.0.0.1:8765" 또는 "unix:///tmp/asr.sock"
+ASR_SERVER_URL = os.environ.get("ASR_SERVER_URL", "")
+# 앱이 서버 준비(모델 로드 완료)를 기다리는 최대 시간(초)
+ASR_SERVER_CONNECT_TIMEOUT = _env_float("ASR_SERVER_CONNECT_TIMEOUT", 60.0)
+
+# --- 음성 인식 동적 배치 ---
+# 켜 두면 여러 세션의 인식 요청을 모아 한 번에 처리합니다 (Whisper 는 무음에서 자른 30초 이하 창들을 한 번의 배치로 인식).
+# 기다리는 요청이 하나뿐이면 배치 없이 그대로 인식합니다.
+# 음성 인식 서버는 항상 배치로 처리하며, 서버 클라이언트(ASR_SERVER_URL)로 동작할 때는 앱에서 따로 모으지 않습니다.
+ASR_BATCHING = os.environ.get("ASR_BATCHING", "1") not in ("0", "false", "False")
+# 한 배치로 모으는 최대 요청 수와, 첫 요청 이후 더 기다리는 최대 시간(밀리초)
+ASR_BATCH_MAX_REQUESTS = _env_int("ASR_BATCH_MAX_REQUESTS", 8)
+ASR_BATCH_MAX_WAIT_MS = _env_float("ASR_BATCH_MAX_WAIT_MS", 50.0)
+# Whisper 배치 encoder/decoder 한 번에 넣는 최대 30초 창 수 (메모리 사용량과 비례)
+ASR_BATCH_MAX_WINDOWS = _env_int("ASR_BATCH_MAX_WINDOWS", 8)
+
+# --- 긴 답변 분할 병렬 인식 (app.py) ---
+# 2 이상이면 긴 답변을 무음 경계에서 청크로 나눠 이 수만큼의 작업자 프로세스가 동시에 인식합니다.
+# 작업자마다 모델을 하나씩 더 올리므로 메모리가 (작업자 수 + 1) 배로 늘어납니다. 0 또는 1 이면 사용하지 않습니다.
+LONG_FORM_WORKERS = _env_int("LONG_FORM_WORKERS", 0)
+# 이 길이(초) 이상의 답변(무음 제거 후)만 나눠서 인식
+LONG_FORM_MIN_SECONDS = _env_float("LONG_FORM_MIN_SECONDS", 180.0)
+# 청크 목표 길이(초)와, 경계의 단어가 잘리지 않도록 청크 앞뒤로 겹쳐 인식하는 길이(초)
+LONG_FORM_CHUNK_SECONDS = _env_float("LONG_FORM_CHUNK_SECONDS", 60.0)
+LONG_FORM_OVERLAP_SECONDS = _env_float("LONG_FORM_OVERLAP_SECONDS", 1.0)
+
+# --- 앱 시작 ---
+# 켜 두면 음성 인식 모델을 백그라운드 스레드에서 로드하여, 첫 화면과 면접 준비 안내가 모델 로드를 기다리지 않습니다.
+ASR_BACKGROUND_LOAD = os.environ.get("ASR_BACKGROUND_LOAD", "1") not in ("0", "false", "False")
+# 모델 로드 중 사이드바 준비 상태를 갱신하는 주기(초)
+MODEL_STATUS_POLL_SECONDS = _env_float("MODEL_STATUS_POLL_SECONDS", 1.0)
+
+# --- 디버깅 ---
+# 설정하면 음성 인식 모델에 넘긴 오디오를 이 폴더에 WAV로 남깁니다 (기본: 저장하지 않음).
+AUDIO_DEBUG_DUMP_DIR = os.environ.get("AUDIO_DEBUG_DUMP_DIR", "")
+
+# --- 답변 오디오 캐시 ---
+# 녹음 종료 시 준비한 답변 오디오(모델 입력 + 다운로드 WAV)를 보관하는 메모리 예산(MB, 전체 세션 합계)
+AUDIO_CACHE_MAX_MB = _env_float("AUDIO_CACHE_MAX_MB", 256.0)
+
+# --- 음성 인식 결과 캐시 ---
+# 같은 오디오(16kHz 샘플 해시) + 모델 + 옵션의 구간 목록을 보관하는 메모리 예산(MB, 전체 세션 합계)
+TRANSCRIPTION_CACHE_MAX_MB = _env_float("TRANSCRIPTION_CACHE_MAX_MB", 16.0)
+
+# --- 음성 인식 작업 스케줄러 ---
+# 프로세스 전체에서 동시에 실행할 음성 인식 작업 수 (openai-whisper 백엔드는 항상 1)
+TRANSCRIBE_WORKERS = _env_int("TRANSCRIBE_WORKERS", 2)
+# 세션 하나가 대기열에 올릴 수 있는 최대 작업 수
+TRANSCRIBE_MAX_PENDING_PER_SESSION = _env_int("TRANSCRIBE_MAX_PENDING_PER_SESSION", 8)
+# 음성 인식 진행 상태를 화면에서 확인하는 주기(초)
+TRANSCRIBE_POLL_SECONDS = _env_float("TRANSCRIBE_POLL_SECONDS", 1.0)
+
+# --- PDF 텍스트 추출 (app(구글).py) ---
+# 새 PDF 를 추출할 작업자 프로세스 수
+PDF_WORKERS = _env_int("PDF_WORKERS", min(4, os.cpu_count() or 1))
+# 작업 하나가 맡을 페이지 수
+PDF_PAGES_PER_TASK = _env_int("PDF_PAGES_PER_TASK", 4)
+# 내용 해시로 보관할 추출 텍스트 수 (전체 세션 합계)
+PDF_TEXT_CACHE_ENTRIES = _env_int("PDF_TEXT_CACHE_ENTRIES", 64)
+
+# --- 질문 생성 (app(구글).py) ---
+# 켜 두면 Gemini 응답을 스트리밍으로 받아 질문 블록이 완성되는 대로 화면에 보여줍니다.
+GEMINI_STREAMING = os.environ.get("GEMINI_STREAMING", "1") not in ("0", "false", "False")
+# 설정하면 Gemini API 대신 이 파일의 내용을 조각내어 돌려주는 로컬 가짜 클라이언트를 사용합니다 (테스트용).
+GEMINI_FAKE_RESPONSE_FILE = os.environ.get("GEMINI_FAKE_RESPONSE_FILE", "")
+
+# --- LLM 질문 생성 응답 캐시 (app(구글).py, app(오픈).py) ---
+# 같은 문서/모델/질문 수/생성 설정으로 다시 요청하면 저장된 응답을 사용합니다.
+LLM_CACHE_PATH = os.environ.get("LLM_CACHE_PATH", os.path.join(DATA_DIR, "llm_cache.sqlite3"))
+# 보관 기간(시간, 0이면 만료 없음)과 전체 크기 예산(MB)
+LLM_CACHE_TTL_HOURS = _env_float("LLM_CACHE_TTL_HOURS", 24 * 7)
+LLM_CACHE_MAX_MB = _env_float("LLM_CACHE_MAX_MB", 64.0)
+
+# --- 질문 생성 프롬프트 토큰 예산 ---
+# 네 문서(핵심 가치, 인재상, JD, 이력서)를 합쳐 프롬프트에 넣을 최대 토큰 수
+PROMPT_BUDGET_TOKENS_GEMINI = _env_int("PROMPT_BUDGET_TOKENS_GEMINI", 30000)
+PROMPT_BUDGET_TOKENS_OPENAI = _env_int("PROMPT_BUDGET_TOKENS_OPENAI", 6000)
+# 예산이 부족할 때도 문서마다 우선 남겨 두는 최소 토큰 수
+PROMPT_MIN_DOC_TOKENS = _env_int("PROMPT_MIN_DOC_TOKENS", 300)
+
+# --- 회사 프로필 요약 ---
+# 켜 두면 핵심 가치/인재상/JD 를 한 번 요약해 저장하고, 질문 생성에는 원문 대신 요약과 이력서만 보냅니다.
+COMPANY_PROFILE = os.environ.get("COMPANY_PROFILE", "1") not in ("0", "false", "False")
+COMPANY_PROFILE_DIR = os.environ.get("COMPANY_PROFILE_DIR", os.path.join(DATA_DIR, "company_profiles"))
+
+# --- 여러 지원자 일괄 질문 생성 ---
+# 동시에 실행할 LLM 요청 수와 요청당 최대 재시도 횟수 (요청 한도 초과 시 지수 백오프)
+BATCH_CONCURRENCY = _env_int("BATCH_CONCURRENCY", 4)
+BATCH_MAX_RETRIES = _env_int("BATCH_MAX_RETRIES", 5)
+
+# --- 면접 기록 저장소 (app.py) ---
+# 저장한 면접 기록 SQLite 파일과 기록 목록 한 페이지에 표시할 건수
+HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH", os.path.join(DATA_DIR, "interview_history.sqlite3"))
+HISTORY_PAGE_SIZE = _env_int("HISTORY_PAGE_SIZE", 20)
@@ -0,0 +1,206 @@
+"""면접 기록 저장소 (로컬 SQLite + 전문 검색).
+
+"📌 현재 면접 기록 저장" 으로 저장한 면접을 디스크에 보관합니다. 새로고침이나 서버 재시작 후에도 남습니다.
+목록은 날짜, 지원자, 부서로 걸러 페이지 단위로 읽고, 질문별 답변과 메모 같은 상세 내용은 열 때만 읽습니다.
+답변, 메모, 질문, 지원자 이름은 FTS5 색인으로 검색합니다.
+한국어는 띄어쓰기 단위로 자르면 조사 때문에 찾지 못하는 경우가 많으므로, trigram 토크나이저로 부분 문자열을 찾습니다.
+이 토크나이저가 없는 SQLite(3.34 미만)에서는 단어 단위로 찾고, FTS5 자체가 없으면 LIKE 로 찾습니다.
+"""
+import contextlib
+import datetime
+import json
+import os
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    interview_date TEXT NOT NULL,
+    interviewer TEXT NOT NULL,
+    department TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    question_count INTEGER NOT NULL,
+    records TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interviews_date ON interviews (interview_date, created_at);
+CREATE INDEX IF NOT EXISTS idx_interviews_candidate ON interviews (candidate, created_at);
+CREATE INDEX IF NOT EXISTS idx_interviews_department ON interviews (department, created_at);
+"""
+
+# 목록에 필요한 열만 읽음 (상세 기록 JSON 은 get() 에서만 읽음)
+_SUMMARY_COLUMNS = "i.id, i.created_at, i.interview_date, i.interviewer, i.department, i.candidate, i.question_count"
+
+
+def _search_text(records):
+    """검색 색인에 넣을 질문/답변/메모 텍스트."""
+    qa = "\n".join(f"{r.get('질문', '')}\n{r.get('지원자 답변', '')}" for r in records)
+    memos = "\n".join(r.get("면접관 메모", "") or "" for r in records)
+    return qa, memos
+
+
+class InterviewHistoryStore:
+    """여러 세션/프로세스가 함께 쓰는 면접 기록 저장소."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            self.search_mode = self._create_search_index(conn)
+
+    def save(self, interviewer, department, candidate, records, interview_date=None) -> int:
+        """면접 한 건을 저장하고 기록 ID 를 반환합니다. `records` 는 질문별 결과 dict 목록입니다."""
+        interview_date = str(interview_date or datetime.date.today())
+        records = [dict(r) for r in records]
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO interviews (created_at, interview_date, interviewer, department, candidate, "
+                "question_count, records) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), interview_date, interviewer, department, candidate, len(records),
+                 json.dumps(records, ensure_ascii=False)),
+            )
+            interview_id = cur.lastrowid
+            if self.search_mode != "like":
+                qa, memos = _search_text(records)
+                conn.execute(
+                    "INSERT INTO interview_fts (rowid, candidate, department, interviewer, qa, memos) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (interview_id, candidate, department, interviewer, qa, memos),
+                )
+        return interview_id
+
+    def get(self, interview_id):
+        """기록 한 건의 요약과 질문별 상세 내용을 반환합니다. 없으면 None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, i.records FROM interviews i WHERE i.id = ?", (interview_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        summary = self._summary(row[:-1])
+        summary["records"] = json.loads(row[-1])
+        return summary
+
+    def delete(self, interview_id) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM interviews WHERE id = ?", (interview_id,))
+            if self.search_mode != "like":
+                conn.execute("DELETE FROM interview_fts WHERE rowid = ?", (interview_id,))
+
+    def search(self, query="", candidate="", department="", date_from=None, date_to=None, page=0, page_size=20):
+        """조건에 맞는 기록 요약을 최신순으로 한 페이지 반환합니다: (요약 목록, 전체 건수).
+
+        `query` 는 답변/메모/질문/이름 전문 검색, `candidate` 는 이름 일부, `department` 는 부서 이름과 정확히 일치.
+        """
+        join, where_sql, params = self._filter_sql(query, candidate, department, date_from, date_to)
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM interviews i {join} {where_sql}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS} FROM interviews i {join} {where_sql} "
+                "ORDER BY i.interview_date DESC, i.created_at DESC LIMIT ? OFFSET ?",
+                params + [page_size, page * page_size],
+            ).fetchall()
+        return [self._summary(row) for row in rows], total
+
+    def iter_interviews(self, query="", candidate="", department="", date_from=None, date_to=None, batch_size=200):
+        """조건에 맞는 기록을 상세 내용과 함께 최신순으로 하나씩 흘려 보냅니다 (여러 면접 내보내기용).
+
+        `batch_size` 건씩만 읽어 오므로 기록이 많아도 전체를 메모리에 올리지 않습니다.
+        """
+        join, where_sql, params = self._filter_sql(query, candidate, department, date_from, date_to)
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"SELECT {_SUMMARY_COLUMNS}, i.records FROM interviews i {join} {where_sql} "
+                "ORDER BY i.interview_date DESC, i.created_at DESC",
+                params,
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    interview = self._summary(row[:-1])
+                    interview["records"] = json.loads(row[-1])
+                    yield interview
+
+    def departments(self) -> list:
+        """저장된 기록의 부서 이름 목록 (필터 선택용)."""
+        with self._connect() as conn:
+            return [r[0] for r in conn.execute("SELECT DISTINCT department FROM interviews ORDER BY department")]
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM interviews").fetchone()[0]
+
+    # --- 내부 구현 ---
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # 연결은 호출마다 새로 열어 스레드 간에 공유하지 않음
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:  # 정상 종료 시 commit, 예외 시 rollback
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_search_index(conn):
+        existing = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'interview_fts'").fetchone()
+        if existing is not None:
+            return "trigram" if "trigram" in existing[0] else "unicode61"
+        columns = "candidate, department, interviewer, qa, memos"
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                conn.execute(f"CREATE VIRTUAL TABLE interview_fts USING fts5({columns}, tokenize='{tokenizer}')")
+                return tokenizer
+            except sqlite3.OperationalError:
+                continue  # 토크나이저 또는 FTS5 모듈이 없는 SQLite
+        return "like"
+
+    def _filter_sql(self, query, candidate, department, date_from, date_to):
+        """검색 조건을 (JOIN 절, WHERE 절, 인자 목록) 으로 만듭니다."""
+        where, params, join = [], [], ""
+        query = (query or "").strip()
+        if query:
+            clause, value = self._match_clause(query)
+            if self.search_mode != "like":
+                join = "JOIN interview_fts f ON f.rowid = i.id"
+            where.append(clause)
+            params.extend(value)
+        if candidate:
+            where.append("i.candidate LIKE ?")
+            params.append(f"%{candidate}%")
+        if department:
+            where.append("i.department = ?")
+            params.append(department)
+        if date_from:
+            where.append("i.interview_date >= ?")
+            params.append(str(date_from))
+        if date_to:
+            where.append("i.interview_date <= ?")
+            params.append(str(date_to))
+        return join, ("WHERE " + " AND ".join(where)) if where else "", params
+
+    def _match_clause(self, query):
+        if self.search_mode == "like":
+            return "i.records LIKE ?", [f"%{query}%"]
+        if self.search_mode == "trigram" and len(query) < 3:
+            # trigram 색인은 3글자 이상만 찾으므로 짧은 검색어는 색인 테이블을 LIKE 로 훑음
+            return "(f.qa LIKE ? OR f.memos LIKE ? OR f.candidate LIKE ?)", [f"%{query}%"] * 3
+        # 검색어 전체를 하나의 구문으로 인용하여 FTS 문법 문자(", *, - 등)가 오류를 내지 않도록 함
+        return "interview_fts MATCH ?", ['"' + query.replace('"', '""') + '"']
+
+    @staticmethod
+    def _summary(row):
+        return {
+            "id": row[0],
+            "saved_at": datetime.datetime.fromtimestamp(row[1]).strftime("%Y-%m-%d %H:%M"),
+            "interview_date": row[2],
+            "interviewer": row[3],
+            "department": row[4],
+            "candidate": row[5],
+            "question_count": row[6],
+        }
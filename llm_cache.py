@@ -0,0 +1,107 @@
+"""LLM 질문 생성 응답 캐시 (로컬 SQLite).
+
+네 문서(핵심 가치, 인재상, JD, 이력서)의 해시, 모델 이름, 질문 수, 생성 설정으로 키를 만들고
+응답 원문을 저장합니다. 같은 조건으로 다시 요청하면 API 를 호출하지 않고 저장된 응답을 돌려줍니다.
+보관 기간(TTL)이 지난 항목은 읽을 때 지우고, 전체 크기가 예산을 넘으면 가장 오래 쓰지 않은 항목부터 지웁니다.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def make_key(documents, model, num_questions, settings=None) -> str:
+    """문서 내용 해시 + 모델 + 질문 수 + 생성 설정으로 캐시 키를 만듭니다."""
+    payload = {
+        "documents": [hashlib.sha256(doc.encode("utf-8")).hexdigest() for doc in documents],
+        "model": model,
+        "num_questions": int(num_questions),
+        "settings": settings or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """여러 세션/프로세스가 함께 쓰는 SQLite 응답 캐시."""
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(_SCHEMA)
+
+    def get(self, key):
+        """저장된 응답을 반환합니다. 없거나 만료되었으면 None (만료된 항목은 지움)."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def put(self, key, response: str, model: str = "") -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(conn, now, keep=key)
+
+    def delete(self, key) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses").fetchone()
+        return {"entries": count, "bytes": size}
+
+    # --- 내부 구현 ---
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # 연결은 호출마다 새로 열어 스레드 간에 공유하지 않음
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:  # 정상 종료 시 commit, 예외 시 rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def _evict(self, conn, now, keep):
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 방금 넣은 항목은 남기고, 가장 오래 쓰지 않은 항목부터 지움
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_responses WHERE key != ? ORDER BY accessed_at", (keep,)
+        ).fetchall():
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
@@ -0,0 +1,135 @@
+"""긴 답변 분할 병렬 인식.
+
+긴 답변(예: 15분)을 한 배열로 넘기면 Whisper 는 30초 창을 하나씩 차례로 처리합니다.
+여기서는 답변을 발화 사이의 무음에서 청크로 나누고(앞뒤로 조금씩 겹침), 프로세스 풀의 작업자들이
+(작업자마다 모델 하나) 동시에 인식한 뒤, 겹친 부분의 중복을 지우고 원본 기준의 연속 타임스탬프로 이어 붙입니다.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from vad import split_at_silence
+
+# 청크 경계에서 겹친 단어를 찾을 때 비교하는 최대 단어 수
+_MAX_OVERLAP_WORDS = 8
+
+
+def _dedupe_words(previous_text, text):
+    """앞 청크 끝과 겹쳐 다시 나온 단어들을 `text` 앞에서 지웁니다."""
+    prev, words = previous_text.split(), text.split()
+    for k in range(min(_MAX_OVERLAP_WORDS, len(prev), len(words)), 0, -1):
+        if prev[-k:] == words[:k]:
+            return " ".join(words[k:])
+    return text
+
+
+def stitch_segments(chunk_results, sample_rate):
+    """청크별 인식 결과를 하나의 구간 목록으로 이어 붙입니다.
+
+    `chunk_results` 는 (청크 구간, 실제로 인식한 오디오 시작 샘플, 구간 목록) 목록입니다.
+    겹친 부분의 구간은 가운데 시점이 속한 청크의 것만 남기고, 경계에서 되풀이된 단어는 지우며,
+    시간은 원본 녹음 기준으로 바꾸어 앞 구간과 겹치지 않게 이어 붙입니다.
+    """
+    stitched = []
+    for (core_start, core_end), audio_start, segments in chunk_results:
+        offset = audio_start / sample_rate
+        lo, hi = core_start / sample_rate, core_end / sample_rate
+        at_boundary = bool(stitched)  # 청크의 첫 구간만 앞 청크 끝과 겹칠 수 있음
+        for seg in segments:
+            start, end = seg["start"] + offset, seg["end"] + offset
+            if not lo <= (start + end) / 2 < hi:
+                continue  # 겹친 부분: 이웃 청크가 맡음
+            text = seg["text"].strip()
+            if at_boundary:
+                text = _dedupe_words(stitched[-1]["text"], text)
+                at_boundary = False
+            if stitched:
+                start = max(start, stitched[-1]["end"])
+            if text:
+                stitched.append({**seg, "start": start, "end": max(start, end), "text": text})
+    return stitched
+
+
+# --- 작업자 프로세스 ---
+
+_worker_backend = None
+
+
+def _init_worker(backend_name, model_name, backend_kwargs, threads):
+    global _worker_backend
+    # 작업자들이 코어를 나눠 쓰도록 모델 import 전에 스레드 수를 제한
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    from asr_backend import create_backend
+
+    kwargs = dict(backend_kwargs)
+    if backend_name == "faster-whisper":
+        kwargs.update(cpu_threads=threads, num_workers=1)
+    _worker_backend = create_backend(backend_name, model_name, **kwargs).load()
+
+
+def _transcribe_chunk(audio, options):
+    return _worker_backend.transcribe(audio, **options)
+
+
+def _ready():
+    return _worker_backend is not None
+
+
+class LongFormTranscriber:
+    """긴 답변을 청크로 나눠 프로세스 풀에서 병렬로 인식합니다 (여러 세션 공유)."""
+
+    def __init__(self, backend_name, model_name, workers=2, chunk_seconds=60.0, overlap_seconds=1.0,
+                 min_seconds=180.0, sample_rate=16000, backend_kwargs=None):
+        self.backend_name = backend_name
+        self.model_name = model_name
+        self.workers = max(1, int(workers))
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.min_seconds = min_seconds
+        self.sample_rate = sample_rate
+        self.backend_kwargs = dict(backend_kwargs or {})
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def accepts(self, audio) -> bool:
+        """분할 인식을 쓸 만큼 긴 오디오인지."""
+        return len(audio) >= self.min_seconds * self.sample_rate
+
+    def transcribe(self, audio, **options) -> list:
+        """16kHz float32 오디오를 청크로 나눠 병렬 인식하고, 이어 붙인 구간 목록을 반환합니다."""
+        overlap = int(self.overlap_seconds * self.sample_rate)
+        spans = split_at_silence(audio, self.sample_rate, self.chunk_seconds, self.chunk_seconds * 1.5)
+        pool = self._get_pool()
+        futures = []
+        for start, end in spans:
+            audio_start = max(0, start - overlap)
+            chunk = np.ascontiguousarray(audio[audio_start:min(len(audio), end + overlap)])
+            futures.append(((start, end), audio_start, pool.submit(_transcribe_chunk, chunk, options)))
+        return stitch_segments([(span, s, f.result()) for span, s, f in futures], self.sample_rate)
+
+    def warm(self) -> None:
+        """작업자 프로세스를 미리 띄워 모델을 로드해 둡니다 (기다리지 않음)."""
+        pool = self._get_pool()
+        for _ in range(self.workers):
+            pool.submit(_ready)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                threads = max(1, (os.cpu_count() or 1) // self.workers)
+                # Streamlit 서버 프로세스(스레드 다수)를 fork 하지 않도록 spawn 사용
+                self._pool = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.backend_name, self.model_name, self.backend_kwargs, threads),
+                )
+            return self._pool
@@ -0,0 +1,71 @@
+"""음성 인식 모델 백그라운드 로드.
+
+첫 화면이 모델 로드(whisper/torch import, 가중치 읽기)를 기다리지 않도록 모델은 별도 스레드에서 올립니다.
+화면은 `ready` / `error` 로 준비 상태를 보여 주고, 인식 작업은 `backend.transcribe()` 안에서
+로드가 끝날 때까지 기다립니다 (ASRBackend.load 는 스레드 간에 한 번만 로드).
+"""
+import importlib
+import threading
+import time
+
+
+class BackgroundModelLoader:
+    """백엔드 하나의 모델을 백그라운드 스레드에서 로드합니다 (프로세스당 하나)."""
+
+    def __init__(self, backend, preload_modules=()):
+        self.backend = backend
+        # 모델과 함께 미리 import 해 둘 무거운 모듈 (스크립트가 처음 쓸 때 기다리지 않도록)
+        self.preload_modules = tuple(preload_modules)
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self, background=True):
+        """로드를 시작합니다. `background=False` 이면 현재 스레드에서 끝까지 로드합니다."""
+        if self._thread is None and not self._done.is_set():
+            self.started_at = time.monotonic()
+            if background:
+                self._thread = threading.Thread(target=self._run, name="asr-model-loader", daemon=True)
+                self._thread.start()
+            else:
+                self._run()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set() and self.error is None
+
+    @property
+    def loading(self) -> bool:
+        return self.started_at is not None and not self._done.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """로드에 걸린 시간(초). 로드 중이면 지금까지 걸린 시간."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def wait(self, timeout=None):
+        """로드가 끝날 때까지 기다렸다가 백엔드를 반환합니다. 로드에 실패했으면 그 예외를 다시 던집니다."""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"음성 인식 모델 로드가 {timeout}초 안에 끝나지 않았습니다.")
+        if self.error is not None:
+            raise self.error
+        return self.backend
+
+    def _run(self):
+        try:
+            for name in self.preload_modules:
+                try:
+                    importlib.import_module(name)
+                except ImportError:
+                    pass  # 설치되지 않은 선택 모듈은 실제로 쓰는 곳에서 오류를 냄
+            self.backend.load()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = time.monotonic()
+            self._done.set()
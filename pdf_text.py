@@ -0,0 +1,150 @@
+"""PDF 텍스트 추출 (내용 해시 캐시 + 프로세스 풀 병렬 처리).
+
+같은 PDF(핵심 가치, 인재상 등)는 지원자가 바뀌어도 내용이 같으므로, 파일 내용의 sha256 을 키로
+추출한 텍스트를 보관해 다시 파싱하지 않습니다. 캐시에 없는 파일들은 몇 페이지씩 나눠
+프로세스 풀에서 동시에 추출합니다 (pdfplumber 파싱은 CPU 작업이라 스레드로는 빨라지지 않음).
+"""
+import hashlib
+import io
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _count_pages(data: bytes) -> int:
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_pages(data: bytes, start: int, end: int) -> list:
+    """작업자 프로세스에서 실행: [start, end) 페이지의 텍스트 목록을 반환합니다 (빈 페이지는 빈 문자열)."""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+class PdfResult:
+    """파일 하나의 추출 결과."""
+
+    def __init__(self, name, text="", error=None, cached=False):
+        self.name = name
+        self.text = text
+        self.error = error
+        self.cached = cached
+
+
+class PdfTextExtractor:
+    """여러 세션이 함께 쓰는 PDF 텍스트 추출기 (내용 해시 LRU 캐시 + 프로세스 풀)."""
+
+    def __init__(self, max_workers=4, max_entries=64, pages_per_task=4):
+        self.max_workers = max(1, int(max_workers))
+        self.max_entries = max_entries
+        self.pages_per_task = max(1, int(pages_per_task))
+        self._texts = OrderedDict()  # sha256 -> 추출한 텍스트
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def extract(self, files) -> list:
+        """(파일 이름, bytes) 목록의 텍스트를 추출해 같은 순서의 `PdfResult` 목록으로 반환합니다.
+
+        캐시에 없는 파일들의 페이지는 모두 한꺼번에 프로세스 풀에 넣어 병렬로 추출합니다.
+        추출에 실패한 파일은 캐시하지 않습니다.
+        """
+        results = [None] * len(files)
+        missing = OrderedDict()  # 해시 -> (이름, bytes, 이 파일을 요청한 위치들)
+        for i, (name, data) in enumerate(files):
+            key = content_hash(data)
+            text = self._get(key)
+            if text is not None:
+                results[i] = PdfResult(name, text, cached=True)
+            elif key in missing:
+                missing[key][2].append(i)
+            else:
+                missing[key] = (name, data, [i])
+
+        for key, (name, text, error) in self._extract_missing(missing).items():
+            if error is None:
+                self._put(key, text)
+            for i in missing[key][2]:
+                results[i] = PdfResult(files[i][0], text, error)
+        return results
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    # --- 내부 구현 ---
+
+    def _get(self, key):
+        with self._lock:
+            text = self._texts.get(key)
+            if text is not None:
+                self._texts.move_to_end(key)
+            return text
+
+    def _put(self, key, text):
+        with self._lock:
+            self._texts[key] = text
+            self._texts.move_to_end(key)
+            while len(self._texts) > self.max_entries:
+                self._texts.popitem(last=False)
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # Streamlit 서버 프로세스(스레드 다수)를 fork 하지 않도록 spawn 사용
+                self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _extract_missing(self, missing):
+        # 파일마다 페이지 수를 세어 pages_per_task 페이지씩 작업을 나눔
+        tasks = []  # (해시, 시작 페이지, 끝 페이지)
+        out = {}
+        for key, (name, data, _idx) in missing.items():
+            try:
+                pages = _count_pages(data)
+            except Exception as e:
+                out[key] = (name, "", e)
+                continue
+            tasks.extend((key, s, min(s + self.pages_per_task, pages)) for s in range(0, pages, self.pages_per_task))
+            if pages == 0:
+                out[key] = (name, "", None)
+
+        if len(tasks) <= 1:
+            # 작업이 하나뿐이면 프로세스를 거치지 않고 바로 처리
+            chunks = {}
+            for key, s, e in tasks:
+                try:
+                    chunks[(key, s)] = _extract_pages(missing[key][1], s, e)
+                except Exception as err:
+                    chunks[(key, s)] = err
+        else:
+            pool = self._get_pool()
+            futures = {(key, s): pool.submit(_extract_pages, missing[key][1], s, e) for key, s, e in tasks}
+            chunks = {}
+            for task_key, future in futures.items():
+                try:
+                    chunks[task_key] = future.result()
+                except Exception as err:
+                    chunks[task_key] = err
+
+        for key, (name, _data, _idx) in missing.items():
+            if key in out:
+                continue
+            parts = [(s, chunks[(k, s)]) for k, s, _e in tasks if k == key]
+            error = next((c for _s, c in parts if isinstance(c, Exception)), None)
+            if error is not None:
+                out[key] = (name, "", error)
+                continue
+            page_texts = [t for _s, chunk in sorted(parts, key=lambda p: p[0]) for t in chunk if t]
+            out[key] = (name, "\n\n".join(page_texts), None)
+        return out
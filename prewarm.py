@@ -0,0 +1,58 @@
+"""서버 시작 전 예열 (선택).
+
+컨테이너를 새로 띄운 직후에는 첫 접속이 무거운 모듈 import(.pyc 생성, 디스크 읽기)와
+모델 가중치 다운로드/읽기를 모두 기다리게 됩니다. 서버를 띄우기 전에 이 스크립트를 한 번 실행해 두면
+모델 파일은 캐시 폴더에, 모듈과 가중치 파일은 OS 페이지 캐시에 올라가 첫 접속의 백그라운드 로드가 빨라집니다.
+
+사용 예:
+    python prewarm.py && streamlit run app.py
+    ASR_BACKEND=faster-whisper ASR_MODEL=small python prewarm.py --skip-model
+"""
+import argparse
+import compileall
+import importlib
+import os
+import sys
+import time
+
+# app.py 와 recorder.py 가 쓰는 무거운 모듈 (설치되지 않은 것은 건너뜀)
+HEAVY_MODULES = ["numpy", "soundfile", "av", "streamlit", "streamlit_webrtc"]
+BACKEND_MODULES = {"whisper": ["torch", "whisper"], "faster-whisper": ["ctranslate2", "faster_whisper"]}
+
+
+def _timed(label, fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        print(f"  {label:<28} 실패: {e}")
+        return False
+    print(f"  {label:<28} {time.perf_counter() - start:6.2f}초")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skip-model", action="store_true", help="모델 가중치는 받거나 읽지 않음 (모듈만 예열)")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import config
+    from asr_backend import create_backend
+
+    print("앱 모듈 바이트코드 생성")
+    _timed("compileall", lambda: compileall.compile_dir(os.path.dirname(os.path.abspath(__file__)),
+                                                        maxlevels=0, quiet=1))
+    print("무거운 모듈 import")
+    for name in HEAVY_MODULES + BACKEND_MODULES.get(config.ASR_BACKEND, []):
+        _timed(name, lambda name=name: importlib.import_module(name))
+    ok = True
+    if not args.skip_model:
+        backend = create_backend()
+        print("음성 인식 모델 준비")
+        ok = _timed(backend.description, backend.load)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""질문 생성 프롬프트의 문서 토큰 예산 배분.
+
+네 문서(핵심 가치, 인재상, JD, 이력서)를 각각 글자 수로 자르는 대신, 실제 토큰 수를 세어
+프롬프트 전체 예산 안에 들어가도록 우선순위에 따라 나눠 줍니다.
+예산을 넘으면 우선순위가 낮은 회사 문서(핵심 가치 -> 인재상)부터 반복되는 머리말·꼬리말을 지우고 잘라 내며,
+이력서는 가장 나중에 줄입니다.
+
+토큰 수는 tiktoken 이 설치되어 있고 인코딩을 불러올 수 있으면 그것으로 세고,
+아니면 한글 음절 1개 = 1토큰, 그 밖의 글자 4개 = 1토큰으로 어림합니다 (보수적인 추정).
+"""
+import re
+
+# 예산이 부족할 때 남겨 두는 순서 (앞쪽일수록 중요, 뒤쪽부터 줄임)
+DEFAULT_PRIORITY = ("resume", "jd", "persona", "core")
+# 예산을 넘을 때 반복되는 머리말·꼬리말 줄을 지워도 되는 문서 (회사 문서만, 이력서는 제외)
+COMPANY_DOCUMENTS = ("core", "persona", "jd")
+
+_HANGUL = re.compile(r"[가-힣ㄱ-ㆎ]")
+
+
+class TokenCounter:
+    """텍스트 토큰 수 세기와 토큰 단위 자르기."""
+
+    def __init__(self, encoding_name="cl100k_base"):
+        self.encoding = None
+        try:
+            import tiktoken
+
+            self.encoding = tiktoken.get_encoding(encoding_name)
+        except Exception:
+            # 미설치 또는 인코딩 파일을 내려받을 수 없는 환경 (오프라인 등)
+            self.encoding = None
+
+    @property
+    def name(self) -> str:
+        return self.encoding.name if self.encoding is not None else "heuristic"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        hangul = len(_HANGUL.findall(text))
+        return hangul + (len(text) - hangul + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞에서부터 `max_tokens` 토큰까지만 남깁니다."""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            return text if len(tokens) <= max_tokens else self.encoding.decode(tokens[:max_tokens])
+        if self.count(text) <= max_tokens:
+            return text
+        # 어림 계산은 글자 길이에 대해 단조 증가하므로 이분 탐색
+        lo, hi = 0, len(text)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.count(text[:mid]) <= max_tokens:
+                lo = mid
+            else:
+                hi = mid - 1
+        return text[:lo]
+
+
+def compact_text(text: str, drop_repeated_lines=False) -> str:
+    """PDF 추출 텍스트의 군더더기를 줄입니다: 연속 공백/빈 줄 정리.
+
+    `drop_repeated_lines` 를 켜면 반복되는 머리말·꼬리말 줄도 지웁니다 (내용이 빠질 수 있으므로 예산을 넘을 때만).
+    """
+    lines = []
+    seen = {}
+    for line in text.splitlines():
+        line = re.sub(r"[ \t\u00a0]+", " ", line).strip()
+        if not line:
+            continue
+        # 페이지마다 반복되는 짧은 줄(머리말, 꼬리말, 회사명 등)은 처음 두 번까지만 남김
+        if drop_repeated_lines and len(line) <= 60:
+            seen[line] = seen.get(line, 0) + 1
+            if seen[line] > 2:
+                continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+class BudgetResult:
+    """배분 결과: 문서별 텍스트와 토큰 수(원본/배분 후)."""
+
+    def __init__(self, texts, original_tokens, tokens, truncated, counter_name):
+        self.texts = texts
+        self.original_tokens = original_tokens
+        self.tokens = tokens
+        self.truncated = truncated  # 예산 때문에 내용이 잘린 문서 이름 목록 (우선순위 낮은 것부터)
+        self.counter_name = counter_name
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens.values())
+
+
+def allocate(documents: dict, budget_tokens: int, priority=DEFAULT_PRIORITY, min_tokens=300,
+             counter: TokenCounter = None, compactable=COMPANY_DOCUMENTS) -> BudgetResult:
+    """문서들을 합쳐 `budget_tokens` 안에 들어가도록 줄입니다.
+
+    모든 문서의 공백/빈 줄을 먼저 정리하고, 그래도 넘치면 우선순위가 낮은 `compactable` 문서(회사 문서)부터
+    반복되는 머리말·꼬리말 줄을 지웁니다. 그래도 넘치면 우선순위가 낮은 문서부터 `min_tokens` 까지 줄이고,
+    모든 문서를 최소치로 줄여도 넘치면 우선순위가 높은 문서까지 더 줄입니다. 내용이 빠진 문서는 `truncated` 에 남깁니다.
+    """
+    counter = counter or TokenCounter()
+    original = {name: counter.count(text) for name, text in documents.items()}
+    texts = {name: compact_text(text) for name, text in documents.items()}
+    tokens = {name: counter.count(text) for name, text in texts.items()}
+
+    # 우선순위 목록에 없는 문서는 가장 먼저 줄임
+    order = [name for name in texts if name not in priority] + [n for n in reversed(priority) if n in texts]
+    truncated = []
+    for name in order:
+        if sum(tokens.values()) <= budget_tokens:
+            break
+        if name in compactable:
+            texts[name] = compact_text(texts[name], drop_repeated_lines=True)
+            count = counter.count(texts[name])
+            if count < tokens[name]:
+                tokens[name] = count
+                truncated.append(name)
+    for floor in (min_tokens, 0):
+        for name in order:
+            excess = sum(tokens.values()) - budget_tokens
+            if excess <= 0:
+                break
+            target = max(floor, tokens[name] - excess)
+            if target < tokens[name]:
+                texts[name] = counter.truncate(texts[name], target)
+                tokens[name] = counter.count(texts[name])
+                if name not in truncated:
+                    truncated.append(name)
+    return BudgetResult(texts, original, tokens, truncated, counter.name)
@@ -0,0 +1,73 @@
+"""Gemini 면접 질문 생성 프롬프트와 응답 처리.
+
+app(구글).py 화면과 일괄 생성(batch_questions.py)이 같은 프롬프트, 생성 설정, 캐시 키를 쓰도록 한곳에 모아 둡니다.
+"""
+
+QUESTION_PROMPT = """
+당신은 기업의 시니어 인사담당자이며, AI 면접 질문 자동 생성 시스템입니다.
+
+아래 4가지 문서를 제공합니다:
+1. 회사의 핵심 가치 (Core Values)
+2. 채용 인재상 (Ideal Persona)
+3. 직무 기술서 (Job Description)
+4. 지원자의 이력서 (Resume)
+
+당신의 역할은 위 4가지 문서의 내용을 모두 종합적으로 분석하여, 특히 이력서 내용을 기반으로 지원자가 회사의 **핵심 가치**, **인재상**, **직무 요건**에 얼마나 부합하는지 검증하기 위한 **경험 기반 면접 질문**을 생성하는 것입니다.
+
+---
+
+📌 질문 설계 지침:
+
+1. **경험 기반 질문**을 생성하세요. 반드시 지원자의 **이력서에 언급된 구체적인 과거 경험, 프로젝트, 활동, 경력 사항** 등을 기반으로 질문해야 합니다.
+2. 질문은 **핵심 가치**, **인재상**, **직무 요건** 중 하나 이상과 연관시켜, 지원자의 역량, 행동 방식, 가치관 등을 심층적으로 파악할 수 있도록 구성되어야 합니다.
+3. 이력서의 특정 문장, 경력 내용, 키워드 등을 활용하여 다른 문서들과 **교차 분석**한 결과로 도출된 통찰을 바탕으로 질문을 생성하세요.
+4. 질문은 명확하고 간결해야 하며, 지원자가 자신의 경험을 구체적으로 설명하도록 유도해야 합니다.
+5. 형식은 반드시 다음과 같아야 합니다. 각 질문과 질문 의도를 구분하여 명확하게 제시해주세요.
+
+각 질문은 반드시 아래 형식으로 출력해 주세요:
+===
+Q. [질문 내용]
+질문 의도: [이 질문을 통해 검증하려는 핵심 역량, 경험 또는 가치관]
+===
+
+요청된 질문 수: {num_questions}개
+
+---
+제공된 문서 내용:
+{documents_section}
+"""
+
+# 질문 생성 설정 (응답 캐시 키에도 포함됨)
+GENERATION_SETTINGS = dict(
+    temperature=0.7, # 창의성 조절 (0에 가까울수록 보수적)
+    max_output_tokens=2000 # 생성될 응답의 최대 토큰 수 (질문 수에 따라 조절)
+)
+
+
+def documents_section(resume_text, company_digest=None, core_text="", persona_text="", jd_text=""):
+    """프롬프트의 문서 부분과, 응답 캐시 키에 쓸 문서 목록을 반환합니다.
+
+    회사 프로필 요약이 있으면 세 회사 문서 대신 요약과 이력서만 넣습니다.
+    """
+    if company_digest:
+        section = (
+            "회사 프로필 (핵심 가치 / 인재상 / 직무 요건 요약):\n" + company_digest
+            + "\n\n이력서:\n" + resume_text
+        )
+        return section, [company_digest, resume_text]
+    section = (
+        "핵심 가치:\n" + core_text + "\n\n인재상:\n" + persona_text
+        + "\n\nJD:\n" + jd_text + "\n\n이력서:\n" + resume_text
+    )
+    return section, [core_text, persona_text, jd_text, resume_text]
+
+
+def build_question_prompt(num_questions, section) -> str:
+    return QUESTION_PROMPT.format(num_questions=num_questions, documents_section=section)
+
+
+def response_text(response) -> str:
+    """Gemini 응답에서 텍스트를 꺼냅니다. 차단 등으로 없으면 빈 문자열."""
+    if response and response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+        return response.candidates[0].content.parts[0].text or ""
+    return ""
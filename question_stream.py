@@ -0,0 +1,143 @@
+"""LLM 질문 생성 응답 파싱.
+
+응답은 아래 형식의 블록이 `===` 로 구분되어 이어집니다.
+
+    ===
+    Q. [질문 내용]
+    질문 의도: [검증하려는 역량]
+    ===
+
+`parse_questions` 는 완성된 응답 전체를, `QuestionStreamParser` 는 스트리밍으로 조각조각 도착하는
+응답을 처리합니다. 스트리밍 파서는 구분자(`===`)가 도착해 닫힌 블록부터 바로 질문으로 돌려주므로,
+첫 질문을 전체 생성이 끝나기 전에 화면에 보여줄 수 있습니다.
+"""
+import re
+import time
+
+DELIMITER = "==="
+_Q_PATTERN = re.compile(r"^[Qq][.:]\s*")  # 'Q.' 또는 'Q:' 등 대소문자 구분 없이 찾기
+INTENT_LABEL = "질문 의도:"
+
+
+def parse_question_block(block: str):
+    """블록 하나에서 {"question", "intent"} 를 뽑습니다. 질문 줄이 없으면 None."""
+    lines = block.strip().split("\n")
+    q_line = next((l for l in lines if _Q_PATTERN.search(l.strip())), "")
+    if not q_line:
+        return None
+    intent_line = next((l for l in lines if INTENT_LABEL in l), "")
+    return {
+        "question": _Q_PATTERN.sub("", q_line.strip()).strip(),
+        "intent": intent_line.replace(INTENT_LABEL, "").strip() if intent_line else "질문 의도 파싱 실패 또는 없음",
+    }
+
+
+def parse_questions(output: str) -> list:
+    """완성된 응답 전체를 질문 목록으로 바꿉니다."""
+    parser = QuestionStreamParser()
+    return parser.feed(output) + parser.close()
+
+
+class QuestionStreamParser:
+    """조각으로 도착하는 응답에서 닫힌 블록을 차례로 질문으로 바꾸는 파서.
+
+    조각 경계가 구분자나 줄 한가운데에 걸려도 되도록, 마지막 구분자 이후의 텍스트는
+    다음 조각이 올 때까지 버퍼에 남겨 둡니다.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self.text = ""  # 지금까지 받은 응답 원본
+        self.questions = []
+
+    def feed(self, chunk: str) -> list:
+        """조각을 더하고, 이번에 새로 완성된 질문 목록을 반환합니다."""
+        if not chunk:
+            return []
+        self.text += chunk
+        self._pending += chunk
+        *closed, self._pending = self._pending.split(DELIMITER)
+        return self._add(closed)
+
+    def close(self) -> list:
+        """응답이 끝났을 때, 구분자로 닫히지 않은 마지막 블록을 처리합니다."""
+        rest, self._pending = self._pending, ""
+        return self._add([rest])
+
+    def _add(self, blocks):
+        new = [q for q in (parse_question_block(b) for b in blocks) if q]
+        self.questions.extend(new)
+        return new
+
+
+def chunk_text(chunk) -> str:
+    """스트리밍 응답 조각에서 텍스트를 꺼냅니다 (차단 등으로 텍스트가 없으면 빈 문자열)."""
+    try:
+        candidate = chunk.candidates[0]
+        return "".join(part.text for part in candidate.content.parts if getattr(part, "text", None))
+    except (AttributeError, IndexError, TypeError):
+        return ""
+
+
+# --- 테스트/데모용 가짜 스트리밍 클라이언트 ---
+
+class _FakePart:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeContent:
+    def __init__(self, text):
+        self.parts = [_FakePart(text)]
+
+
+class _FakeCandidate:
+    def __init__(self, text):
+        self.content = _FakeContent(text)
+        self.finish_reason = "STOP"
+        self.safety_ratings = []
+
+
+class FakeChunk:
+    """`GenerateContentResponse` 조각과 같은 모양의 객체."""
+
+    def __init__(self, text):
+        self.text = text
+        self.candidates = [_FakeCandidate(text)]
+
+
+class FakeStreamingResponse:
+    """조각을 일정 간격으로 내보내는 가짜 스트리밍 응답."""
+
+    def __init__(self, text, chunk_chars, delay):
+        self._text = text
+        self._chunk_chars = max(1, chunk_chars)
+        self._delay = delay
+        self.prompt_feedback = None
+        self.candidates = [_FakeCandidate(text)]
+
+    def __iter__(self):
+        for i in range(0, len(self._text), self._chunk_chars):
+            if self._delay:
+                time.sleep(self._delay)
+            yield FakeChunk(self._text[i:i + self._chunk_chars])
+
+
+class FakeStreamingModel:
+    """`genai.GenerativeModel` 대신 쓰는 로컬 가짜 모델. 정해진 응답을 조각내어 돌려줍니다.
+
+    API 키나 네트워크 없이 스트리밍 화면과 파서를 확인할 때 사용합니다.
+    """
+
+    def __init__(self, response_text, chunk_chars=24, delay=0.05):
+        self.response_text = response_text
+        self.chunk_chars = chunk_chars
+        self.delay = delay
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        response = FakeStreamingResponse(self.response_text, self.chunk_chars, self.delay)
+        if stream:
+            return response
+        for _chunk in response:  # 비스트리밍 호출은 전체 생성 시간만큼 기다린 뒤 반환
+            pass
+        return response
@@ -0,0 +1,139 @@
+"""WebRTC 오디오 스트림 하나로 면접 전체를 녹음하는 오디오 프로세서.
+
+질문마다 WebRTC 연결을 따로 만들지 않고, 세션당 하나의 스트림을 계속 받아 링 버퍼에 쌓아 둡니다.
+답변은 녹음 시작/중지 시점의 샘플 오프셋(구간 표시)으로 구분하므로,
+질문 수와 관계없이 연결 수립, 수신 스레드, 프레임 버퍼가 세션당 하나로 유지됩니다.
+app.py 와 app(오픈).py 가 함께 사용합니다.
+"""
+import av
+import numpy as np
+from streamlit_webrtc import AudioProcessorBase
+
+import config
+from audio_assembly import frames_to_mono_int16
+from audio_buffer import PcmRingBuffer
+from audio_pipeline import WHISPER_SAMPLE_RATE
+from resampler import PolyphaseResampler, resample_int16
+from streaming_asr import StreamingTranscriber
+
+
+# 오디오 샘플을 수집할 전역 Recorder 클래스
+class GlobalRecorder(AudioProcessorBase):
+    def __init__(self):
+        # 프레임 객체를 보관하지 않고 mono int16 샘플만 링 버퍼에 기록 (세션당 메모리 상한 유지)
+        # 수신 즉시 16kHz 로 리샘플링해 두므로, 답변 구간을 자를 때는 이미 모델 입력 레이트임
+        self.sample_rate = WHISPER_SAMPLE_RATE
+        self.input_sample_rate = 0 # 첫 프레임 수신 시 결정 (WebRTC 레이트, 보통 48kHz)
+        self.resampler = None
+        self.buffer = None
+        # self.is_recording_answer = False # 이제 이 상태는 Streamlit 세션 상태에서 관리
+        self.current_segment_start_idx = -1 # 현재 녹음 중인 답변의 시작 샘플 오프셋
+        # WebRTC 스트림 시작 시점의 샘플 오프셋 (오디오 전처리 시 초반 노이즈/버퍼링 구간 무시 등에 활용될 수 있음)
+        self.stream_start_offset = -1
+        self.streaming = None # 녹음 중인 답변을 점진적으로 인식하는 StreamingTranscriber
+        self.streaming_error = None # 마지막으로 끝낸 점진적 인식에서 실패한 청크의 예외 (없으면 None)
+
+    @property
+    def total_samples(self):
+        return self.buffer.total_samples if self.buffer else 0
+
+    def _ensure_buffer(self, frame):
+        # 스트림 시작 시점 기록 (프레임이 처음 들어올 때)
+        if self.buffer is None:
+            self.input_sample_rate = frame.sample_rate
+            if self.input_sample_rate != self.sample_rate:
+                self.resampler = PolyphaseResampler(self.input_sample_rate, self.sample_rate)
+            self.buffer = PcmRingBuffer(
+                initial_capacity=int(self.sample_rate * config.AUDIO_INITIAL_BUFFER_SECONDS),
+                max_memory_samples=int(self.sample_rate * config.AUDIO_RETENTION_SECONDS),
+                spill_dir=config.AUDIO_SPILL_DIR,
+            )
+            self.stream_start_offset = 0
+
+    def _append(self, samples):
+        # 필터 상태를 유지하는 스트리밍 리샘플러로 변환하므로 프레임 경계에서 끊김이 없음
+        if self.resampler is not None:
+            samples = resample_int16(samples, self.resampler)
+        self.buffer.append(samples)
+
+    def recv(self, frame: av.AudioFrame) -> av.AudioFrame:
+        self._ensure_buffer(frame)
+        self._append(frames_to_mono_int16([frame]))
+
+        # 오디오 프레임을 가공 없이 그대로 반환 (여기서는 가공 필요 없음)
+        return frame
+
+    async def recv_queued(self, frames):
+        # async_processing=True 일 때 쌓인 프레임을 한 번에 받음: 한 번에 조립하여 버퍼에 한 번만 기록
+        if frames:
+            self._ensure_buffer(frames[0])
+            self._append(frames_to_mono_int16(frames))
+        return frames
+
+    def begin_segment(self):
+        """현재 시점부터 새 답변 구간을 시작하고 시작 오프셋을 반환합니다."""
+        self.current_segment_start_idx = self.total_samples
+        return self.current_segment_start_idx
+
+    def end_segment(self, min_seconds=0.2):
+        """녹음 중인 답변 구간을 끝내고 (시작, 끝) 오프셋을 반환합니다. 너무 짧으면 None.
+
+        확정된 구간은 보존 상한을 넘으면 디스크로 옮겨질 수 있도록 표시합니다.
+        """
+        start_idx, end_idx = self.current_segment_start_idx, self.total_samples
+        self.current_segment_start_idx = -1
+        if start_idx == -1 or end_idx <= start_idx + int(self.sample_rate * min_seconds):
+            return None
+        self.buffer.mark_segmented(end_idx)
+        return start_idx, end_idx
+
+    def read_segment(self, start_idx, end_idx):
+        """[start_idx, end_idx) 샘플 구간을 mono int16 배열로 반환합니다."""
+        if self.buffer is None:
+            return np.zeros(0, dtype=np.int16)
+        return self.buffer.read(start_idx, end_idx)
+
+    def start_streaming(self, transcribe_fn):
+        """현재 녹음 중인 답변 구간의 점진적 음성 인식을 시작합니다."""
+        self.cancel_streaming()
+        self.streaming = StreamingTranscriber(
+            self.read_segment,
+            lambda: self.total_samples,
+            self.sample_rate,
+            transcribe_fn,
+            self.current_segment_start_idx,
+            min_silence_ms=config.STREAMING_MIN_SILENCE_MS,
+            min_chunk_seconds=config.STREAMING_MIN_CHUNK_SECONDS,
+            max_chunk_seconds=config.STREAMING_MAX_CHUNK_SECONDS,
+        )
+
+    def finish_streaming(self, end_idx, timeout=None):
+        """남은 구간까지 인식을 마치고 전체 텍스트를 반환합니다.
+
+        진행 중인 인식이 없거나, 한 청크라도 인식에 실패했으면 None 을 반환합니다
+        (일부가 빠진 답변을 최종 답변으로 쓰지 않고 전체 음성 인식으로 다시 하도록). 실패 원인은 `streaming_error` 에 남깁니다.
+        `timeout` 초 안에 끝나지 않으면 인식을 취소하고 None 을 반환합니다 (`streaming_error` 는 TimeoutError).
+        """
+        self.streaming_error = None
+        if self.streaming is None:
+            return None
+        streaming, self.streaming = self.streaming, None
+        text = streaming.finish(end_idx, timeout)
+        if streaming.running:
+            streaming.cancel()
+            self.streaming_error = TimeoutError(f"마지막 구간 인식이 {timeout}초 안에 끝나지 않았습니다.")
+            return None
+        if streaming.error is not None:
+            self.streaming_error = streaming.error
+            return None
+        return text
+
+    def cancel_streaming(self):
+        if self.streaming is not None:
+            self.streaming.cancel()
+            self.streaming = None
+
+    def on_ended(self):
+        self.cancel_streaming()
+        if self.buffer is not None:
+            self.buffer.close()
@@ -0,0 +1,117 @@
+"""정수비 polyphase FIR 리샘플러.
+
+원본/목표 샘플링 레이트의 비를 기약분수 up/down 으로 나타내 (48kHz -> 16kHz 는 1/3)
+Kaiser 창 sinc 저역 통과 필터를 위상별로 나눠 필요한 출력 샘플만 계산합니다.
+`PolyphaseResampler` 는 필터 상태를 유지하므로 프레임 단위로 나눠 넣어도 한 번에 변환한 결과와 같고,
+`resample` 은 배열 하나를 한 번에 변환합니다. NumPy 외의 의존성은 없습니다.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 한 번에 계산할 출력 샘플 수 (임시 배열 크기 제한)
+_BLOCK = 16384
+
+
+def design_lowpass(up: int, down: int, zero_crossings: int = 24, rolloff: float = 0.95,
+                   beta: float = 8.6) -> np.ndarray:
+    """업샘플링된 레이트 기준의 Kaiser 창 sinc 저역 통과 필터 계수를 반환합니다 (이득 up 포함)."""
+    max_rate = max(up, down)
+    cutoff = rolloff / max_rate  # 업샘플링 레이트의 나이퀴스트 대비 차단 주파수
+    half = zero_crossings * max_rate
+    n = np.arange(-half, half + 1)
+    h = cutoff * np.sinc(cutoff * n) * np.kaiser(2 * half + 1, beta)
+    return (h * up).astype(np.float32)
+
+
+class PolyphaseResampler:
+    """상태를 유지하는 스트리밍 리샘플러.
+
+    `process` 로 입력을 조금씩 넣으면 지금까지 계산할 수 있는 출력을 반환하고,
+    입력이 끝나면 `flush` 로 남은 출력을 받습니다. 선형 위상 필터의 지연은 보정되어
+    출력 샘플 n 은 입력 시간 n * down / up 에 맞춰집니다.
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int, zero_crossings: int = 24):
+        g = math.gcd(int(orig_sr), int(target_sr))
+        self.orig_sr = int(orig_sr)
+        self.target_sr = int(target_sr)
+        self.up = self.target_sr // g
+        self.down = self.orig_sr // g
+        h = design_lowpass(self.up, self.down, zero_crossings)
+        self._delay = (len(h) - 1) // 2  # 업샘플링 영역에서의 필터 지연
+        self._taps = math.ceil(len(h) / self.up)
+        # 위상 p 의 계수 h[p + t*up] (t = 0..taps-1) 를 뒤집어, 입력 창 x[j-taps+1 .. j] 와 바로 내적
+        padded = np.zeros(self._taps * self.up, dtype=np.float32)
+        padded[:len(h)] = h
+        self._phases = np.ascontiguousarray(padded.reshape(self._taps, self.up).T[:, ::-1])
+        self.reset()
+
+    def reset(self) -> None:
+        """필터 상태를 비웁니다 (새 스트림 시작)."""
+        self._buf = np.zeros(self._taps - 1, dtype=np.float32)
+        self._buf_start = -(self._taps - 1)  # _buf[0] 의 입력 절대 인덱스 (0 이전은 0으로 채움)
+        self._n_in = 0
+        self._n_out = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """입력 샘플을 더하고, 새로 계산할 수 있게 된 출력 샘플을 float32 로 반환합니다."""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        if samples.size:
+            self._buf = np.concatenate([self._buf, samples])
+            self._n_in += samples.size
+        # 출력 n 은 입력 인덱스 (n*down + delay) // up 까지 필요
+        ready = (self._n_in * self.up - self._delay + self.down - 1) // self.down
+        return self._emit(max(ready, self._n_out))
+
+    def flush(self) -> np.ndarray:
+        """입력이 끝났을 때 남은 출력을 반환하고 상태를 비웁니다."""
+        total = (self._n_in * self.up + self.down - 1) // self.down
+        if total > self._n_out:
+            need = ((total - 1) * self.down + self._delay) // self.up + 1
+            if need > self._n_in:
+                self._buf = np.concatenate([self._buf, np.zeros(need - self._n_in, dtype=np.float32)])
+        out = self._emit(total)
+        self.reset()
+        return out
+
+    def _emit(self, end: int) -> np.ndarray:
+        start = self._n_out
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        windows = sliding_window_view(self._buf, self._taps)
+        out = np.empty(end - start, dtype=np.float32)
+        for block in range(start, end, _BLOCK):
+            n = np.arange(block, min(block + _BLOCK, end))
+            m = n * self.down + self._delay
+            rows = m // self.up - self._taps + 1 - self._buf_start
+            phase = m % self.up
+            dst = out[block - start:block - start + len(n)]
+            if self.up == 1:
+                dst[:] = windows[rows] @ self._phases[0]
+            else:
+                # 출력마다 위상이 다르므로 입력 창과 위상별 계수를 함께 모아 행 단위 내적
+                np.einsum("nk,nk->n", windows[rows], self._phases[phase], out=dst)
+        self._n_out = end
+        # 다음 출력에 필요 없는 앞부분 입력은 버림
+        keep_from = (end * self.down + self._delay) // self.up - self._taps + 1 - self._buf_start
+        if keep_from > 0:
+            self._buf = self._buf[keep_from:]
+            self._buf_start += keep_from
+        return out
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """배열 하나를 리샘플링합니다. 출력 길이는 ceil(len * target_sr / orig_sr) 입니다."""
+    audio = np.asarray(audio, dtype=np.float32)
+    if orig_sr == target_sr:
+        return audio
+    r = PolyphaseResampler(orig_sr, target_sr)
+    return np.concatenate([r.process(audio), r.flush()])
+
+
+def resample_int16(samples: np.ndarray, resampler: PolyphaseResampler) -> np.ndarray:
+    """int16 샘플을 스트리밍 리샘플러에 넣고 출력을 int16 으로 반올림해 반환합니다."""
+    out = resampler.process(samples)
+    return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
@@ -0,0 +1,198 @@
+"""면접 결과 내보내기 (CSV, XLSX, Parquet).
+
+현재 면접 결과는 다운로드 버튼을 누를 때만 파일로 만들고, 내용 해시가 같으면 만들어 둔 바이트를 재사용합니다.
+저장된 여러 면접을 한 파일로 내보낼 때는 기록 저장소에서 행을 조금씩 읽어 임시 파일에 바로 쓰므로,
+파일을 만드는 동안 기록 전체(행 dict 목록, 워크북/테이블 객체)를 메모리에 올리지 않습니다.
+다만 Streamlit 다운로드 버튼은 바이트를 받으므로 `export_history_bytes` 는 완성된 파일 내용을 한 번 읽어 돌려줍니다.
+Parquet 은 pyarrow 가 설치되어 있을 때만 EXPORT_FORMATS 에 들어갑니다.
+"""
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+# 형식 -> (확장자, MIME 타입)
+EXPORT_FORMATS = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+}
+if importlib.util.find_spec("pyarrow") is not None:
+    EXPORT_FORMATS["parquet"] = ("parquet", "application/vnd.apache.parquet")
+
+# 여러 면접 내보내기의 열 순서와, 문자열이 아닌 열의 형식 (Parquet 스키마)
+HISTORY_COLUMNS = ["기록ID", "면접일", "면접관", "부서", "지원자", "질문번호", "질문", "지원자 답변", "면접관 메모"]
+HISTORY_COLUMN_TYPES = {"기록ID": "int", "질문번호": "int"}
+
+
+def content_hash(rows, fmt, sheet_name="") -> str:
+    """결과 행 목록 + 형식 + 시트 이름의 해시."""
+    payload = json.dumps([rows, fmt, sheet_name], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _excel_sheet_name(name):
+    # Excel 시트 이름은 31자까지, 일부 문자는 쓸 수 없음
+    for ch in '[]:*?/\\':
+        name = name.replace(ch, "_")
+    return name[:31] or "Sheet1"
+
+
+def export_rows(rows, fmt, sheet_name="면접 결과") -> bytes:
+    """결과 dict 목록을 지정한 형식의 파일 바이트로 만듭니다."""
+    columns = list(rows[0].keys()) if rows else []
+    buf = io.BytesIO()
+    _write_stream(iter(rows), columns, fmt, buf, sheet_name, _infer_column_types(rows, columns))
+    return buf.getvalue()
+
+
+class ExportCache:
+    """내용 해시별로 만들어 둔 내보내기 바이트를 보관하는 작은 LRU (여러 세션 공유)."""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, rows, fmt, sheet_name="면접 결과") -> bytes:
+        key = content_hash(rows, fmt, sheet_name)
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+                return data
+        data = export_rows(rows, fmt, sheet_name)
+        with self._lock:
+            self._items[key] = data
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+        return data
+
+
+def iter_history_rows(store, **filters):
+    """기록 저장소에서 검색 조건에 맞는 면접을 질문 한 줄씩의 dict 로 흘려 보냅니다."""
+    for interview in store.iter_interviews(**filters):
+        for record in interview["records"]:
+            yield {
+                "기록ID": interview["id"],
+                "면접일": interview["interview_date"],
+                "면접관": interview["interviewer"],
+                "부서": interview["department"],
+                "지원자": interview["candidate"],
+                "질문번호": record.get("질문번호"),
+                "질문": record.get("질문", ""),
+                "지원자 답변": record.get("지원자 답변", ""),
+                "면접관 메모": record.get("면접관 메모", ""),
+            }
+
+
+def export_history(store, fmt, path=None, **filters) -> str:
+    """조건에 맞는 저장된 면접 전체를 파일 하나로 씁니다. 쓴 파일 경로를 반환합니다.
+
+    `path` 를 주지 않으면 임시 파일에 쓰며, 다 쓴 뒤 지우는 것은 호출한 쪽의 몫입니다.
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix="." + EXPORT_FORMATS[fmt][0], prefix="interview_history_")
+        os.close(fd)
+    with open(path, "wb") as f:
+        _write_stream(iter_history_rows(store, **filters), HISTORY_COLUMNS, fmt, f, "면접 기록", HISTORY_COLUMN_TYPES)
+    return path
+
+
+def export_history_bytes(store, fmt, **filters) -> bytes:
+    """export_history 결과를 바이트로 반환합니다 (다운로드 버튼용, 임시 파일은 지움).
+
+    파일은 행을 조금씩 읽어 만들지만, 반환값은 완성된 파일 전체입니다.
+    """
+    path = export_history(store, fmt, **filters)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    finally:
+        os.remove(path)
+
+
+# --- 형식별 스트리밍 기록 ---
+
+def _infer_column_types(rows, columns):
+    """메모리에 있는 행 전체를 보고 열 형식을 정합니다 (None 이 아닌 값이 모두 정수/bool 인 열만, 나머지는 문자열)."""
+    types = {}
+    for name in columns:
+        values = [row.get(name) for row in rows if row.get(name) is not None]
+        if values and all(isinstance(v, bool) for v in values):
+            types[name] = "bool"
+        elif values and all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            types[name] = "int"
+    return types
+
+
+def _write_stream(rows, columns, fmt, out, sheet_name, column_types=None, batch_rows=1000):
+    if fmt == "csv":
+        _write_csv(rows, columns, out)
+    elif fmt == "xlsx":
+        _write_xlsx(rows, columns, out, sheet_name)
+    elif fmt == "parquet":
+        _write_parquet(rows, columns, out, column_types or {}, batch_rows)
+    else:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {fmt}")
+
+
+def _write_csv(rows, columns, out):
+    # Excel 에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙임
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+    writer = csv.DictWriter(text, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+    text.flush()
+    text.detach()  # out 을 닫지 않고 래퍼만 떼어냄
+
+
+def _write_xlsx(rows, columns, out, sheet_name):
+    import xlsxwriter
+
+    # constant_memory: 한 행씩 디스크에 써 나가므로 행 수와 관계없이 메모리 사용이 일정함
+    workbook = xlsxwriter.Workbook(out, {"constant_memory": True, "in_memory": False})
+    sheet = workbook.add_worksheet(_excel_sheet_name(sheet_name))
+    header = workbook.add_format({"bold": True})
+    for col, name in enumerate(columns):
+        sheet.write(0, col, name, header)
+    for r, row in enumerate(rows, start=1):
+        for col, name in enumerate(columns):
+            value = row.get(name)
+            if value is not None:
+                sheet.write(r, col, value)
+    workbook.close()
+
+
+def _write_parquet(rows, columns, out, column_types, batch_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # 스키마는 첫 행의 값이 아니라 열 형식으로 미리 정함 (None 이 섞여도 배치마다 같은 스키마)
+    arrow_types = {"int": pa.int64(), "bool": pa.bool_()}
+    schema = pa.schema([(name, arrow_types.get(column_types.get(name), pa.string())) for name in columns])
+    writer = pq.ParquetWriter(out, schema)
+    batch = []
+    for row in rows:
+        batch.append({name: _parquet_value(row.get(name), column_types.get(name)) for name in columns})
+        if len(batch) >= batch_rows:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))  # 배치마다 row group 하나
+            batch.clear()
+    if batch:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer.close()
+
+
+def _parquet_value(value, kind):
+    if value is None:
+        return None
+    if kind == "int":
+        return int(value)
+    if kind == "bool":
+        return bool(value)
+    return str(value)
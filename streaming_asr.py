@@ -0,0 +1,101 @@
+"""답변 녹음 중 점진적 음성 인식.
+
+녹음 중인 답변 구간을 VAD로 청크 단위로 잘라, 청크가 닫히는 즉시 백그라운드 스레드에서 인식합니다.
+녹음을 중지하면 마지막으로 닫히지 않은 몇 초만 인식하면 되므로 대기 시간이 거의 없어집니다.
+"""
+import threading
+
+import vad
+from audio_pipeline import prepare_whisper_input
+
+
+class StreamingTranscriber:
+    """녹음 중인 답변 하나를 청크 단위로 인식하는 백그라운드 작업자.
+
+    `read_fn(start, end)` 는 절대 샘플 오프셋 구간을 mono int16 으로, `total_fn()` 은 현재까지
+    기록된 샘플 수를 반환해야 합니다. `transcribe_fn(audio)` 는 16kHz float32 배열을 받아 텍스트를 반환합니다.
+    """
+
+    def __init__(self, read_fn, total_fn, sample_rate, transcribe_fn, start_offset,
+                 poll_interval=0.5, min_silence_ms=600, min_chunk_seconds=2.0, max_chunk_seconds=25.0):
+        self._read = read_fn
+        self._total = total_fn
+        self._sample_rate = sample_rate
+        self._transcribe_fn = transcribe_fn
+        self._poll_interval = poll_interval
+        self._chunk_kwargs = dict(
+            min_silence_ms=min_silence_ms,
+            min_chunk_seconds=min_chunk_seconds,
+            max_chunk_seconds=max_chunk_seconds,
+        )
+        self._chunk_start = start_offset
+        self._end = None
+        self._cancelled = False
+        self._texts = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="streaming-asr", daemon=True)
+        self._thread.start()
+
+    @property
+    def text(self) -> str:
+        """지금까지 인식된 부분 텍스트."""
+        with self._lock:
+            return " ".join(self._texts)
+
+    @property
+    def pending_seconds(self) -> float:
+        """아직 인식되지 않은 오디오 길이(초)."""
+        end = self._end if self._end is not None else self._total()
+        return max(0, end - self._chunk_start) / self._sample_rate
+
+    @property
+    def running(self) -> bool:
+        """인식 스레드가 아직 도는 중인지 (finish 가 시간 안에 끝나지 않았는지 확인용)."""
+        return self._thread.is_alive()
+
+    def finish(self, end_offset, timeout=None) -> str:
+        """녹음 종료 오프셋을 알리고, 남은 구간까지 인식이 끝나면 전체 텍스트를 반환합니다.
+
+        `timeout` 초 안에 끝나지 않으면 그때까지의 텍스트를 반환하며, `running` 이 True 로 남습니다.
+        """
+        self._end = end_offset
+        self._wake.set()
+        self._thread.join(timeout)
+        return self.text
+
+    def cancel(self) -> None:
+        """인식을 중단합니다. 진행 중인 청크 하나는 끝까지 처리될 수 있습니다."""
+        self._cancelled = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._cancelled:
+            end = self._end
+            limit = end if end is not None else self._total()
+            if end is not None and self._chunk_start >= end:
+                break
+            samples = self._read(self._chunk_start, limit)
+            boundary = vad.find_chunk_boundary(samples, self._sample_rate, **self._chunk_kwargs)
+            if boundary is None or boundary[0] >= len(samples):
+                if end is None:
+                    self._wake.wait(self._poll_interval)
+                    self._wake.clear()
+                    continue
+                # 녹음이 끝났으면 남은 꼬리 구간 전체를 인식
+                boundary = (len(samples), bool(vad.speech_mask(samples, self._sample_rate).any()))
+            cut, has_speech = boundary
+            if has_speech:
+                self._transcribe(samples[:cut])
+            self._chunk_start += cut
+
+    def _transcribe(self, samples):
+        try:
+            text = self._transcribe_fn(prepare_whisper_input(samples, self._sample_rate))
+        except Exception as e:
+            self.error = e
+            return
+        if text:
+            with self._lock:
+                self._texts.append(text.strip())
@@ -0,0 +1,124 @@
+"""음성 인식 결과 캐시 (오디오 내용 해시 기준).
+
+같은 답변 구간의 음성 인식을 다시 누르거나, 바뀌지 않은 오디오를 다시 인식할 때 Whisper 디코딩을 반복하지 않도록
+구간(segment) 단위 결과를 타임스탬프와 함께 보관합니다.
+키는 준비된 16kHz float32 샘플의 해시 + 모델 + 디코딩 옵션(language 등)이며,
+전체 크기가 예산을 넘으면 가장 오래 쓰이지 않은 항목부터 버립니다.
+같은 키의 인식이 진행 중이면 두 번째 요청은 새로 인식하지 않고 그 결과를 기다립니다.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+
+# 구간 하나의 대략적인 고정 크기 (dict, 시작/끝 float)
+_SEGMENT_OVERHEAD = 200
+
+
+def make_key(audio, model, options=None) -> str:
+    """16kHz float32 샘플 + 모델 + 디코딩 옵션으로 캐시 키를 만듭니다."""
+    h = hashlib.sha256()
+    h.update(memoryview(np.ascontiguousarray(audio, dtype=np.float32)).cast("B"))
+    h.update(json.dumps({"model": model, "options": options or {}}, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _segments_size(segments) -> int:
+    return sum(_SEGMENT_OVERHEAD + len(seg.get("text", "").encode("utf-8")) for seg in segments)
+
+
+class TranscriptionCache:
+    """여러 세션이 함께 쓰는 크기 제한 LRU 캐시 (값은 구간 목록)."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # key -> (구간 목록, 크기)
+        self._pending = {}  # key -> Future (인식 중)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        """보관된 구간 목록(사본)을 반환합니다. 없으면 None."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return [dict(seg) for seg in item[0]]
+
+    def put(self, key, segments) -> None:
+        segments = [dict(seg) for seg in segments]
+        size = _segments_size(segments)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            if size > self.max_bytes:
+                return  # 예산보다 큰 결과는 보관하지 않음
+            self._items[key] = (segments, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._items.popitem(last=False)
+                self._size -= evicted
+
+    def get_or_transcribe(self, key, transcribe):
+        """캐시에 있으면 그 결과를, 없으면 `transcribe()` 로 인식해 보관한 뒤 반환합니다."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return [dict(seg) for seg in item[0]]
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = self._pending[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if not owner:
+            return [dict(seg) for seg in future.result()]
+        try:
+            segments = transcribe()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        self.put(key, segments)
+        future.set_result(segments)
+        return segments
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+class CachedTranscriber:
+    """`transcribe(audio, **options)` 앞에 캐시를 둔 인식기 (backend, DynamicBatcher 등을 감쌈)."""
+
+    def __init__(self, transcriber, cache, model):
+        self.transcriber = transcriber
+        self.cache = cache
+        self.model = model
+
+    def transcribe(self, audio, **options) -> list:
+        if isinstance(audio, str):
+            return self.transcriber.transcribe(audio, **options)  # 파일 경로는 내용이 바뀔 수 있어 보관하지 않음
+        key = make_key(audio, self.model, options)
+        return self.cache.get_or_transcribe(key, lambda: self.transcriber.transcribe(audio, **options))
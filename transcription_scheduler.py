@@ -0,0 +1,200 @@
+"""프로세스 단위 음성 인식 작업 스케줄러.
+
+Streamlit 스크립트 스레드에서 모델을 직접 호출하지 않고, 작업을 큐에 넣은 뒤 작업 ID 로 상태를 확인합니다.
+고정된 수의 작업자 스레드가 세션별 큐를 돌아가며(round-robin) 처리하므로,
+한 세션이 작업을 많이 넣어도 다른 면접의 작업이 뒤로 밀리지 않습니다.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(RuntimeError):
+    """세션당 대기 작업 수 제한을 넘었을 때 발생합니다."""
+
+
+class JobCancelledError(RuntimeError):
+    """기다리던 작업이 취소되었을 때 발생합니다."""
+
+
+class Job:
+    """스케줄러에 제출된 작업 하나."""
+
+    def __init__(self, session_id, fn, args, kwargs):
+        self.id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def wait(self, timeout=None):
+        """작업이 끝날 때까지 기다린 뒤 결과를 반환합니다.
+
+        `timeout` 초 안에 끝나지 않으면 TimeoutError, 취소되었으면 JobCancelledError 를 던지고,
+        실패했으면 작업의 예외를 다시 던집니다.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"음성 인식 작업이 {timeout}초 안에 끝나지 않았습니다.")
+        if self.status == CANCELLED:
+            raise JobCancelledError("음성 인식 작업이 취소되었습니다.")
+        if self.status == FAILED:
+            raise self.error
+        return self.result
+
+
+class TranscriptionScheduler:
+    """제한된 작업자 풀과 세션별 공정 큐를 가진 작업 스케줄러."""
+
+    def __init__(self, max_workers=1, max_pending_per_session=8, keep_finished_seconds=600):
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending_per_session = max_pending_per_session
+        self.keep_finished_seconds = keep_finished_seconds
+        self._jobs = {}
+        self._queues = OrderedDict()  # session_id -> deque[Job], 순서대로 돌아가며 처리
+        self._cond = threading.Condition()
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"transcribe-worker-{i}", daemon=True)
+            for i in range(self.max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, session_id, fn, *args, **kwargs) -> str:
+        """작업을 큐에 넣고 작업 ID 를 반환합니다."""
+        return self._submit(session_id, fn, args, kwargs).id
+
+    def run(self, session_id, fn, *args, timeout=None, **kwargs):
+        """작업을 제출하고 끝날 때까지 기다려 결과를 반환합니다 (백그라운드 스레드용).
+
+        `timeout` 초 안에 끝나지 않으면 작업을 취소하고 TimeoutError 를 던집니다.
+        """
+        job = self._submit(session_id, fn, args, kwargs)
+        try:
+            return job.wait(timeout)
+        except TimeoutError:
+            self.cancel(job.id)
+            raise
+
+    def get(self, job_id):
+        """작업 객체를 반환합니다. 없거나 정리된 작업이면 None."""
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def forget(self, job_id) -> None:
+        """끝난 작업을 목록에서 지웁니다."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def cancel(self, job_id) -> bool:
+        """작업을 취소합니다. 대기 중이면 즉시 취소되고, 실행 중이면 결과를 버립니다."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.cancel_requested = True
+            if job.status == QUEUED:
+                self._queues.get(job.session_id, deque()).remove(job)
+                self._finish(job, CANCELLED)
+            return True
+
+    def pending_count(self, session_id=None) -> int:
+        """대기 중인 작업 수 (session_id 를 주면 해당 세션만)."""
+        with self._cond:
+            if session_id is not None:
+                return len(self._queues.get(session_id, ()))
+            return sum(len(q) for q in self._queues.values())
+
+    def queue_position(self, job_id) -> int:
+        """대기 중인 작업이 몇 번째로 처리될지 대략적으로 반환합니다 (0이면 다음 차례). 대기 중이 아니면 -1."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return -1
+            own = self._queues[job.session_id].index(job)
+            # round-robin 이므로 다른 세션마다 최대 own+1 개가 먼저 처리됨
+            others = sum(min(len(q), own + 1) for sid, q in self._queues.items() if sid != job.session_id)
+            return own + others
+
+    # --- 내부 구현 ---
+
+    def _submit(self, session_id, fn, args, kwargs):
+        with self._cond:
+            self._prune()
+            queue = self._queues.setdefault(session_id, deque())
+            if len(queue) >= self.max_pending_per_session:
+                raise QueueFullError(f"대기 중인 음성 인식 작업이 너무 많습니다 (최대 {self.max_pending_per_session}개).")
+            job = Job(session_id, fn, args, kwargs)
+            self._jobs[job.id] = job
+            queue.append(job)
+            self._cond.notify()
+            return job
+
+    def _next_job(self):
+        # 큐가 비어 있지 않은 첫 세션에서 하나를 꺼내고, 그 세션을 맨 뒤로 보냄
+        for session_id in list(self._queues):
+            queue = self._queues[session_id]
+            if not queue:
+                del self._queues[session_id]
+                continue
+            job = queue.popleft()
+            self._queues.move_to_end(session_id)
+            if not queue:
+                del self._queues[session_id]
+            return job
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    job = self._next_job()
+                job.status = RUNNING
+                job.started_at = time.time()
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except Exception as e:
+                with self._cond:
+                    job.error = e
+                    self._finish(job, CANCELLED if job.cancel_requested else FAILED)
+                continue
+            with self._cond:
+                if job.cancel_requested:
+                    self._finish(job, CANCELLED)
+                else:
+                    job.result = result
+                    self._finish(job, DONE)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        job._done.set()
+
+    def _prune(self):
+        # 오래전에 끝난 작업 정리 (세션이 결과를 가져가지 않은 경우 대비)
+        cutoff = time.time() - self.keep_finished_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.finished and j.finished_at < cutoff]:
+            del self._jobs[job_id]
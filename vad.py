@@ -0,0 +1,219 @@
+"""에너지 기반 음성 구간 검출(VAD).
+
+mono 샘플(int16 또는 -1~1 범위 float)을 짧은 프레임으로 나눠 RMS 에너지로 음성/무음을 구분합니다.
+"""
+import threading
+
+import numpy as np
+
+FRAME_MS = 30
+
+
+def frame_rms_db(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """프레임별 RMS 에너지(dBFS)를 반환합니다. 마지막의 불완전한 프레임은 버립니다."""
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame_len
+    if count == 0:
+        return np.zeros(0, dtype=np.float32)
+    scale = 1.0 if samples.dtype.kind == "f" else 32768.0
+    frames = samples[:count * frame_len].astype(np.float32).reshape(count, frame_len) / scale
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return 20.0 * np.log10(rms + 1e-10)
+
+
+def speech_mask(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS, margin_db: float = 10.0) -> np.ndarray:
+    """프레임별 음성 여부(bool 배열)를 반환합니다.
+
+    배경 소음 수준(하위 10% 에너지)보다 `margin_db` 이상 크고, 절대 기준(-50 dBFS)을 넘는 프레임을 음성으로 봅니다.
+    """
+    db = frame_rms_db(samples, sample_rate, frame_ms)
+    if db.size == 0:
+        return np.zeros(0, dtype=bool)
+    noise_floor = np.percentile(db, 10)
+    return db > max(noise_floor + margin_db, -50.0)
+
+
+def silence_runs(mask: np.ndarray):
+    """무음 프레임 연속 구간을 (시작 프레임, 끝 프레임) 배열로 반환합니다."""
+    silent = np.concatenate([[False], ~mask, [False]])
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    return edges.reshape(-1, 2)
+
+
+def find_chunk_boundary(samples, sample_rate, min_silence_ms=600, min_chunk_seconds=2.0,
+                        max_chunk_seconds=25.0, frame_ms=FRAME_MS):
+    """스트리밍 인식용으로 닫을 수 있는 청크의 끝을 찾습니다.
+
+    발화 뒤에 `min_silence_ms` 이상의 무음이 이어지면 그 무음 한가운데에서 청크를 닫습니다.
+    무음 없이 `max_chunk_seconds` 를 넘으면 가장 긴 무음(없으면 최대 길이)에서 강제로 닫습니다.
+    닫을 곳이 없으면 None, 있으면 (끝 샘플 위치, 청크에 발화가 있는지) 를 반환합니다.
+    """
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    mask = speech_mask(samples, sample_rate, frame_ms)
+    if mask.size == 0:
+        return None
+    need = max(1, int(min_silence_ms / frame_ms))
+    min_frames = int(min_chunk_seconds * 1000 / frame_ms)
+    max_frames = int(max_chunk_seconds * 1000 / frame_ms)
+
+    if not mask.any():
+        # 발화가 전혀 없는 구간은 인식하지 않고 건너뛸 수 있도록 끝까지 닫습니다.
+        return (len(mask) * frame_len, False) if len(mask) >= need else None
+
+    first_speech = int(np.argmax(mask))
+    for start, end in silence_runs(mask):
+        if start <= first_speech or end - start < need:
+            continue
+        if start >= min_frames:
+            cut = start + need // 2
+            return cut * frame_len, True
+
+    if len(mask) >= max_frames:
+        runs = [(s, e) for s, e in silence_runs(mask[:max_frames]) if s > first_speech]
+        if runs:
+            s, e = max(runs, key=lambda r: r[1] - r[0])
+            cut = (s + e) // 2
+        else:
+            cut = max_frames
+        return cut * frame_len, True
+    return None
+
+
+# --- 인식 전 무음 제거 ---
+
+# 공격성(0~3) -> (배경 소음 대비 여유 dB, 발화 앞뒤로 남길 여유 ms, 잘라낼 최소 무음 길이 ms)
+# 숫자가 클수록 더 많이 잘라냅니다.
+AGGRESSIVENESS_LEVELS = {
+    0: (6.0, 500, 1500),
+    1: (8.0, 300, 1000),
+    2: (10.0, 200, 600),
+    3: (14.0, 100, 300),
+}
+
+
+class SpeechMap:
+    """무음을 잘라낸 오디오의 시간을 원본 녹음의 시간으로 되돌리는 타임스탬프 맵."""
+
+    def __init__(self, spans, sample_rate, original_samples):
+        self.spans = [(int(s), int(e)) for s, e in spans]  # 남긴 원본 구간 [(시작 샘플, 끝 샘플)], 순서대로 이어 붙임
+        self.sample_rate = sample_rate
+        self.original_samples = int(original_samples)
+        lengths = [e - s for s, e in self.spans]
+        self._kept_starts = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+
+    @property
+    def kept_samples(self) -> int:
+        return int(self._kept_starts[-1])
+
+    @property
+    def original_seconds(self) -> float:
+        return self.original_samples / self.sample_rate
+
+    @property
+    def kept_seconds(self) -> float:
+        return self.kept_samples / self.sample_rate
+
+    @property
+    def skipped_seconds(self) -> float:
+        return self.original_seconds - self.kept_seconds
+
+    def to_original(self, seconds: float) -> float:
+        """잘라낸 오디오 기준 시간(초)을 원본 녹음 기준 시간(초)으로 바꿉니다."""
+        if not self.spans:
+            return 0.0
+        pos = max(0, int(round(seconds * self.sample_rate)))
+        i = int(np.searchsorted(self._kept_starts, pos, side="right")) - 1
+        i = min(max(i, 0), len(self.spans) - 1)
+        start, end = self.spans[i]
+        return min(start + pos - int(self._kept_starts[i]), end) / self.sample_rate
+
+    def remap_segments(self, segments) -> list:
+        """인식 구간 목록의 start/end 를 원본 녹음 기준으로 바꾼 새 목록을 반환합니다."""
+        return [
+            {**seg, "start": self.to_original(seg["start"]), "end": self.to_original(seg["end"])}
+            for seg in segments
+        ]
+
+
+def split_at_silence(audio, sample_rate, chunk_seconds=60.0, max_chunk_seconds=90.0, min_silence_ms=300,
+                     frame_ms=FRAME_MS):
+    """오디오를 무음 경계에서 나눈 청크 구간 [(시작 샘플, 끝 샘플)] 목록을 반환합니다 (겹침 없음, 빈틈 없음).
+
+    청크 길이가 `chunk_seconds` 에 가깝도록 그 주변(절반 ~ `max_chunk_seconds`)에서 가장 가까운 무음 한가운데를 자릅니다.
+    그 범위에 무음이 없으면 `max_chunk_seconds` 에서 자릅니다.
+    """
+    total = len(audio)
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    target, longest = int(chunk_seconds * sample_rate), int(max_chunk_seconds * sample_rate)
+    if total <= longest:
+        return [(0, total)]
+    need = max(1, int(min_silence_ms / frame_ms))
+    runs = [(s, e) for s, e in silence_runs(speech_mask(audio, sample_rate, frame_ms)) if e - s >= need]
+    cut_points = np.array([(s + e) // 2 * frame_len for s, e in runs], dtype=np.int64)
+
+    spans, start = [], 0
+    while total - start > longest:
+        lo, hi = start + target // 2, start + longest
+        candidates = cut_points[(cut_points >= lo) & (cut_points <= hi)]
+        if candidates.size:
+            cut = int(candidates[np.argmin(np.abs(candidates - (start + target)))])
+        else:
+            cut = hi
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, total))
+    return spans
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, aggressiveness: int = 1, frame_ms: int = FRAME_MS):
+    """발화가 없는 구간을 잘라낸 오디오와 `SpeechMap` 을 반환합니다.
+
+    발화 앞뒤에는 여유를 남기고, 발화 사이의 짧은 쉼은 그대로 둡니다.
+    시작 전/끝난 뒤의 무음과 일정 길이 이상의 긴 무음만 잘라냅니다.
+    """
+    margin_db, pad_ms, min_drop_ms = AGGRESSIVENESS_LEVELS[min(max(int(aggressiveness), 0), 3)]
+    frame_len = max(1, int(sample_rate * frame_ms / 1000))
+    mask = speech_mask(audio, sample_rate, frame_ms, margin_db)
+    if not mask.any():
+        return audio[:0], SpeechMap([], sample_rate, len(audio))
+
+    # 발화 프레임 앞뒤로 여유 프레임을 붙임
+    pad = int(pad_ms / frame_ms)
+    keep = np.convolve(mask, np.ones(2 * pad + 1), mode="same") > 0 if pad else mask.copy()
+    # 발화 사이의 짧은 무음은 남김 (앞뒤 끝의 무음은 길이와 상관없이 잘라냄)
+    min_drop = int(min_drop_ms / frame_ms)
+    for start, end in silence_runs(keep):
+        if start > 0 and end < len(keep) and end - start < min_drop:
+            keep[start:end] = True
+
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], keep.astype(np.int8), [0]])))
+    spans = []
+    for start, end in edges.reshape(-1, 2):
+        # 마지막 프레임까지 남기면 프레임에 못 미친 꼬리 샘플도 함께 남김
+        spans.append((start * frame_len, len(audio) if end == len(keep) else end * frame_len))
+    trimmed = np.concatenate([audio[s:e] for s, e in spans])
+    return trimmed, SpeechMap(spans, sample_rate, len(audio))
+
+
+class SkipStats:
+    """무음 제거로 건너뛴 오디오 양을 누적하는 지표 (여러 스레드에서 기록)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.original_seconds = 0.0
+        self.kept_seconds = 0.0
+
+    def record(self, speech_map: SpeechMap) -> None:
+        with self._lock:
+            self.calls += 1
+            self.original_seconds += speech_map.original_seconds
+            self.kept_seconds += speech_map.kept_seconds
+
+    @property
+    def skipped_seconds(self) -> float:
+        return self.original_seconds - self.kept_seconds
+
+    @property
+    def skipped_ratio(self) -> float:
+        return self.skipped_seconds / self.original_seconds if self.original_seconds else 0.0